@@ -1,30 +1,65 @@
+"""Starts the chess game in this interpreter.
+
+    python launch_chess.py                     # play
+    python launch_chess.py --profile-startup   # play, and print how long start-up took
+"""
+import argparse
+import importlib
 import os
-import subprocess
 import sys
+import time
+
+# Modules of the game in dependency order; importing them one at a time gives each its own cost
+STARTUP_MODULES = [
+    "tkinter",
+    "main.Tables", "main.Zobrist", "main.Position", "main.Bitboard", "main.Rules", "main.Fen",
+    "main.TranspositionTable", "main.Tablebase", "main.Engine", "main.EngineWorker", "main.OpeningBook",
+    "main.PieceImages", "main.Board", "main.GameState", "main.History", "main.Moving", "main.main",
+]
+# Libraries that should stay unimported until they are really needed
+LAZY_LIBRARIES = ["PIL", "cairosvg", "numpy"]
+
+def profile_imports():
+    """Imports STARTUP_MODULES one by one; returns [(module, seconds)] in import order."""
+    timings = []
+    for name in STARTUP_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings.append((name, time.perf_counter() - start))
+    return timings
+
+def print_startup_profile(import_timings, ready_seconds):
+    total_imports = sum(seconds for _, seconds in import_timings)
+    print("Startup profile (each module's time excludes what was already imported)")
+    for name, seconds in sorted(import_timings, key=lambda timing: timing[1], reverse=True):
+        print(f"  {name:24s} {seconds * 1000:8.1f} ms")
+    print(f"  {'imports total':24s} {total_imports * 1000:8.1f} ms")
+    print(f"  {'window ready':24s} {ready_seconds * 1000:8.1f} ms after launch")
+    loaded = [name for name in LAZY_LIBRARIES if name in sys.modules]
+    print(f"  Heavy libraries imported at startup: {', '.join(loaded) or 'none'}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play chess.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import-time breakdown and the time until the window is ready")
+    args = parser.parse_args(argv)
+    launch_time = time.perf_counter()
+
+    # Project root: the game finds image/, book.bin and tablebases/ relative to it
+    project_root_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(project_root_dir)
+    if project_root_dir not in sys.path:
+        sys.path.insert(0, project_root_dir)
+
+    on_ready = None
+    if args.profile_startup:
+        import_timings = profile_imports()
+        def on_ready():
+            print_startup_profile(import_timings, time.perf_counter() - launch_time)
+
+    from main.main import main as run_game
+    run_game(on_ready)
+    return 0
 
-# Get the directory where the launcher script is located (i.e., project root directory)
-project_root_dir = os.path.dirname(os.path.abspath(__file__))
-
-# Construct the full path to main/main.py
-main_game_script = os.path.join(project_root_dir, "main", "main.py")
-
-# Use the Python interpreter currently running the launcher to execute the game script
-python_executable = sys.executable
-
-print(f"Project root directory: {project_root_dir}")
-print(f"Game script to be executed: {main_game_script}")
-print(f"Python interpreter used: {python_executable}")
-
-try:
-    # Execute the game script as a module in the project root directory
-    # This ensures that relative paths and relative imports in main/main.py can be resolved correctly
-    # Command: python -m main.main
-    process = subprocess.Popen([python_executable, "-m", "main.main"], cwd=project_root_dir)
-    process.wait()  # Wait for the game process to end
-    print("Game has been closed.")
-except subprocess.CalledProcessError as e:
-    print(f"Error occurred while starting the game: {e}")
-except FileNotFoundError:
-    print(f"Error: Cannot find Python interpreter '{python_executable}' or game script '{main_game_script}'.")
-except Exception as e:
-    print(f"An unknown error occurred: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
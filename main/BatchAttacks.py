@@ -0,0 +1,227 @@
+# BatchAttacks.py
+"""Attack maps, check flags and mobility for many positions at once, with NumPy.
+
+Positions come in as an N x 8 x 8 integer array of piece codes (0 for an empty
+square, 1 + Bitboard.PIECE_CHARS.index(piece) otherwise; see encode_boards) or as
+N x 12 x 64 piece planes in PIECE_CHARS order. They are packed into one uint64
+bitboard per piece type and position, laid out like Bitboard.py (bit row * 8 + col),
+and every query is a handful of shifts and masks applied to all N positions at once.
+
+The results follow the scalar rules in Rules.py:
+
+    attacked   squares attacked by a side, not counting squares holding its own pieces
+               (Rules.is_square_attacked)
+    in_check   the side's king is attacked (Rules.is_in_check); False without a king
+    mobility   number of moves from the piece movement patterns, i.e. the length of
+               Rules.generate_pseudo_legal_moves; moves that leave the king in check count
+
+Index 0 of the side axis is White, 1 is Black. NumPy is only needed by this module.
+
+Usage:
+    python -m main.BatchAttacks --positions 100000   # throughput against the scalar rules
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from .Bitboard import PIECE_CHARS
+from .Position import Position, initial_board
+from .Tables import KNIGHT_OFFSETS, KING_OFFSETS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS
+
+DEFAULT_CHUNK_SIZE = 65536  # Positions unpacked at a time; bounds the temporary arrays
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+SIDE_OFFSETS = (0, 6)  # Plane index of the first White and the first Black piece
+
+# Squares a shift by dc columns can land on without wrapping round the board edge
+_COLUMN_MASKS = {dc: np.uint64(sum(1 << sq for sq in range(64) if 0 <= sq % 8 - dc < 8)) for dc in range(-2, 3)}
+_ROW_MASKS = [np.uint64(0xFF << (8 * row)) for row in range(8)]
+
+class BatchAnalysis:
+    """Results for N positions; side index 0 is White and 1 is Black."""
+    __slots__ = ("attacked", "in_check", "mobility")
+
+    def __init__(self, attacked, in_check, mobility):
+        self.attacked = attacked  # bool (N, 2, 8, 8)
+        self.in_check = in_check  # bool (N, 2)
+        self.mobility = mobility  # int32 (N, 2)
+
+    def __len__(self):
+        return len(self.in_check)
+
+# --- Input conversion ---
+def encode_boards(boards):
+    """N x 8 x 8 int8 piece codes for a sequence of list-of-lists boards."""
+    chars = np.array([[list(row) for row in board] for board in boards], dtype="<U1").reshape(-1, 8, 8)
+    codes = np.zeros(chars.shape, dtype=np.int8)
+    for index, piece_char in enumerate(PIECE_CHARS):
+        codes[chars == piece_char] = index + 1
+    return codes
+
+def codes_to_planes(codes):
+    """N x 12 x 64 bool planes for N x 8 x 8 piece codes."""
+    codes = np.asarray(codes).reshape(-1, 64)
+    return codes[:, None, :] == np.arange(1, 13, dtype=codes.dtype)[None, :, None]
+
+def _to_bitboards(positions):
+    """(N, 12) uint64 bitboards for piece codes (N, 8, 8) or planes (N, 12, 64)."""
+    positions = np.asarray(positions)
+    if positions.ndim == 3 and positions.shape[1:] == (8, 8):
+        planes = codes_to_planes(positions)
+    elif positions.ndim == 3 and positions.shape[1:] == (12, 64):
+        planes = positions.astype(bool, copy=False)
+    else:
+        raise ValueError(f"Expected an (N, 8, 8) or (N, 12, 64) array, got shape {positions.shape}")
+    # Eight little-endian bytes per plane: bit sq of the word is square sq
+    packed = np.packbits(planes, axis=-1, bitorder="little")
+    return np.ascontiguousarray(packed).view("<u8")[..., 0].astype(np.uint64, copy=False)
+
+def bitboards_to_masks(bitboards):
+    """bool (..., 8, 8) square masks for an array of uint64 bitboards."""
+    bitboards = np.ascontiguousarray(bitboards, dtype="<u8")
+    bits = np.unpackbits(bitboards[..., None].view(np.uint8), axis=-1, bitorder="little")
+    return bits.reshape(bitboards.shape + (8, 8)).astype(bool)
+
+# --- Bitboard primitives ---
+if hasattr(np, "bitwise_count"):
+    def _popcount(bitboards):
+        return np.bitwise_count(bitboards).astype(np.int32)
+else:
+    _BYTE_COUNTS = np.array([bin(value).count("1") for value in range(256)], dtype=np.int32)
+
+    def _popcount(bitboards):
+        as_bytes = np.ascontiguousarray(bitboards, dtype="<u8")[..., None].view(np.uint8)
+        return _BYTE_COUNTS[as_bytes].sum(axis=-1, dtype=np.int32)
+
+def _shift(bitboards, dr, dc):
+    """Moves every set square dr rows down and dc columns right; squares leaving the board drop off."""
+    delta = dr * 8 + dc
+    if delta >= 0:
+        shifted = bitboards << np.uint64(delta)
+    else:
+        shifted = bitboards >> np.uint64(-delta)
+    if dc:
+        shifted &= _COLUMN_MASKS[dc]
+    return shifted
+
+def _slide(sliders, empty, dr, dc):
+    """Squares the sliders reach in one direction: every empty square up to and including the first blocker."""
+    ray = _shift(sliders, dr, dc)
+    reached = ray
+    for _ in range(6):
+        ray = _shift(ray & empty, dr, dc)
+        reached |= ray
+    return reached
+
+# --- Per-side queries ---
+def _side_moves(pieces, side, own, enemy, empty):
+    """(attacked squares, mobility) of one side; pieces is the (N, 12) bitboard array."""
+    offset = SIDE_OFFSETS[side]
+    not_own = ~own
+    pawns = pieces[:, offset + PAWN]
+    forward = -1 if side == 0 else 1  # White pawns move towards row 0
+
+    attacked = np.zeros_like(own)
+    mobility = np.zeros(len(own), dtype=np.int32)
+
+    # Pawns attack diagonally forward but capture only an enemy piece there
+    for dc in (-1, 1):
+        targets = _shift(pawns, forward, dc)
+        attacked |= targets
+        mobility += _popcount(targets & enemy)
+    single = _shift(pawns, forward, 0) & empty
+    # A double step starts from the pawn's first row, i.e. lands two rows beyond it
+    double = _shift(single & _ROW_MASKS[5 if side == 0 else 2], forward, 0) & empty
+    mobility += _popcount(single) + _popcount(double)
+
+    for kind, offsets in ((KNIGHT, KNIGHT_OFFSETS), (KING, KING_OFFSETS)):
+        movers = pieces[:, offset + kind]
+        for dr, dc in offsets:
+            targets = _shift(movers, dr, dc)
+            attacked |= targets
+            mobility += _popcount(targets & not_own)
+
+    queens = pieces[:, offset + QUEEN]
+    for movers, directions in ((pieces[:, offset + ROOK] | queens, ROOK_DIRECTIONS),
+                               (pieces[:, offset + BISHOP] | queens, BISHOP_DIRECTIONS)):
+        for dr, dc in directions:
+            # A square reached from two sliders in one direction would need the nearer one
+            # to be transparent, so each move is counted once
+            targets = _slide(movers, empty, dr, dc)
+            attacked |= targets
+            mobility += _popcount(targets & not_own)
+
+    return attacked & not_own, mobility
+
+def _analyze_bitboards(pieces):
+    occupancy = [np.bitwise_or.reduce(pieces[:, offset:offset + 6], axis=1) for offset in SIDE_OFFSETS]
+    empty = ~(occupancy[0] | occupancy[1])
+    attacked, mobility = zip(*(_side_moves(pieces, side, occupancy[side], occupancy[1 - side], empty)
+                               for side in (0, 1)))
+    in_check = [(pieces[:, SIDE_OFFSETS[side] + KING] & attacked[1 - side]) != 0 for side in (0, 1)]
+    return np.stack(attacked, axis=1), np.stack(in_check, axis=1), np.stack(mobility, axis=1)
+
+def analyze(positions, chunk_size=DEFAULT_CHUNK_SIZE):
+    """BatchAnalysis of an (N, 8, 8) piece-code array or an (N, 12, 64) plane array."""
+    positions = np.asarray(positions)
+    count = len(positions)
+    attacked = np.zeros((count, 2, 8, 8), dtype=bool)
+    in_check = np.zeros((count, 2), dtype=bool)
+    mobility = np.zeros((count, 2), dtype=np.int32)
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        chunk_attacked, in_check[start:stop], mobility[start:stop] = _analyze_bitboards(
+            _to_bitboards(positions[start:stop]))
+        attacked[start:stop] = bitboards_to_masks(chunk_attacked)
+    return BatchAnalysis(attacked, in_check, mobility)
+
+# --- Benchmark ---
+def random_positions(count, max_plies=60, rng=None):
+    """count list-of-lists boards reached by random legal moves from the initial position."""
+    rng = rng or random.Random(0)
+    boards = []
+    while len(boards) < count:
+        position = Position(initial_board())
+        for _ in range(rng.randrange(max_plies)):
+            moves = position.legal_moves()
+            if not moves:
+                break
+            position.play(rng.choice(moves))
+        boards.append([row[:] for row in position.board])
+    return boards
+
+def _scalar_analysis(board_array):
+    from .Rules import generate_pseudo_legal_moves, is_in_check, is_square_attacked
+    return ([[is_square_attacked(board_array, r, c, color) for r in range(8) for c in range(8)] for color in "wb"],
+            [is_in_check(board_array, color) for color in "wb"],
+            [len(generate_pseudo_legal_moves(board_array, color)) for color in "wb"])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.BatchAttacks", description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=100000, help="positions to analyse")
+    parser.add_argument("--distinct", type=int, default=1000, help="random positions generated and repeated")
+    args = parser.parse_args(argv)
+
+    boards = random_positions(min(args.distinct, args.positions))
+    codes = encode_boards(boards)
+    codes = np.resize(codes, (args.positions, 8, 8))  # Repeats the distinct positions
+
+    start = time.perf_counter()
+    analyze(codes)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for board_array in boards:
+        _scalar_analysis(board_array)
+    scalar_per_position = (time.perf_counter() - start) / len(boards)
+
+    print(f"NumPy batch: {args.positions} positions in {batch_seconds:.3f}s "
+          f"({args.positions / batch_seconds:,.0f} positions/s)")
+    print(f"Scalar Rules: {1 / scalar_per_position:,.0f} positions/s "
+          f"(speedup {scalar_per_position * args.positions / batch_seconds:.1f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+# Bitboard.py
+"""Bitboard representation of a position.
+
+Squares are numbered like the board arrays: square = row * 8 + col, so bit 0 is
+board[0][0] (a8) and bit 63 is board[7][7] (h1). Every piece type of every colour
+has its own 64-bit integer, and attack, check and move generation queries are
+answered with shifts and masks instead of walking the 8x8 lists.
+"""
+from .Tables import DIRECTIONS, KNIGHT_MASKS, KING_MASKS, PAWN_CAPTURE_MASKS, RAY_MASKS
+
+# Piece characters in bitboard index order: White (lowercase) first, then Black (uppercase)
+PIECE_CHARS = "pnbrqkPNBRQK"
+PIECE_INDEX = {piece_char: idx for idx, piece_char in enumerate(PIECE_CHARS)}
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+COLOR_OFFSET = {"w": 0, "b": 6}
+
+FULL_BOARD = (1 << 64) - 1
+
+# Attack masks come from the shared lookup tables; ray indices follow Tables.DIRECTIONS
+ROOK_RAY_INDICES = (0, 1, 2, 3)
+BISHOP_RAY_INDICES = (4, 5, 6, 7)
+
+KNIGHT_ATTACKS = KNIGHT_MASKS
+KING_ATTACKS = KING_MASKS
+# Squares attacked by a pawn of the given colour standing on each square
+PAWN_ATTACKS = PAWN_CAPTURE_MASKS
+RAYS = RAY_MASKS
+# A ray runs towards higher square numbers when it moves down the board, or right along a row
+RAY_IS_POSITIVE = tuple(dr > 0 or (dr == 0 and dc > 0) for dr, dc in DIRECTIONS)
+
+ROW_MASKS = [0xFF << (8 * row) for row in range(8)]
+_COL_MASK_A = sum(1 << (row * 8) for row in range(8))
+_COL_MASK_H = _COL_MASK_A << 7
+
+
+def iter_bits(bitboard):
+    """Yields the square numbers of the set bits, lowest first."""
+    while bitboard:
+        low_bit = bitboard & -bitboard
+        yield low_bit.bit_length() - 1
+        bitboard ^= low_bit
+
+def _ray_attacks(sq, occupancy, ray_indices):
+    attacks = 0
+    for ray_idx in ray_indices:
+        ray = RAYS[ray_idx][sq]
+        blockers = ray & occupancy
+        if blockers:
+            # The nearest blocker is the lowest bit on positive rays and the highest on negative ones
+            if RAY_IS_POSITIVE[ray_idx]:
+                first = (blockers & -blockers).bit_length() - 1
+            else:
+                first = blockers.bit_length() - 1
+            ray ^= RAYS[ray_idx][first]
+        attacks |= ray
+    return attacks
+
+def rook_attacks(sq, occupancy):
+    return _ray_attacks(sq, occupancy, ROOK_RAY_INDICES)
+
+def bishop_attacks(sq, occupancy):
+    return _ray_attacks(sq, occupancy, BISHOP_RAY_INDICES)
+
+def queen_attacks(sq, occupancy):
+    return _ray_attacks(sq, occupancy, range(8))
+
+
+class BitboardPosition:
+    """One 64-bit integer per piece type and colour, plus per-colour and total occupancy."""
+    __slots__ = ("pieces", "occupancy", "all_occupancy")
+
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occupancy = {"w": 0, "b": 0}
+        self.all_occupancy = 0
+
+    @classmethod
+    def from_board(cls, board_array):
+        """Builds a bitboard position from a list-of-lists board."""
+        position = cls()
+        for r_idx, row_content in enumerate(board_array):
+            for c_idx, piece_on_square in enumerate(row_content):
+                if piece_on_square:
+                    position.pieces[PIECE_INDEX[piece_on_square]] |= 1 << (r_idx * 8 + c_idx)
+        position._update_occupancy()
+        return position
+
+    def to_board(self):
+        """Returns the position as a list-of-lists board."""
+        board_array = [[""] * 8 for _ in range(8)]
+        for idx, bitboard in enumerate(self.pieces):
+            for sq in iter_bits(bitboard):
+                board_array[sq >> 3][sq & 7] = PIECE_CHARS[idx]
+        return board_array
+
+    def copy(self):
+        position = BitboardPosition()
+        position.pieces = self.pieces[:]
+        position.occupancy = dict(self.occupancy)
+        position.all_occupancy = self.all_occupancy
+        return position
+
+    def _update_occupancy(self):
+        self.occupancy["w"] = white = self.pieces[0] | self.pieces[1] | self.pieces[2] | self.pieces[3] | self.pieces[4] | self.pieces[5]
+        self.occupancy["b"] = black = self.pieces[6] | self.pieces[7] | self.pieces[8] | self.pieces[9] | self.pieces[10] | self.pieces[11]
+        self.all_occupancy = white | black
+
+    def piece_at(self, sq):
+        """Returns the piece character on a square, "" if empty."""
+        bit = 1 << sq
+        if not self.all_occupancy & bit:
+            return ""
+        for idx, bitboard in enumerate(self.pieces):
+            if bitboard & bit:
+                return PIECE_CHARS[idx]
+        return ""
+
+    def king_square(self, player_color):
+        king_bitboard = self.pieces[COLOR_OFFSET[player_color] + KING]
+        if not king_bitboard:
+            return None
+        return (king_bitboard & -king_bitboard).bit_length() - 1
+
+    # --- Attack and check queries ---
+    def attackers_of(self, sq, attacker_color):
+        """Bitboard of attacker_color pieces attacking the square."""
+        base = COLOR_OFFSET[attacker_color]
+        pieces = self.pieces
+        occupancy = self.all_occupancy
+        defender_color = "b" if attacker_color == "w" else "w"
+        # Attacks are symmetric: look outward from the square with each piece's own pattern
+        attackers = PAWN_ATTACKS[defender_color][sq] & pieces[base + PAWN]
+        attackers |= KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]
+        attackers |= KING_ATTACKS[sq] & pieces[base + KING]
+        queens = pieces[base + QUEEN]
+        rook_like = pieces[base + ROOK] | queens
+        if rook_like:
+            attackers |= rook_attacks(sq, occupancy) & rook_like
+        bishop_like = pieces[base + BISHOP] | queens
+        if bishop_like:
+            attackers |= bishop_attacks(sq, occupancy) & bishop_like
+        return attackers
+
+    def is_square_attacked(self, sq, attacker_color):
+        """Same meaning as Rules.is_square_attacked: a square holding one of the attacker's
+        own pieces is never considered attacked."""
+        if self.occupancy[attacker_color] & (1 << sq):
+            return False
+        return bool(self.attackers_of(sq, attacker_color))
+
+    def attacked_squares(self, attacker_color):
+        """Bitboard of every square attacked by attacker_color, its own pieces' squares included."""
+        base = COLOR_OFFSET[attacker_color]
+        pieces = self.pieces
+        occupancy = self.all_occupancy
+        attacked = 0
+        pawns = pieces[base + PAWN]
+        if attacker_color == "w":
+            attacked |= ((pawns >> 9) & ~_COL_MASK_H) | ((pawns >> 7) & ~_COL_MASK_A)
+        else:
+            attacked |= ((pawns << 7) & ~_COL_MASK_H) | ((pawns << 9) & ~_COL_MASK_A)
+        for sq in iter_bits(pieces[base + KNIGHT]):
+            attacked |= KNIGHT_ATTACKS[sq]
+        for sq in iter_bits(pieces[base + KING]):
+            attacked |= KING_ATTACKS[sq]
+        for sq in iter_bits(pieces[base + BISHOP] | pieces[base + QUEEN]):
+            attacked |= bishop_attacks(sq, occupancy)
+        for sq in iter_bits(pieces[base + ROOK] | pieces[base + QUEEN]):
+            attacked |= rook_attacks(sq, occupancy)
+        return attacked & FULL_BOARD
+
+    def is_in_check(self, player_color):
+        king_sq = self.king_square(player_color)
+        if king_sq is None:
+            return False
+        opponent_color = "b" if player_color == "w" else "w"
+        return bool(self.attackers_of(king_sq, opponent_color))
+
+    # --- Move generation ---
+    def generate_pseudo_legal_moves(self, player_color):
+        """Candidate moves as (from_sq, to_sq) pairs; they may leave the own king in check."""
+        base = COLOR_OFFSET[player_color]
+        pieces = self.pieces
+        own = self.occupancy[player_color]
+        enemy = self.all_occupancy ^ own
+        occupancy = self.all_occupancy
+        empty = ~occupancy & FULL_BOARD
+        moves = []
+
+        pawns = pieces[base + PAWN]
+        if player_color == "w":
+            single = (pawns >> 8) & empty
+            double = ((single & ROW_MASKS[5]) >> 8) & empty
+            moves.extend((sq + 8, sq) for sq in iter_bits(single))
+            moves.extend((sq + 16, sq) for sq in iter_bits(double))
+        else:
+            single = (pawns << 8) & empty
+            double = ((single & ROW_MASKS[2]) << 8) & empty
+            moves.extend((sq - 8, sq) for sq in iter_bits(single))
+            moves.extend((sq - 16, sq) for sq in iter_bits(double))
+        pawn_attacks = PAWN_ATTACKS[player_color]
+        for sq in iter_bits(pawns):
+            moves.extend((sq, to_sq) for to_sq in iter_bits(pawn_attacks[sq] & enemy))
+
+        not_own = ~own & FULL_BOARD
+        for sq in iter_bits(pieces[base + KNIGHT]):
+            moves.extend((sq, to_sq) for to_sq in iter_bits(KNIGHT_ATTACKS[sq] & not_own))
+        for sq in iter_bits(pieces[base + BISHOP]):
+            moves.extend((sq, to_sq) for to_sq in iter_bits(bishop_attacks(sq, occupancy) & not_own))
+        for sq in iter_bits(pieces[base + ROOK]):
+            moves.extend((sq, to_sq) for to_sq in iter_bits(rook_attacks(sq, occupancy) & not_own))
+        for sq in iter_bits(pieces[base + QUEEN]):
+            targets = (rook_attacks(sq, occupancy) | bishop_attacks(sq, occupancy)) & not_own
+            moves.extend((sq, to_sq) for to_sq in iter_bits(targets))
+        for sq in iter_bits(pieces[base + KING]):
+            moves.extend((sq, to_sq) for to_sq in iter_bits(KING_ATTACKS[sq] & not_own))
+        return moves
+
+    def _piece_index_at(self, bit, first_idx):
+        for idx in range(first_idx, first_idx + 6):
+            if self.pieces[idx] & bit:
+                return idx
+        return None
+
+    def leaves_king_in_check(self, from_sq, to_sq, player_color):
+        """Would moving the piece on from_sq to to_sq leave player_color's king in check?"""
+        base = COLOR_OFFSET[player_color]
+        enemy_base = 6 - base
+        from_bit, to_bit = 1 << from_sq, 1 << to_sq
+        moved_idx = self._piece_index_at(from_bit, base)
+        captured_idx = self._piece_index_at(to_bit, enemy_base) if self.all_occupancy & to_bit else None
+
+        # Toggle the bits of the move, ask the check question, then toggle them back
+        pieces = self.pieces
+        saved_occupancy = (self.occupancy["w"], self.occupancy["b"], self.all_occupancy)
+        opponent_color = "b" if player_color == "w" else "w"
+        pieces[moved_idx] ^= from_bit | to_bit
+        if captured_idx is not None:
+            pieces[captured_idx] ^= to_bit
+            self.occupancy[opponent_color] ^= to_bit
+        self.occupancy[player_color] ^= from_bit | to_bit
+        self.all_occupancy = self.occupancy["w"] | self.occupancy["b"]
+        try:
+            return self.is_in_check(player_color)
+        finally:
+            pieces[moved_idx] ^= from_bit | to_bit
+            if captured_idx is not None:
+                pieces[captured_idx] ^= to_bit
+            self.occupancy["w"], self.occupancy["b"], self.all_occupancy = saved_occupancy
+
+    def get_all_legal_moves(self, player_color):
+        """Legal moves in the Rules format ((from_r, from_c), (to_r, to_c))."""
+        return [((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7))
+                for from_sq, to_sq in self.generate_pseudo_legal_moves(player_color)
+                if not self.leaves_king_in_check(from_sq, to_sq, player_color)]
+
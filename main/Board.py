@@ -2,21 +2,12 @@
 import tkinter as tk
 from tkinter import simpledialog
 from .Rules import is_valid_move
-import os # For path joining
-import io   # For BytesIO for image data stream
+from .Position import Position, initial_board  # initial_board re-exported for existing imports
+from .PieceImages import PIECE_FILES, shared_cache
 
-# Attempt to import image libraries and set a flag
+# Piece images are loaded on first use (see PieceImages); any piece that cannot be
+# loaded is drawn as a Unicode character instead
 USE_IMAGES = True
-try:
-    from PIL import Image, ImageTk
-    import cairosvg
-except ImportError:
-    USE_IMAGES = False
-    print("--------------------------------------------------------------------------")
-    print("Warning: Libraries Pillow or CairoSVG not found.")
-    print("Chess pieces will be displayed as Unicode characters instead of images.")
-    print("To display images, please install them: pip install Pillow CairoSVG")
-    print("--------------------------------------------------------------------------")
 
 # Unicode pieces (used as fallback or if USE_IMAGES is False)
 unicode_pieces_map = {
@@ -24,25 +15,16 @@ unicode_pieces_map = {
     "R": "♜", "N": "♞", "B": "♝", "Q": "♛", "K": "♚", "P": "♟",
 }
 
-def initial_board():
-    return [
-        ["R", "N", "B", "Q", "K", "B", "N", "R"],
-        ["P"] * 8,
-        [""] * 8,
-        [""] * 8,
-        [""] * 8,
-        [""] * 8,
-        ["p"] * 8,
-        ["r", "n", "b", "q", "k", "b", "n", "r"],
-    ]
-
 class Board:
     def __init__(self, canvas):
         self.canvas = canvas
         self.cell_size = 80
         self.colors = ["#EEEED2", "#769656"]
-        self.board = initial_board()
+        self.position = Position(initial_board())
         self.selected = None
+        self.hint = None  # ((from_r, from_c), (to_r, to_c)) suggested by the engine, or None
+        self._piece_items = None  # Canvas items, created by the first draw()
+        self._images_scheduled = False
         self.margin_left = 30  # Left margin for row numbers
         self.margin_top = 0    # Top margin (if column labels were at top, also set to 30)
         self.margin_bottom = 30 # Bottom margin for column labels
@@ -50,97 +32,86 @@ class Board:
         self.label_font = ("Arial", 12)
 
         self.use_images_flag = USE_IMAGES
-        self.pil_images = {}  # Will store PIL Image objects
-        self.tk_piece_images = {} # Will store PhotoImage objects (cached)
-
-        if self.use_images_flag:
-            self.image_dir = "image" # Relative to project root (chess/)
-            # Define target display size for pieces, slightly smaller than cell
-            self.image_display_size = int(self.cell_size * 0.85)
-
-            image_filenames = {}
-            # White pieces (p, r, n, b, q, k)
-            for char_lower in ["p", "r", "n", "b", "q", "k"]:
-                image_filenames[char_lower] = f"Chess_{char_lower}lt45.svg"
-            # Black pieces (P, R, N, B, Q, K)
-            for char_upper_candidate in ["P", "R", "N", "B", "Q", "K"]:
-                image_filenames[char_upper_candidate] = f"Chess_{char_upper_candidate}dt45.svg"
-
-            for piece_char, filename in image_filenames.items():
-                image_path = os.path.join(self.image_dir, filename)
-                try:
-                    # Convert SVG to PNG bytes, scaled to desired size
-                    png_bytes = cairosvg.svg2png(
-                        url=image_path, 
-                        output_width=self.image_display_size, 
-                        output_height=self.image_display_size
-                    )
-                    pil_image = Image.open(io.BytesIO(png_bytes))
-                    # Ensure RGBA for transparency if needed, though cairosvg usually handles this
-                    # pil_image = pil_image.convert("RGBA") 
-                    self.pil_images[piece_char] = pil_image # Store PIL image first
-                except FileNotFoundError:
-                    print(f"Image Load Error: File not found - {image_path}. Piece '{piece_char}' may use fallback.")
-                    # self.piece_images[piece_char] = None
-                    self.pil_images[piece_char] = None # Explicitly mark as not loaded
-                except Exception as e:
-                    print(f"Image Load Error: Failed to load/process {image_path} for piece '{piece_char}': {e}")
-                    # self.piece_images[piece_char] = None
-                    self.pil_images[piece_char] = None
-                    # Potentially disable images entirely if a critical error occurs during setup
-                    # self.use_images_flag = False
-                    # break
+        # Define target display size for pieces, slightly smaller than cell
+        self.image_display_size = int(self.cell_size * 0.85)
+        # Rendered pieces are shared by every Board and kept on disk between launches
+        self.piece_images = shared_cache()
+        self._images_loaded = False  # The first frame uses Unicode pieces; images follow once idle
+
+    @property
+    def board(self):
+        return self.position.board
+
+    @board.setter
+    def board(self, board_array):
+        # Replacing the whole board resets the incrementally kept state (key, move stack)
+        self.position.set_board(board_array, self.position.turn)
 
     def reset_board(self):
-        self.board = initial_board()
+        self.position.set_board(initial_board(), "w")
         self.selected = None
+        self.hint = None
 
     def draw(self):
-        self.canvas.delete("all")
-        
+        """Brings the canvas up to date with the board.
+
+        Squares, labels, pieces and highlights are canvas items created on the first call
+        and tagged by square ("sq<row><col>"). Later calls only reconfigure the squares
+        whose piece changed and move the highlight rectangles.
+        """
+        if self._piece_items is None:
+            self._create_items()
+
+        for row_idx, row_content in enumerate(self.board):
+            drawn_row = self._drawn_pieces[row_idx]
+            for col_idx, piece_char_on_board in enumerate(row_content):
+                if drawn_row[col_idx] != piece_char_on_board:
+                    self._draw_piece(row_idx, col_idx, piece_char_on_board)
+                    drawn_row[col_idx] = piece_char_on_board
+
+        # Highlight the engine's suggested move
+        hint_squares = self.hint or ()
+        for idx, item in enumerate(self._hint_items):
+            self._place_highlight(item, hint_squares[idx] if idx < len(hint_squares) else None)
+
+        # Highlight selection
+        self._place_highlight(self._selection_item, self.selected)
+
+        if self.use_images_flag and not self._images_loaded and not self._images_scheduled:
+            # Show the board first; rendering or reading the piece images waits for the idle loop
+            self._images_scheduled = True
+            self.canvas.after_idle(self._load_piece_images)
+
+    def _square_origin(self, row_idx, col_idx):
+        return self.margin_left + col_idx * self.cell_size, self.margin_top + row_idx * self.cell_size
+
+    def _create_items(self):
+        """Creates every canvas item once: squares, piece slots, labels and highlights."""
+        self._piece_items = [[None] * 8 for _ in range(8)]  # (image item, text item) per square
+        self._drawn_pieces = [[""] * 8 for _ in range(8)]
         for row_idx in range(8):
             for col_idx in range(8):
-                x0 = self.margin_left + col_idx * self.cell_size
-                y0 = self.margin_top + row_idx * self.cell_size
+                x0, y0 = self._square_origin(row_idx, col_idx)
                 center_x = x0 + self.cell_size / 2
                 center_y = y0 + self.cell_size / 2
-                
+                square_tag = f"sq{row_idx}{col_idx}"
+
                 color = self.colors[(row_idx + col_idx) % 2]
-                self.canvas.create_rectangle(x0, y0, x0 + self.cell_size, y0 + self.cell_size, fill=color)
-
-                piece_char_on_board = self.board[row_idx][col_idx]
-                if piece_char_on_board:
-                    drawn_as_image = False
-                    if self.use_images_flag:
-                        # Check cache for PhotoImage first
-                        tk_img_obj = self.tk_piece_images.get(piece_char_on_board)
-                        if not tk_img_obj:
-                            # If not cached, try to create from PIL image
-                            pil_img = self.pil_images.get(piece_char_on_board)
-                            if pil_img:
-                                try:
-                                    tk_img_obj = ImageTk.PhotoImage(pil_img)
-                                    self.tk_piece_images[piece_char_on_board] = tk_img_obj # Cache it
-                                except Exception as e_tk:
-                                    print(f"Tkinter PhotoImage creation error for {piece_char_on_board}: {e_tk}")
-                                    # Potentially mark this piece_char as not displayable with image
-                        
-                        if tk_img_obj: # If PhotoImage exists (either cached or newly created)
-                            self.canvas.create_image(center_x, center_y, image=tk_img_obj)
-                            drawn_as_image = True
-                    
-                    if not drawn_as_image: # Fallback to Unicode character
-                        self.canvas.create_text(center_x, 
-                                                center_y, 
-                                                text=unicode_pieces_map.get(piece_char_on_board, "?"), # Default to ? if somehow not in map 
-                                                font=("Arial", 40))
-        
+                self.canvas.create_rectangle(x0, y0, x0 + self.cell_size, y0 + self.cell_size, fill=color,
+                                             tags=("square", square_tag))
+                # A piece is shown either as an image or, as a fallback, a Unicode character
+                image_item = self.canvas.create_image(center_x, center_y, state="hidden",
+                                                      tags=("piece", square_tag))
+                text_item = self.canvas.create_text(center_x, center_y, text="", font=("Arial", 40),
+                                                    tags=("piece", square_tag))
+                self._piece_items[row_idx][col_idx] = (image_item, text_item)
+
         # Draw row numbers (8, 7, ..., 1 from top to bottom)
         for row_idx in range(8):
             label_text = str(8 - row_idx)
             x_pos = self.margin_left / 2
             y_pos = self.margin_top + row_idx * self.cell_size + self.cell_size / 2
-            self.canvas.create_text(x_pos, y_pos, text=label_text, font=self.label_font)
+            self.canvas.create_text(x_pos, y_pos, text=label_text, font=self.label_font, tags=("label",))
 
         # Draw column labels (A, B, ..., H from left to right)
         board_height_pixels = 8 * self.cell_size
@@ -148,15 +119,54 @@ class Board:
             label_text = chr(ord('A') + col_idx)
             x_pos = self.margin_left + col_idx * self.cell_size + self.cell_size / 2
             y_pos = self.margin_top + board_height_pixels + self.margin_bottom / 2
-            self.canvas.create_text(x_pos, y_pos, text=label_text, font=self.label_font)
-
-        # Highlight selection
-        if self.selected:
-            r, c = self.selected
-            x0 = self.margin_left + c * self.cell_size
-            y0 = self.margin_top + r * self.cell_size
-            self.canvas.create_rectangle(x0, y0, x0 + self.cell_size, y0 + self.cell_size,
-                                         outline="red", width=3)
+            self.canvas.create_text(x_pos, y_pos, text=label_text, font=self.label_font, tags=("label",))
+
+        # Highlights are single rectangles moved to their square, hidden when unused
+        self._hint_items = [self.canvas.create_rectangle(0, 0, 0, 0, outline="blue", width=3, state="hidden",
+                                                         tags=("highlight", "hint"))
+                            for _ in range(2)]
+        self._selection_item = self.canvas.create_rectangle(0, 0, 0, 0, outline="red", width=3, state="hidden",
+                                                            tags=("highlight", "selection"))
+
+    def _draw_piece(self, row_idx, col_idx, piece_char_on_board):
+        image_item, text_item = self._piece_items[row_idx][col_idx]
+        tk_img_obj = self._piece_image(piece_char_on_board) if piece_char_on_board else None
+        if tk_img_obj:
+            self.canvas.itemconfig(image_item, image=tk_img_obj, state="normal")
+            self.canvas.itemconfig(text_item, text="")
+        else:
+            self.canvas.itemconfig(image_item, state="hidden")
+            # Fallback to Unicode character; "" clears an empty square
+            text = unicode_pieces_map.get(piece_char_on_board, "?") if piece_char_on_board else ""
+            self.canvas.itemconfig(text_item, text=text)
+
+    def _piece_image(self, piece_char):
+        """PhotoImage for a piece, or None until the images are loaded or if it is unavailable."""
+        if not (self.use_images_flag and self._images_loaded):
+            return None
+        return self.piece_images.photo(piece_char, self.image_display_size)
+
+    def _load_piece_images(self, pending=None):
+        """Loads one piece image per idle callback (from the disk cache when possible), so clicks
+        are handled between renders, and swaps them all in once the last one is ready."""
+        if pending is None:
+            pending = list(PIECE_FILES)
+        self.piece_images.photo(pending.pop(0), self.image_display_size)
+        if pending:
+            self.canvas.after_idle(lambda: self._load_piece_images(pending))
+            return
+        self._images_loaded = True
+        self._drawn_pieces = [[None] * 8 for _ in range(8)]  # Redraw every piece
+        self.draw()
+
+    def _place_highlight(self, item, square):
+        if square is None:
+            self.canvas.itemconfig(item, state="hidden")
+            return
+        x0, y0 = self._square_origin(*square)
+        self.canvas.coords(item, x0, y0, x0 + self.cell_size, y0 + self.cell_size)
+        self.canvas.itemconfig(item, state="normal")
+        self.canvas.tag_raise(item)
 
     def get_cell(self, event):
         # Calculate click coordinates relative to the top-left of the main board area
@@ -181,38 +191,49 @@ class Board:
         else:
             return None, None # Just in case
 
-    def move_piece(self, from_row, from_col, to_row, to_col, current_player):
+    def move_piece(self, from_row, from_col, to_row, to_col, current_player, promotion=None):
         """
-        Move piece and handle Pawn Promotion
+        Move piece and handle Pawn Promotion.
+        promotion is the new piece for a pawn reaching the last rank; if None the dialog asks.
+        Returns the MoveRecord of the executed move, or False if the move is illegal or
+        the promotion dialog was cancelled (the position is then left unchanged).
         """
         piece = self.board[from_row][from_col]
-        target = self.board[to_row][to_col]
 
         # Normal move rules (does not include promotion logic directly here other than calling is_valid_move)
         if not is_valid_move(self.board, from_row, from_col, to_row, to_col, current_player):
             return False
 
-        # Execute move
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = ""
-
         # Check if promotion is needed (pawn reaches the last rank)
-        if piece.lower() == "p" and (to_row == 0 or to_row == 7):
-            self.promote_pawn(to_row, to_col, piece)
-
-        return True
-
-    def promote_pawn(self, row, col, pawn):
-        """Handles pawn promotion"""
+        if promotion is None and piece.lower() == "p" and (to_row == 0 or to_row == 7):
+            promotion = self.ask_promotion_choice(piece)
+            if promotion is None:
+                return False  # Cancelled or invalid choice: no un-promoted pawn on the last rank
+
+        # Execute move (keeps the position key and move stack up to date)
+        self.position.set_turn(current_player)
+        return self.position.make_move(from_row, from_col, to_row, to_col, promotion)
+
+    def unmake_move(self):
+        """Takes back the last move played through move_piece. Returns its MoveRecord, or None."""
+        if not self.position.can_unmake():
+            return None
+        return self.position.unmake_move()
+
+    def ask_promotion_choice(self, pawn):
+        """Asks which piece the pawn becomes. Returns it in the pawn's case, or None if cancelled."""
         new_piece = simpledialog.askstring("Pawn Promotion", "Promote to: (Q)ueen, (R)ook, (B)ishop, (N)ight")
         if not new_piece:
-            return  # User cancelled
+            return None  # User cancelled
         new_piece = new_piece.lower()
         if new_piece not in ["q", "r", "b", "n"]:
-            return  # Invalid choice
+            return None  # Invalid choice
 
         # White uses lowercase, Black uses uppercase
-        if pawn.islower():
-            self.board[row][col] = new_piece  # White
-        else:
-            self.board[row][col] = new_piece.upper()  # Black
+        return new_piece if pawn.islower() else new_piece.upper()
+
+    def promote_pawn(self, row, col, pawn):
+        """Handles pawn promotion"""
+        new_piece = self.ask_promotion_choice(pawn)
+        if new_piece:
+            self.board[row][col] = new_piece
@@ -0,0 +1,442 @@
+# Engine.py
+"""Move search: negamax alpha-beta with iterative deepening under a time or node budget.
+
+Usage:
+    python -m main.Engine --movetime 5
+    python -m main.Engine --depth 4 --fen "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w - - 0 1"
+
+Every finished iteration reports its depth, score, nodes, nodes per second, time to
+reach that depth and principal variation. Scores are in centipawns from the side to
+move's point of view. Runs without Tk on a Position.
+"""
+import argparse
+import random
+import sys
+import time
+
+from .Fen import START_FEN, board_from_fen, move_name
+from .Position import Position
+from .Tablebase import probe as probe_tablebase, load_tablebases
+from .TranspositionTable import (TranspositionTable, DEFAULT_SIZE_MB, DEPTH_PREFERRED, SCHEMES,
+                                 EXACT, LOWER_BOUND, UPPER_BOUND)
+
+# --- Evaluation: material plus piece-square tables ---
+PIECE_VALUES = {"p": 100, "n": 320, "b": 330, "r": 500, "q": 900, "k": 0}
+
+# Piece-square bonuses for White, indexed like the board arrays (index 0 is a8, row 0 is
+# where White's pawns promote). Black uses the same tables mirrored top to bottom.
+PIECE_SQUARE_TABLES = {
+    "p": [
+          0,   0,   0,   0,   0,   0,   0,   0,
+         50,  50,  50,  50,  50,  50,  50,  50,
+         10,  10,  20,  30,  30,  20,  10,  10,
+          5,   5,  10,  25,  25,  10,   5,   5,
+          0,   0,   0,  20,  20,   0,   0,   0,
+          5,  -5, -10,   0,   0, -10,  -5,   5,
+          5,  10,  10, -20, -20,  10,  10,   5,
+          0,   0,   0,   0,   0,   0,   0,   0,
+    ],
+    "n": [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    "b": [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    "r": [
+          0,   0,   0,   0,   0,   0,   0,   0,
+          5,  10,  10,  10,  10,  10,  10,   5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+          0,   0,   0,   5,   5,   0,   0,   0,
+    ],
+    "q": [
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+         -5,   0,   5,   5,   5,   5,   0,  -5,
+          0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+    ],
+    "k": [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+         20,  20,   0,   0,   0,   0,  20,  20,
+         20,  30,  10,   0,   0,  10,  30,  20,
+    ],
+}
+
+def _build_square_scores():
+    scores = {}
+    for kind, table in PIECE_SQUARE_TABLES.items():
+        scores[kind] = [PIECE_VALUES[kind] + table[sq] for sq in range(64)]
+        scores[kind.upper()] = [-(PIECE_VALUES[kind] + table[(7 - sq // 8) * 8 + sq % 8]) for sq in range(64)]
+    return scores
+
+# Score of each piece on each square, positive for White
+SQUARE_SCORES = _build_square_scores()
+
+def evaluate(board_array, turn):
+    """Material plus piece-square score in centipawns, from the side to move's point of view."""
+    score = 0
+    for r_idx, row_content in enumerate(board_array):
+        base = r_idx * 8
+        for c_idx, piece_on_square in enumerate(row_content):
+            if piece_on_square:
+                score += SQUARE_SCORES[piece_on_square][base + c_idx]
+    return score if turn == "w" else -score
+
+# --- Search ---
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000  # Scores beyond this are mates, closer ones being larger
+INFINITY = 10 ** 9
+MAX_PLY = 128
+CHECK_EVERY_NODES = 1024
+
+class _SearchAborted(Exception):
+    """Raised inside the search when the time or node budget runs out."""
+
+class SearchInfo:
+    """Report of one finished iteration, or of a whole search."""
+    __slots__ = ("depth", "score", "nodes", "elapsed", "pv")
+
+    def __init__(self, depth, score, nodes, elapsed, pv):
+        self.depth = depth
+        self.score = score      # Centipawns for the side to move; see mate_in()
+        self.nodes = nodes      # Nodes searched since the start of the search
+        self.elapsed = elapsed  # Seconds since the start of the search (time to depth)
+        self.pv = pv            # Principal variation: list of ((fr, fc), (tr, tc)) moves
+
+    @property
+    def nps(self):
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    @property
+    def best_move(self):
+        return self.pv[0] if self.pv else None
+
+    def mate_in(self):
+        """Moves to mate (negative if the side to move gets mated), or None if not a mate score."""
+        if abs(self.score) < MATE_THRESHOLD:
+            return None
+        plies = MATE_SCORE - abs(self.score)
+        return (plies + 1) // 2 if self.score > 0 else -(plies // 2)
+
+    def __str__(self):
+        mate = self.mate_in()
+        score = f"mate {mate}" if mate is not None else f"cp {self.score}"
+        return (f"depth {self.depth} score {score} nodes {self.nodes} nps {self.nps} "
+                f"time {self.elapsed:.3f} pv {' '.join(move_name(move) for move in self.pv)}")
+
+class SearchResult(SearchInfo):
+    """Outcome of Engine.search: the last finished iteration plus all iteration reports."""
+    __slots__ = ("iterations", "from_book")
+
+    def __init__(self, depth, score, nodes, elapsed, pv, iterations, from_book=False):
+        super().__init__(depth, score, nodes, elapsed, pv)
+        self.iterations = iterations
+        self.from_book = from_book  # The move came from the opening book; nothing was searched
+
+    def time_to_depth(self):
+        """{depth: seconds} for every finished iteration."""
+        return {info.depth: info.elapsed for info in self.iterations}
+
+def _tablebase_score(result, ply):
+    """Search score of a tablebase (outcome, plies) result found at ply."""
+    outcome, plies = result
+    if outcome == "win":
+        return MATE_SCORE - (ply + plies)
+    if outcome == "loss":
+        return -(MATE_SCORE - (ply + plies))
+    return 0
+
+def _score_to_tt(score, ply):
+    # Mate scores are stored relative to the node, not to the root
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+def _score_from_tt(score, ply):
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+class Engine:
+    def __init__(self, hash_mb=DEFAULT_SIZE_MB, hash_scheme=DEPTH_PREFERRED, tt=None, book=None):
+        """hash_mb and hash_scheme size a new transposition table; pass tt to share one instead.
+        book, an OpeningBook, is consulted before every search."""
+        self.tt = tt if tt is not None else TranspositionTable(hash_mb, hash_scheme)
+        self.book = book
+        self.book_rng = random.Random()  # Varies the book moves; None always plays the heaviest
+        self.nodes = 0
+        self._deadline = None
+        self._node_limit = None
+        self._pv = [[] for _ in range(MAX_PLY + 1)]
+        self._previous_pv = []
+        self._killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self._root_moves = None
+        self._stop_event = None
+
+    def search(self, position, max_depth=None, time_limit=None, node_limit=None, info_callback=None,
+               root_moves=None, stop_event=None):
+        """Searches position (a Position, left unchanged) by iterative deepening.
+
+        Stops after max_depth plies, after time_limit seconds or after node_limit nodes,
+        whichever comes first; with none of them given the depth defaults to 4.
+        info_callback, if given, receives a SearchInfo after every finished iteration.
+        root_moves restricts the search to some of the legal moves (used to split the
+        root between processes). stop_event, a threading.Event, ends the search early when
+        set from another thread. Returns a SearchResult for the deepest finished iteration,
+        or, when the opening book has a move for the position, that move without searching.
+        """
+        if max_depth is None:
+            max_depth = MAX_PLY if (time_limit or node_limit) else 4
+        start = time.perf_counter()
+        if self.book is not None and root_moves is None:
+            book_move = self.book.choose(position, self.book_rng)
+            if book_move is not None:
+                return SearchResult(0, 0, 0, time.perf_counter() - start, [book_move], [], from_book=True)
+        self.nodes = 0
+        self._deadline = start + time_limit if time_limit else None
+        self._node_limit = node_limit
+        self._stop_event = stop_event
+        self._previous_pv = []
+        self._killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.tt.new_search()
+        stack_depth = len(position.move_stack)
+
+        iterations = []
+        self._root_moves = list(root_moves) if root_moves is not None else None
+        if root_moves is None:
+            root_moves = position.legal_moves()
+        if not root_moves:
+            score = -MATE_SCORE if position.in_check() else 0
+            return SearchResult(0, score, 0, time.perf_counter() - start, [], iterations)
+
+        if position.piece_count == 3 and probe_tablebase(position.board, position.turn) is not None:
+            max_depth = 1  # Every reply is scored exactly by the tables: one ply is the whole answer
+        self._root_best = root_moves[0]
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(position, depth, -INFINITY, INFINITY, 0)
+            except _SearchAborted:
+                # Unwind the moves the interrupted iteration left on the position
+                while len(position.move_stack) > stack_depth:
+                    position.unmake_move()
+                break
+            elapsed = time.perf_counter() - start
+            self._previous_pv = self._pv[0][:]
+            info = SearchInfo(depth, score, self.nodes, elapsed, self._previous_pv)
+            iterations.append(info)
+            if info_callback:
+                info_callback(info)
+            if abs(score) >= MATE_THRESHOLD:
+                break  # A forced mate was found; deeper iterations cannot improve on it
+            if self._deadline and time.perf_counter() + 2 * elapsed > self._deadline:
+                break  # The next iteration would almost certainly not finish in time
+
+        elapsed = time.perf_counter() - start
+        if iterations:
+            last = iterations[-1]
+            return SearchResult(last.depth, last.score, self.nodes, elapsed, last.pv, iterations)
+        # Not even depth 1 finished: fall back to the best root move seen so far
+        return SearchResult(0, 0, self.nodes, elapsed, [self._root_best], iterations)
+
+    def _check_budget(self):
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise _SearchAborted()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise _SearchAborted()
+        if self._stop_event is not None and self._stop_event.is_set():
+            raise _SearchAborted()
+
+    def _order_moves(self, board_array, moves, ply, hash_move=None):
+        pv_move = self._previous_pv[ply] if ply < len(self._previous_pv) else None
+        killers = self._killers[ply]
+
+        def move_priority(move):
+            if move == pv_move:
+                return 1000000
+            if move == hash_move:
+                return 900000
+            victim = board_array[move[1][0]][move[1][1]]
+            if victim:
+                # Most valuable victim first, then least valuable attacker
+                attacker = board_array[move[0][0]][move[0][1]]
+                return 10000 + 10 * PIECE_VALUES[victim.lower()] - PIECE_VALUES[attacker.lower()] // 10
+            if move == killers[0] or move == killers[1]:
+                return 5000
+            return 0
+
+        moves.sort(key=move_priority, reverse=True)
+        return moves
+
+    def _negamax(self, position, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY_NODES == 0:
+            self._check_budget()
+        self._pv[ply] = []
+
+        if ply > 0 and position.piece_count == 3:
+            # Endgame tables give the exact result (None when none is loaded for this material)
+            result = probe_tablebase(position.board, position.turn)
+            if result is not None:
+                return _tablebase_score(result, ply)
+
+        in_check = position.in_check()
+        if in_check:
+            depth += 1  # Check extension: never stop the search in the middle of a check
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiesce(position, alpha, beta, ply)
+
+        hash_move = None
+        entry = self.tt.probe(position.key)
+        if entry is not None:
+            hash_move = entry.move
+            if entry.depth >= depth and ply > 0:
+                score = _score_from_tt(entry.score, ply)
+                if (entry.bound == EXACT or (entry.bound == LOWER_BOUND and score >= beta)
+                        or (entry.bound == UPPER_BOUND and score <= alpha)):
+                    if hash_move is not None:
+                        self._pv[ply] = [hash_move]
+                    return score
+
+        moves = self._root_moves if ply == 0 and self._root_moves is not None else position.legal_moves()
+        if not moves:
+            # Checkmated (prefer the longest defence / shortest mate) or stalemate
+            return -(MATE_SCORE - ply) if in_check else 0
+
+        alpha_original = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in self._order_moves(position.board, moves, ply, hash_move):
+            is_quiet = not position.board[move[1][0]][move[1][1]]
+            position.play(move)
+            score = -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if ply == 0:
+                    self._root_best = move
+                if score > alpha:
+                    alpha = score
+                    self._pv[ply] = [move] + self._pv[ply + 1]
+                    if alpha >= beta:
+                        if is_quiet and self._killers[ply][0] != move:
+                            self._killers[ply][1] = self._killers[ply][0]
+                            self._killers[ply][0] = move
+                        break
+
+        if best_score >= beta:
+            bound = LOWER_BOUND
+        elif best_score > alpha_original:
+            bound = EXACT
+        else:
+            bound = UPPER_BOUND
+            best_move = None  # Every move failed low: none of them is known to be best
+        if ply > 0 or self._root_moves is None:  # A restricted root says nothing about the position
+            self.tt.store(position.key, depth, _score_to_tt(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiesce(self, position, alpha, beta, ply):
+        """Searches captures and promotions only, until the position is quiet."""
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY_NODES == 0:
+            self._check_budget()
+        self._pv[ply] = []
+
+        if position.piece_count == 3:
+            result = probe_tablebase(position.board, position.turn)
+            if result is not None:
+                return _tablebase_score(result, ply)
+
+        stand_pat = evaluate(position.board, position.turn)
+        if stand_pat >= beta or ply >= MAX_PLY - 1:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        for move in self._order_moves(position.board, position.legal_captures(), ply):
+            position.play(move)
+            score = -self._quiesce(position, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+                self._pv[ply] = [move] + self._pv[ply + 1]
+        return alpha
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.Engine", description=__doc__.splitlines()[0])
+    parser.add_argument("--fen", default=START_FEN, help="position to search (default: initial position)")
+    parser.add_argument("--depth", type=int, help="maximum depth in plies")
+    parser.add_argument("--movetime", type=float, help="time budget in seconds")
+    parser.add_argument("--nodes", type=int, help="node budget")
+    parser.add_argument("--hash", type=float, default=DEFAULT_SIZE_MB, help="transposition table size in MB")
+    parser.add_argument("--hash-scheme", choices=SCHEMES, default=DEPTH_PREFERRED,
+                        help="transposition table replacement scheme")
+    parser.add_argument("--threads", type=int, default=1, help="worker processes (root splitting when above 1)")
+    parser.add_argument("--book", help="opening book file to consult before searching")
+    parser.add_argument("--tablebases", metavar="DIR", help="directory of endgame tables (python -m main.Tablebase)")
+    args = parser.parse_args(argv)
+
+    try:
+        board_array, turn = board_from_fen(args.fen)
+    except ValueError as e:
+        parser.error(str(e))
+    position = Position(board_array, turn)
+    if args.tablebases:
+        print(f"Tablebases: {', '.join(load_tablebases(args.tablebases)) or 'none found'}")
+
+    print_info = lambda info: print(f"info {info}")
+    book = None
+    if args.book:
+        from .OpeningBook import OpeningBook
+        book = OpeningBook(args.book)
+    if args.threads > 1:
+        from .ParallelSearch import ParallelEngine
+        with ParallelEngine(args.threads, args.hash, args.hash_scheme, book=book) as engine:
+            result = engine.search(position, max_depth=args.depth, time_limit=args.movetime,
+                                   node_limit=args.nodes, info_callback=print_info)
+    else:
+        engine = Engine(args.hash, args.hash_scheme, book=book)
+        result = engine.search(position, max_depth=args.depth, time_limit=args.movetime, node_limit=args.nodes,
+                               info_callback=print_info)
+    best = move_name(result.best_move) if result.best_move else "(none)"
+    print(f"bestmove {best}{' (book)' if result.from_book else ''}")
+    print(f"{result.nodes} nodes in {result.elapsed:.3f}s ({result.nps:,} nodes/s)")
+    if args.threads <= 1:
+        print(engine.tt)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
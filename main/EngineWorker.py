@@ -0,0 +1,120 @@
+# EngineWorker.py
+"""Runs Engine searches on a background thread so the Tk mainloop never waits for them.
+
+The worker searches its own copy of the position and reports through a queue that
+the GUI drains with poll(), typically from a root.after() loop:
+
+    ("info", job, SearchInfo)      after every finished depth
+    ("done", job, SearchResult)    when the search ends
+
+cancel() stops the running search within a few milliseconds; messages from a
+cancelled or superseded job are dropped by poll(). No tkinter is imported here.
+
+Pondering: ponder() searches the position after the opponent's expected reply with
+no time limit while the opponent thinks. If the reply is played, ponder_hit() turns
+that search into the engine's move search, keeping the depth already reached and
+only adding the normal move time. Otherwise the next start() cancels it; the
+engine's transposition table keeps what it learned for the real position.
+"""
+import queue
+import threading
+
+from .Engine import Engine, MAX_PLY
+from .Position import Position
+
+DEFAULT_MOVE_TIME = 2.0  # Seconds per engine move or hint
+
+class EngineWorker:
+    def __init__(self, engine=None):
+        self.engine = engine if engine is not None else Engine()
+        self._messages = queue.Queue()
+        self._job = 0
+        self._purpose = None
+        self._stop_event = None
+        self._thread = None
+        self._stop_timer = None
+        self._ponder_result = None
+
+    @property
+    def busy(self):
+        """True from start() until the job's "done" message is polled or the job is cancelled.
+        A ponder job stays busy until ponder_hit() or cancel()."""
+        return self._purpose is not None
+
+    @property
+    def purpose(self):
+        """What the running job was started for (e.g. "move" or "hint"), or None when idle."""
+        return self._purpose
+
+    def start(self, board_array, turn, purpose, time_limit=DEFAULT_MOVE_TIME, max_depth=None):
+        """Cancels any running job and starts searching a copy of board_array for turn."""
+        self.cancel()
+        self.wait()  # A cancelled search stops within a few milliseconds; never run two at once
+        self._job += 1
+        self._purpose = purpose
+        self._ponder_result = None
+        self._stop_event = threading.Event()
+        position = Position([row[:] for row in board_array], turn)
+        self._thread = threading.Thread(target=self._run,
+                                        args=(self._job, position, time_limit, max_depth, self._stop_event),
+                                        name="engine-search", daemon=True)
+        self._thread.start()
+        return self._job
+
+    def ponder(self, board_array, turn):
+        """Searches board_array (the position after the expected reply) until told otherwise."""
+        return self.start(board_array, turn, "ponder", time_limit=None, max_depth=MAX_PLY)
+
+    def ponder_hit(self, time_limit=DEFAULT_MOVE_TIME):
+        """The expected reply was played: the ponder search becomes a "move" search that stops
+        time_limit seconds from now. Returns False if no ponder search is running."""
+        if self._purpose != "ponder":
+            return False
+        self._purpose = "move"
+        if self._ponder_result is not None:
+            # The ponder search already finished (it found a mate): report its result now
+            self._messages.put(("done", self._job, self._ponder_result))
+            self._ponder_result = None
+        else:
+            self._stop_timer = threading.Timer(time_limit, self._stop_event.set)
+            self._stop_timer.daemon = True
+            self._stop_timer.start()
+        return True
+
+    def _run(self, job, position, time_limit, max_depth, stop_event):
+        result = self.engine.search(position, max_depth=max_depth, time_limit=time_limit,
+                                    info_callback=lambda info: self._messages.put(("info", job, info)),
+                                    stop_event=stop_event)
+        self._messages.put(("done", job, result))
+
+    def cancel(self):
+        """Stops the running job, if any; its results will never be reported."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._stop_timer is not None:
+            self._stop_timer.cancel()
+            self._stop_timer = None
+        self._purpose = None
+        self._ponder_result = None
+
+    def wait(self, timeout=None):
+        """Waits for the search thread to finish (for shutdown and tests)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll(self):
+        """Returns the pending (kind, purpose, payload) messages of the current job, oldest first."""
+        messages = []
+        while True:
+            try:
+                kind, job, payload = self._messages.get_nowait()
+            except queue.Empty:
+                return messages
+            if job != self._job or self._purpose is None:
+                continue  # Left over from a cancelled or replaced job
+            if kind == "done" and self._purpose == "ponder":
+                self._ponder_result = payload  # Kept for ponder_hit(); the job stays pending
+                continue
+            messages.append((kind, self._purpose, payload))
+            if kind == "done":
+                self._purpose = None
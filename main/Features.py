@@ -0,0 +1,240 @@
+# Features.py
+"""Streams positions into NumPy training arrays, a fixed-size chunk at a time.
+
+Each position becomes three arrays, indexed by position:
+
+    planes   bool  (12, 8, 8)   one plane per piece, in Bitboard.PIECE_CHARS order
+    turn     uint8 ()           side to move: 0 for White, 1 for Black
+    legal    bool  (64, 64)     legal[from_sq, to_sq] for every legal move (sq = row * 8 + col)
+
+FeatureWriter fills preallocated buffers of chunk_size positions and writes each
+full buffer to disk, so memory stays the same however many positions go through
+it. Output already in the directory is replaced. Two output formats:
+
+    "npy"     <name>-<chunk>.npy files per array, each readable on its own
+              (iter_feature_chunks() maps them one chunk at a time)
+    "memmap"  one raw <name>.dat file per array, appended to chunk by chunk, and
+              features.json with the dtypes and shapes; open_features() maps them
+
+Usage:
+    python -m main.Features --pgn games.pgn -o features --format memmap
+    python -m main.Features --fens positions.txt -o features --chunk-size 4096
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from .Bitboard import PIECE_CHARS
+from .Fen import board_from_fen
+from .OpeningBook import read_pgn_games, san_to_move
+from .Position import Position, initial_board
+from .Rules import get_all_legal_moves_for_player
+
+NPY = "npy"
+MEMMAP = "memmap"
+FORMATS = (NPY, MEMMAP)
+DEFAULT_CHUNK_SIZE = 1024  # Positions per buffer: about 5 MB, mostly legal-move masks
+META_FILE = "features.json"
+
+# (dtype, shape of one position) of every output array
+ARRAYS = {
+    "planes": (np.dtype(bool), (12, 8, 8)),
+    "turn": (np.dtype(np.uint8), ()),
+    "legal": (np.dtype(bool), (64, 64)),
+}
+
+# Byte value of a piece character -> piece code (1 + plane index); empty squares and markers are 0
+_CODE_LOOKUP = np.zeros(256, dtype=np.int8)
+for _index, _piece_char in enumerate(PIECE_CHARS):
+    _CODE_LOOKUP[ord(_piece_char)] = _index + 1
+_PLANE_CODES = np.arange(1, 13, dtype=np.int8)[:, None]
+
+def board_codes(board_array):
+    """64 int8 piece codes (0 for an empty square) of a list-of-lists board."""
+    squares = "".join(piece or "." for row in board_array for piece in row)
+    return _CODE_LOOKUP[np.frombuffer(squares.encode("ascii"), dtype=np.uint8)]
+
+class FeatureWriter:
+    """Collects positions into chunk-sized buffers and writes every full buffer to directory.
+    Use as a context manager or call close() to write the last, partial chunk. Readers need
+    the features.json that close() writes, so a with block left by an exception leaves
+    output that open_features() cannot open."""
+    def __init__(self, directory, chunk_size=DEFAULT_CHUNK_SIZE, output_format=NPY):
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown output format {output_format!r}; expected one of {FORMATS}")
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.output_format = output_format
+        self.count = 0   # Positions written or buffered
+        self.chunks = 0  # Chunks written
+        self._buffers = {name: np.zeros((chunk_size,) + shape, dtype=dtype)
+                         for name, (dtype, shape) in ARRAYS.items()}
+        self._filled = 0
+        os.makedirs(directory, exist_ok=True)
+        _remove_output(directory)  # Never mix chunks with those of an earlier run
+        if output_format == MEMMAP:
+            # Start from empty files; chunks are appended
+            for name in ARRAYS:
+                open(os.path.join(directory, f"{name}.dat"), "wb").close()
+
+    def add(self, board_array, turn):
+        """Buffers one position, writing the buffer out when it is full."""
+        row = self._filled
+        codes = board_codes(board_array)
+        self._buffers["planes"][row] = (codes == _PLANE_CODES).reshape(12, 8, 8)
+        self._buffers["turn"][row] = 0 if turn == "w" else 1
+        legal = self._buffers["legal"][row]
+        legal.fill(False)
+        moves = get_all_legal_moves_for_player(board_array, turn)
+        if moves:
+            from_squares, to_squares = zip(*((fr * 8 + fc, tr * 8 + tc) for (fr, fc), (tr, tc) in moves))
+            legal[from_squares, to_squares] = True
+        self._filled += 1
+        self.count += 1
+        if self._filled == self.chunk_size:
+            self.flush()
+
+    def add_all(self, positions):
+        """Adds every (board_array, turn) of an iterable; returns the number added."""
+        added = 0
+        for board_array, turn in positions:
+            self.add(board_array, turn)
+            added += 1
+        return added
+
+    def flush(self):
+        """Writes the buffered positions, if any."""
+        if not self._filled:
+            return
+        for name, buffer in self._buffers.items():
+            data = buffer[:self._filled]
+            if self.output_format == NPY:
+                np.save(_chunk_path(self.directory, name, self.chunks), data)
+            else:
+                with open(os.path.join(self.directory, f"{name}.dat"), "ab") as data_file:
+                    data.tofile(data_file)
+        self.chunks += 1
+        self._filled = 0
+
+    def close(self):
+        self.flush()
+        meta = {"format": self.output_format, "count": self.count, "chunks": self.chunks,
+                "arrays": {name: {"dtype": dtype.str, "shape": list(shape)} for name, (dtype, shape) in ARRAYS.items()}}
+        with open(os.path.join(self.directory, META_FILE), "w") as meta_file:
+            json.dump(meta, meta_file, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()  # A failed run gets no metadata, so it is never read as complete
+
+def _chunk_path(directory, name, chunk):
+    return os.path.join(directory, f"{name}-{chunk:05d}.npy")
+
+def _remove_output(directory):
+    """Deletes whatever an earlier FeatureWriter left in directory, in either format."""
+    paths = [os.path.join(directory, META_FILE)]
+    for name in ARRAYS:
+        paths.append(os.path.join(directory, f"{name}.dat"))
+        paths.extend(glob.glob(os.path.join(directory, f"{name}-*.npy")))
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+def _read_meta(directory):
+    with open(os.path.join(directory, META_FILE)) as meta_file:
+        return json.load(meta_file)
+
+def iter_feature_chunks(directory):
+    """Yields {name: array} per chunk of "npy" output, memory-mapped read-only, so reading
+    stays bounded by the chunk size. For "memmap" output the whole arrays come as one chunk."""
+    meta = _read_meta(directory)
+    if meta["format"] == MEMMAP:
+        yield open_features(directory)
+        return
+    for chunk in range(meta["chunks"]):
+        yield {name: np.load(_chunk_path(directory, name, chunk), mmap_mode="r") for name in meta["arrays"]}
+
+def open_features(directory):
+    """{name: array} of everything written to directory. "memmap" output is memory-mapped
+    read-only. "npy" chunks are concatenated, which reads them all into memory; use
+    iter_feature_chunks() to go through them a chunk at a time."""
+    meta = _read_meta(directory)
+    arrays = {}
+    for name, spec in meta["arrays"].items():
+        shape = (meta["count"],) + tuple(spec["shape"])
+        if meta["format"] == MEMMAP:
+            if meta["count"]:
+                arrays[name] = np.memmap(os.path.join(directory, f"{name}.dat"), dtype=spec["dtype"], mode="r",
+                                         shape=shape)
+            else:
+                arrays[name] = np.zeros(shape, dtype=spec["dtype"])  # np.memmap cannot map an empty file
+        else:
+            chunks = [np.load(_chunk_path(directory, name, chunk), mmap_mode="r") for chunk in range(meta["chunks"])]
+            arrays[name] = np.concatenate(chunks) if chunks else np.zeros(shape, dtype=spec["dtype"])
+    return arrays
+
+# --- Position sources ---
+def iter_fen_positions(lines):
+    """(board_array, turn) for every non-blank FEN line; malformed lines raise ValueError."""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield board_from_fen(line)
+
+def iter_game_positions(pgn_lines):
+    """(board_array, turn) before every move of every game in PGN text, read line by line.
+    A game stops at its first move these rules do not allow (e.g. castling)."""
+    for tags, san_moves in read_pgn_games(pgn_lines):
+        if "FEN" in tags:
+            try:
+                position = Position(*board_from_fen(tags["FEN"]))
+            except ValueError:
+                continue
+        else:
+            position = Position(initial_board())
+        for san in san_moves:
+            try:
+                move, promotion = san_to_move(position, san)
+            except ValueError:
+                break
+            yield [row[:] for row in position.board], position.turn
+            (from_row, from_col), (to_row, to_col) = move
+            if promotion:
+                promotion = promotion if position.turn == "w" else promotion.upper()
+            position.make_move(from_row, from_col, to_row, to_col, promotion)
+        yield [row[:] for row in position.board], position.turn
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.Features", description=__doc__.splitlines()[0])
+    parser.add_argument("--pgn", nargs="*", default=[], help="PGN files: every position of every game")
+    parser.add_argument("--fens", nargs="*", default=[], help="files with one FEN per line")
+    parser.add_argument("-o", "--output", required=True, help="output directory")
+    parser.add_argument("--format", choices=FORMATS, default=NPY, help="chunked .npy files or memory-mappable .dat files")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="positions per written chunk")
+    args = parser.parse_args(argv)
+    if not args.pgn and not args.fens:
+        parser.error("give at least one --pgn or --fens file")
+
+    start = time.perf_counter()
+    with FeatureWriter(args.output, args.chunk_size, args.format) as writer:
+        for path in args.pgn:
+            with open(path, encoding="utf-8", errors="replace") as pgn_file:
+                writer.add_all(iter_game_positions(pgn_file))
+        for path in args.fens:
+            with open(path) as fen_file:
+                writer.add_all(iter_fen_positions(fen_file))
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {writer.count} positions in {writer.chunks} chunks to {args.output} "
+          f"in {elapsed:.2f}s ({writer.count / elapsed if elapsed else 0:,.0f} positions/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# Fen.py
+"""FEN conversion for the list-of-lists board.
+
+FEN writes White in uppercase, while this game uses lowercase for White and uppercase
+for Black, so piece letters are swapped on the way in and out. The rules have no
+castling or en passant, so those FEN fields are accepted but not used.
+"""
+from .Rules import is_in_check
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1"
+
+def board_from_fen(fen, validate=False):
+    """Parses a FEN string. Returns (board_array, turn); raises ValueError if malformed.
+    With validate=True the position must also pass validate_position()."""
+    fields = fen.split()
+    if not fields:
+        raise ValueError("Empty FEN string")
+    ranks = fields[0].split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"FEN placement must have 8 ranks: {fields[0]!r}")
+
+    board_array = []
+    for rank in ranks:
+        row = []
+        for char in rank:
+            if char in "12345678":
+                row.extend([""] * int(char))
+            elif char.lower() in "pnbrqk":
+                row.append(char.swapcase())
+            elif char.isdigit():
+                raise ValueError(f"Invalid empty-square count {char!r} in FEN")
+            else:
+                raise ValueError(f"Invalid piece letter {char!r} in FEN")
+        if len(row) != 8:
+            raise ValueError(f"FEN rank must have 8 squares: {rank!r}")
+        board_array.append(row)
+
+    turn = fields[1] if len(fields) > 1 else "w"
+    if turn not in ("w", "b"):
+        raise ValueError(f"Invalid side to move in FEN: {turn!r}")
+    if validate:
+        validate_position(board_array, turn)
+    return board_array, turn
+
+def validate_position(board_array, turn):
+    """Raises ValueError unless the position could occur in a game: one king per side,
+    no pawn on the first or last rank, and the side not to move not in check."""
+    for king, side in (("k", "White"), ("K", "Black")):
+        kings = sum(row.count(king) for row in board_array)
+        if kings != 1:
+            raise ValueError(f"{side} must have exactly one king, found {kings}")
+    if any(piece_on_square in ("p", "P") for row in (board_array[0], board_array[7]) for piece_on_square in row):
+        raise ValueError("Pawns cannot stand on the first or last rank")
+    if is_in_check(board_array, "b" if turn == "w" else "w"):
+        raise ValueError("The side not to move is in check")
+
+def board_to_fen(board_array, turn):
+    """Writes the board and side to move as a FEN string."""
+    ranks = []
+    for row in board_array:
+        rank = ""
+        empty_run = 0
+        for piece_on_square in row:
+            if piece_on_square:
+                if empty_run:
+                    rank += str(empty_run)
+                    empty_run = 0
+                rank += piece_on_square.swapcase()
+            else:
+                empty_run += 1
+        if empty_run:
+            rank += str(empty_run)
+        ranks.append(rank)
+    return f"{'/'.join(ranks)} {turn} - - 0 1"
+
+def square_name(row, col):
+    """Algebraic name of a board square, e.g. (6, 4) -> 'e2'."""
+    return "abcdefgh"[col] + str(8 - row)
+
+def move_name(move):
+    """Coordinate notation of a ((from_r, from_c), (to_r, to_c)) move, e.g. 'e2e4'."""
+    (from_row, from_col), (to_row, to_col) = move
+    return square_name(from_row, from_col) + square_name(to_row, to_col)
@@ -0,0 +1,127 @@
+# Game.py
+"""Headless game core: position, turn, history and game-over state without any GUI.
+
+Importing this module (or Position, Rules, History, GameState) never loads tkinter,
+PIL or cairosvg, so games can be played on workers without a display. The Tk
+classes wrap it: Board draws its Position, MoveController turns clicks into play()
+calls and answers the promotion question with a dialog.
+"""
+from .Fen import board_from_fen, board_to_fen
+from .GameState import GameState
+from .History import History
+from .Position import Position, initial_board
+from .Rules import is_valid_move, get_game_status
+
+PROMOTION_PIECES = ("q", "r", "b", "n")
+
+class Game:
+    def __init__(self, position=None, game_state=None, history=None):
+        """All parts are optional; pass existing ones to share them with a GUI."""
+        self.position = position if position is not None else Position(initial_board())
+        self.state = game_state if game_state is not None else GameState()
+        self.history = history if history is not None else History(self.position.board, self.state.turn)
+        self.game_over = False
+
+    @property
+    def board(self):
+        return self.position.board
+
+    @property
+    def turn(self):
+        return self.state.get_current_player()
+
+    def play(self, from_row, from_col, to_row, to_col, promotion="q"):
+        """Plays a move for the side to move.
+
+        promotion is used only when a pawn reaches the last rank: one of "qrbn" (either
+        case), or a callable that takes the pawn and returns one. It is only called for a
+        legal move. Any other choice, including None (a cancelled dialog), leaves the
+        position unchanged and the move is not played.
+        Returns the game status after the move ("continue", "check", "checkmate" or
+        "stalemate"), or None if the game is over, the move is illegal or the promotion
+        choice is not valid.
+        """
+        if self.game_over:
+            return None
+        player = self.state.get_current_player()
+        board = self.position.board
+        if not is_valid_move(board, from_row, from_col, to_row, to_col, player):
+            return None
+
+        piece = board[from_row][from_col]
+        promoted_piece = None
+        if piece.lower() == "p" and (to_row == 0 or to_row == 7):
+            choice = promotion(piece) if callable(promotion) else promotion
+            if not isinstance(choice, str) or choice.lower() not in PROMOTION_PIECES:
+                return None  # Checked before the position is touched
+            # White uses lowercase, Black uses uppercase
+            promoted_piece = choice.lower() if piece.islower() else choice.upper()
+
+        self.position.set_turn(player)
+        move_record = self.position.make_move(from_row, from_col, to_row, to_col, promoted_piece)
+        self.state.switch_turn()
+        # History is pushed AFTER turn switch. It stores the move and whose turn it is now.
+        self.history.push_move(move_record, self.state.turn)
+
+        status = self.status()
+        if status == "checkmate" or status == "stalemate":
+            self.game_over = True
+        return status
+
+    def status(self):
+        """Status of the position for the side to move."""
+        player = self.state.get_current_player()
+        return get_game_status(self.position.board, player, self.position.king_position(player))
+
+    def legal_moves(self):
+        """Legal moves of the side to move."""
+        self.position.set_turn(self.state.get_current_player())
+        return self.position.legal_moves()
+
+    def undo(self):
+        """Takes back the last move. Returns False if there is nothing to undo."""
+        if not self.history.can_undo():
+            return False
+        self.history.pop_last_move() # Remove the last move state
+        # The new top of history is the state to restore
+        board_snapshot, turn_snapshot = self.history.get_last_state()
+
+        # Take the move back in place so the position key is updated incrementally.
+        # If the board was replaced since that move, fall back to the snapshot.
+        if self.position.can_unmake():
+            self.position.unmake_move()
+        else:
+            # Ensure a copy is used: the snapshot belongs to the history
+            self.position.set_board([row[:] for row in board_snapshot], turn_snapshot)
+        self.position.set_turn(turn_snapshot)
+        self.state.turn = turn_snapshot
+        self.game_over = False
+        return True
+
+    @classmethod
+    def from_fen(cls, fen):
+        """A game starting from the FEN position; raises ValueError if it is malformed or impossible."""
+        game = cls()
+        game.load_fen(fen)
+        return game
+
+    def fen(self):
+        """FEN of the current board and side to move."""
+        return board_to_fen(self.position.board, self.state.turn)
+
+    def load_fen(self, fen):
+        """Replaces the game with the FEN position and clears the history.
+        Raises ValueError, leaving the game unchanged, if the FEN is malformed or impossible."""
+        board_array, turn = board_from_fen(fen, validate=True)
+        self.position.set_board(board_array, turn)
+        self.state.turn = turn
+        self.history.reset()
+        self.history.push(self.position.board, self.state.turn)
+        self.game_over = self.status() in ("checkmate", "stalemate")
+
+    def reset(self):
+        self.position.set_board(initial_board(), "w")
+        self.state.turn = "w"
+        self.history.reset()
+        self.history.push(self.position.board, self.state.turn)
+        self.game_over = False
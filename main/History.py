@@ -1,36 +1,116 @@
 # History.py
-import copy
+from .Rules import MoveRecord, unmake_move
 
 class History:
+    """Game history for undo.
+
+    Only the latest state is kept as a full board. Every earlier state is reached by
+    reversing deltas: a MoveRecord for moves pushed with push_move, or the list of
+    changed squares for whole boards pushed with push. Each delta also keeps the turn
+    of the state before it.
+    """
     def __init__(self, initial_board_state, initial_turn):
-        self.history = []
-        self.push(copy.deepcopy(initial_board_state), initial_turn)
+        self.reset()
+        self.push(initial_board_state, initial_turn)
 
     def push(self, board_snapshot, turn_snapshot_of_player_who_moved):
-        self.history.append((board_snapshot, turn_snapshot_of_player_who_moved))
+        """Adds a whole board as the newest state; only the squares that differ are stored."""
+        if self._current_board is None:
+            self._current_board = [row[:] for row in board_snapshot]
+        else:
+            changes = tuple((r, c, before, board_snapshot[r][c])
+                            for r, row in enumerate(self._current_board)
+                            for c, before in enumerate(row)
+                            if board_snapshot[r][c] != before)
+            self._deltas.append((changes, self._current_turn))
+            for r, c, _, after in changes:
+                self._current_board[r][c] = after
+        self._current_turn = turn_snapshot_of_player_who_moved
+
+    def push_move(self, move_record, turn_after_move):
+        """Adds the state reached by a move; only the MoveRecord is stored."""
+        self._deltas.append((move_record, self._current_turn))
+        board = self._current_board
+        board[move_record.to_row][move_record.to_col] = move_record.promotion or move_record.piece
+        board[move_record.from_row][move_record.from_col] = ""
+        self._current_turn = turn_after_move
 
-    def pop_last_move(self): 
-        if len(self.history) > 1:
-            return self.history.pop()
-        return None 
+    def pop_last_move(self):
+        if len(self._deltas) > 0:
+            popped = ([row[:] for row in self._current_board], self._current_turn)
+            delta, previous_turn = self._deltas.pop()
+            self._reverse(self._current_board, delta)
+            self._current_turn = previous_turn
+            return popped
+        return None
 
-    def get_last_state(self): 
-        if self.history:
-            return self.history[-1]
+    def get_last_state(self):
+        """The newest (board, turn). The board is the history's own copy: do not modify it."""
+        if self._current_board is not None:
+            return self._current_board, self._current_turn
+        return None
+
+    def last_move(self):
+        """MoveRecord of the newest state, or None if it was not reached through push_move."""
+        if self._deltas and isinstance(self._deltas[-1][0], MoveRecord):
+            return self._deltas[-1][0]
         return None
 
     def is_empty(self):
-        return not self.history
-    
+        return self._current_board is None
+
     def can_undo(self):
-        return len(self.history) > 1
+        return len(self._deltas) > 0
 
     def reset(self):
-        self.history = []
+        self._current_board = None
+        self._current_turn = None
+        self._deltas = []
+
+    @property
+    def history(self):
+        """Read-only sequence of every (board, turn) state, oldest first, rebuilt on access."""
+        return _StateView(self)
+
+    @staticmethod
+    def _reverse(board, delta):
+        if isinstance(delta, MoveRecord):
+            unmake_move(board, delta)
+        else:
+            for r, c, before, _ in delta:
+                board[r][c] = before
+
+    def _state_at(self, index):
+        board = [row[:] for row in self._current_board]
+        turn = self._current_turn
+        for delta, previous_turn in reversed(self._deltas[index:]):
+            self._reverse(board, delta)
+            turn = previous_turn
+        return board, turn
 
     # Utility to get the current board and turn without popping, if needed by other parts.
     # For undo, get_last_state after pop_last_move is the pattern.
     def get_current_board_and_turn(self):
         if not self.is_empty():
-            return self.history[-1]
-        return None, None # Or raise an exception
\ No newline at end of file
+            return self._current_board, self._current_turn
+        return None, None # Or raise an exception
+
+class _StateView:
+    """Sequence view over History states; each item is rebuilt by reversing deltas."""
+    def __init__(self, history):
+        self._history = history
+
+    def __len__(self):
+        return 0 if self._history.is_empty() else len(self._history._deltas) + 1
+
+    def __getitem__(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("history index out of range")
+        return self._history._state_at(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
@@ -1,14 +1,32 @@
 # Moving.py
 
-from .Rules import is_valid_move, is_checkmate, is_stalemate, is_in_check
-import copy
+from .Game import Game
+from .EngineWorker import DEFAULT_MOVE_TIME
+from .Rules import make_move
 
 class MoveController:
-    def __init__(self, board, game_state, history):
+    """Turns board clicks into moves of the headless Game that wraps the board's position.
+
+    With an EngineWorker it also drives the computer's searches, pondering on the
+    player's expected reply while the player thinks.
+    """
+    def __init__(self, board, game_state, history, engine_worker=None):
         self.board = board
         self.state = game_state
         self.history = history
-        self.game_over = False
+        self.game = Game(board.position, game_state, history)
+        self.engine_worker = engine_worker
+        self.ponder_move = None  # Reply the engine is pondering on, or None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+    @property
+    def game_over(self):
+        return self.game.game_over
+
+    @game_over.setter
+    def game_over(self, is_over):
+        self.game.game_over = is_over
 
     def handle_click(self, row, col):
         if self.game_over:
@@ -29,32 +47,14 @@ class MoveController:
             # --- Diagnostic print for is_valid_move call ---
             # print(f"[Controller] Checking is_valid_move: piece {self.board.board[from_r][from_c]} from ({from_r},{from_c}) to ({row},{col}) for player {current_player_making_move}")
             
-            if is_valid_move(self.board.board, from_r, from_c, row, col, current_player_making_move):
-                # Store the piece at the destination square before moving
-                captured_piece = self.board.board[row][col]
-
-                # Promotion logic is handled within board.move_piece if it's a pawn reaching promotion rank
-                # The actual move on the board anvas and internal representation
-                self.board.move_piece(from_r, from_c, row, col, current_player_making_move)
-                
-                # If no king was captured, proceed with normal turn switching and other checks
-                self.state.switch_turn()
-                # History is pushed AFTER turn switch. It stores the board state and WHOMST turn it is now.
-                self.history.push(copy.deepcopy(self.board.board), self.state.turn)
+            # game.play validates the move and, if legal, plays it, switches the turn and records it.
+            # A pawn reaching the promotion rank asks for its new piece through the board's dialog.
+            status = self.game.play(from_r, from_c, row, col, promotion=self.board.ask_promotion_choice)
+            if status:
                 self.board.selected = None
-
-                # Check for check/checkmate/stalemate for the *next* player (whose turn it is now)
-                current_player_whose_turn_it_is = self.state.get_current_player()
-                if is_in_check(self.board.board, current_player_whose_turn_it_is):
-                    if is_checkmate(self.board.board, current_player_whose_turn_it_is):
-                        self.game_over = True
-                        return "checkmate"
-                    return "check"
-                elif is_stalemate(self.board.board, current_player_whose_turn_it_is):
-                    self.game_over = True
-                    return "stalemate"
-                
-                return "continue" # Move was valid, game continues
+                self.board.hint = None
+                # Status for the *next* player (whose turn it is now): "continue", "check", "checkmate" or "stalemate"
+                return status
             else:
                 # --- Diagnostic print for invalid move ---
                 print(f"[Controller] Invalid move determined for piece {self.board.board[from_r][from_c]} from ({from_r},{from_c}) to ({row},{col}) for player {current_player_making_move}. Board state:")
@@ -68,19 +68,63 @@ class MoveController:
         
         return move_status
 
+    def play_move(self, move):
+        """Plays a ((from_r, from_c), (to_r, to_c)) move chosen by the engine; pawns promote to queens.
+        Returns the game status as handle_click does, or None if the move is not legal."""
+        (from_r, from_c), (to_r, to_c) = move
+        status = self.game.play(from_r, from_c, to_r, to_c, promotion="q")
+        if status:
+            self.board.selected = None
+            self.board.hint = None
+        return status
+
+    # --- Engine searches ---
+    def request_engine_move(self, time_limit=DEFAULT_MOVE_TIME):
+        """Starts the engine's search for the side to move. If the player just made the reply
+        the engine was pondering on, the ponder search carries on instead of starting over.
+        Returns True on a ponder hit."""
+        ponder_move, self.ponder_move = self.ponder_move, None
+        last = self.history.last_move()
+        if ponder_move is not None and last is not None and self.engine_worker.purpose == "ponder":
+            # The ponder search assumed a queen for a promotion, like the engine itself
+            if (((last.from_row, last.from_col), (last.to_row, last.to_col)) == ponder_move
+                    and (last.promotion is None or last.promotion.lower() == "q")):
+                if self.engine_worker.ponder_hit(time_limit):
+                    self.ponder_hits += 1
+                    return True
+            self.ponder_misses += 1
+        # start() cancels a ponder miss; the transposition table keeps its results
+        self.engine_worker.start(self.board.board, self.state.get_current_player(), "move", time_limit)
+        return False
+
+    def start_pondering(self, result):
+        """After the engine's move, searches the position after the reply its principal
+        variation expects. Returns False if the search result has no expected reply."""
+        if self.game_over or len(result.pv) < 2:
+            return False
+        expected_reply = result.pv[1]
+        if expected_reply not in self.game.legal_moves():
+            return False
+        board_after_reply = [row[:] for row in self.board.board]
+        (from_r, from_c), (to_r, to_c) = expected_reply
+        piece = board_after_reply[from_r][from_c]
+        promotion = None
+        if piece.lower() == "p" and (to_r == 0 or to_r == 7):
+            promotion = "q" if piece.islower() else "Q"
+        make_move(board_after_reply, from_r, from_c, to_r, to_c, promotion)
+        player = self.state.get_current_player()
+        self.engine_worker.ponder(board_after_reply, "b" if player == "w" else "w")
+        self.ponder_move = expected_reply
+        return True
+
     def undo(self):
-        if not self.history.can_undo():
-            return
+        if self.game.undo():
+            self.board.selected = None
+            self.board.hint = None
+            self.ponder_move = None
+            return True
+        return False
             
-        self.history.pop_last_move() # Remove the last move state
-        # The new top of history is the state to restore
-        board_snapshot, turn_snapshot = self.history.get_last_state()
-        
-        # Ensure a deep copy is assigned to the board to prevent shared references
-        self.board.board = copy.deepcopy(board_snapshot)
-        self.state.turn = turn_snapshot
-        self.board.selected = None
-        self.game_over = False
-
     def reset_game_state(self):
         self.game_over = False
+        self.ponder_move = None
@@ -0,0 +1,288 @@
+# OpeningBook.py
+"""Opening book: a sorted binary file of (position key, move, weight) records.
+
+File layout: an 8-byte magic header, then fixed-size big-endian records
+
+    key     8 bytes   Zobrist key of the position (Zobrist.compute_key)
+    move    2 bytes   from_sq << 6 | to_sq, squares numbered row * 8 + col
+    weight  2 bytes   relative frequency of the move
+
+sorted by key, and by weight (highest first) within a key. OpeningBook memory-maps
+the file and binary-searches it, so opening a book costs the same however large it
+is and no records are turned into Python objects until they are looked up.
+
+Usage:
+    python -m main.OpeningBook build games.pgn more_games.pgn -o book.bin --plies 20
+    python -m main.OpeningBook probe book.bin --fen "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - - 0 1"
+
+The rules have no castling, so a game is only read up to its first castling move.
+"""
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+from collections import defaultdict
+
+from .Fen import START_FEN, board_from_fen, move_name
+from .Position import Position, initial_board
+
+MAGIC = b"CGBOOK1\0"
+RECORD = struct.Struct(">QHH")
+_KEY = struct.Struct(">Q")
+DEFAULT_BOOK_PATH = "book.bin"  # Relative to the project root, like the image directory
+MAX_WEIGHT = 0xFFFF
+
+def encode_move(move):
+    (from_row, from_col), (to_row, to_col) = move
+    return (from_row * 8 + from_col) << 6 | (to_row * 8 + to_col)
+
+def decode_move(code):
+    from_sq, to_sq = code >> 6, code & 63
+    return ((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7))
+
+class OpeningBook:
+    """Read-only view of a book file. Use as a context manager or call close()."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < len(MAGIC) or (size - len(MAGIC)) % RECORD.size:
+                raise ValueError(f"{path} is not an opening book file")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(MAGIC)] != MAGIC:
+                self._map.close()
+                raise ValueError(f"{path} is not an opening book file")
+        except Exception:
+            self._file.close()
+            raise
+        self.num_records = (size - len(MAGIC)) // RECORD.size
+
+    @classmethod
+    def load_default(cls):
+        """Opens DEFAULT_BOOK_PATH, or returns None if there is no usable book there."""
+        try:
+            return cls(DEFAULT_BOOK_PATH)
+        except (OSError, ValueError):
+            return None
+
+    def __len__(self):
+        return self.num_records
+
+    def _key_at(self, index):
+        return _KEY.unpack_from(self._map, len(MAGIC) + index * RECORD.size)[0]
+
+    def _first_index(self, key):
+        # Binary search for the first record whose key is not below key
+        low, high = 0, self.num_records
+        while low < high:
+            mid = (low + high) // 2
+            if self._key_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def entries(self, key):
+        """[(move, weight)] stored for the position key, highest weight first."""
+        found = []
+        index = self._first_index(key)
+        while index < self.num_records:
+            record_key, code, weight = RECORD.unpack_from(self._map, len(MAGIC) + index * RECORD.size)
+            if record_key != key:
+                break
+            found.append((decode_move(code), weight))
+            index += 1
+        return found
+
+    def choose(self, position, rng=None):
+        """A legal book move for the Position, or None. With rng (a random.Random) the move
+        is picked at random in proportion to the weights; otherwise the heaviest is taken."""
+        entries = [(move, weight) for move, weight in self.entries(position.key) if weight > 0]
+        if not entries:
+            return None
+        legal = position.legal_moves()
+        entries = [(move, weight) for move, weight in entries if move in legal]
+        if not entries:
+            return None  # A key collision with another position
+        if rng is None:
+            return entries[0][0]
+        pick = rng.randrange(sum(weight for _, weight in entries))
+        for move, weight in entries:
+            pick -= weight
+            if pick < 0:
+                return move
+        return entries[-1][0]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# --- Building a book from PGN ---
+_TAG_PATTERN = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+_MOVE_NUMBER_PATTERN = re.compile(r"^\d+\.+")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+def _strip_movetext(text):
+    """Removes comments, variations, NAGs and move numbers; returns the SAN tokens."""
+    text = re.sub(r"\{[^}]*\}", " ", text)
+    text = re.sub(r";[^\n]*", " ", text)
+    # Variations may nest: strip innermost parentheses until none are left
+    previous = None
+    while previous != text:
+        previous = text
+        text = re.sub(r"\([^()]*\)", " ", text)
+    tokens = []
+    for token in text.split():
+        token = _MOVE_NUMBER_PATTERN.sub("", token)
+        if token and not token.startswith("$") and token not in RESULTS:
+            tokens.append(token)
+    return tokens
+
+def read_pgn_games(text):
+    """Yields (tags, san_moves) for every game in a PGN text, given as a string or as an
+    iterable of lines (e.g. an open file, which is then read one game at a time)."""
+    tags, movetext = {}, []
+    for line in text.splitlines() if isinstance(text, str) else text:
+        line = line.strip()
+        match = _TAG_PATTERN.match(line)
+        if match:
+            if movetext:
+                yield tags, _strip_movetext(" ".join(movetext))
+                tags, movetext = {}, []
+            tags[match.group(1)] = match.group(2)
+        elif line and not line.startswith("%"):
+            movetext.append(line)
+    if tags or movetext:
+        yield tags, _strip_movetext(" ".join(movetext))
+
+def san_to_move(position, san):
+    """Finds the legal move of the Position written in SAN (e.g. "Nf3", "exd5", "e8=Q+").
+    Returns (move, promotion_letter_or_None); raises ValueError if there is none, or
+    if the notation is ambiguous or a castling move."""
+    token = san.rstrip("+#!?")
+    if token.startswith(("O-O", "0-0")):
+        raise ValueError(f"Castling is not supported: {san!r}")
+    promotion = None
+    if "=" in token:
+        token, promotion = token.split("=", 1)
+        promotion = promotion[:1].lower()
+    elif len(token) > 2 and token[-1] in "QRBN" and token[-2].isdigit():
+        token, promotion = token[:-1], token[-1].lower()
+    token = token.replace("x", "").replace("-", "")
+    if len(token) < 2:
+        raise ValueError(f"Invalid SAN move: {san!r}")
+    kind = token[0].lower() if token[0] in "KQRBN" else "p"
+    body = token[1:] if kind != "p" else token
+    destination, hints = body[-2:], body[:-2]
+    if len(destination) != 2 or destination[0] not in "abcdefgh" or destination[1] not in "12345678":
+        raise ValueError(f"Invalid SAN move: {san!r}")
+    to_square = (8 - int(destination[1]), "abcdefgh".index(destination[0]))
+
+    candidates = []
+    for move in position.legal_moves():
+        (from_row, from_col), to = move
+        if to != to_square or position.board[from_row][from_col].lower() != kind:
+            continue
+        if any(hint != ("abcdefgh"[from_col] if hint.isalpha() else str(8 - from_row)) for hint in hints):
+            continue
+        candidates.append(move)
+    if len(candidates) != 1:
+        raise ValueError(f"{'Ambiguous' if candidates else 'Illegal'} SAN move {san!r}")
+    return candidates[0], promotion
+
+def _result_points(result, mover):
+    # Polyglot-style weighting: 2 for a win by the side that played the move, 1 for a draw
+    if result not in ("1-0", "0-1"):
+        return 1
+    return 2 if (result == "1-0") == (mover == "w") else 0
+
+def collect_book_moves(pgn_texts, max_plies=20):
+    """{(key, move_code): weight} gathered from the first max_plies plies of every game.
+    Each of pgn_texts is a string or an iterable of lines, as for read_pgn_games."""
+    weights = defaultdict(int)
+    for text in pgn_texts:
+        for tags, san_moves in read_pgn_games(text):
+            if "FEN" in tags:
+                try:
+                    board_array, turn = board_from_fen(tags["FEN"])
+                except ValueError:
+                    continue
+                position = Position(board_array, turn)
+            else:
+                position = Position(initial_board())
+            result = tags.get("Result", "*")
+            for san in san_moves[:max_plies]:
+                try:
+                    move, promotion = san_to_move(position, san)
+                except ValueError:
+                    break  # Castling, or a move these rules do not allow: the rest is unusable
+                weights[(position.key, encode_move(move))] += _result_points(result, position.turn)
+                (from_row, from_col), (to_row, to_col) = move
+                if promotion:
+                    promotion = promotion if position.turn == "w" else promotion.upper()
+                position.make_move(from_row, from_col, to_row, to_col, promotion)
+    return weights
+
+def write_book(weights, output_path):
+    """Writes {(key, move_code): weight} as a sorted book file; returns the record count."""
+    records = [(key, code, weight) for (key, code), weight in weights.items() if weight > 0]
+    if records:
+        # Scale down so the heaviest move still fits in 16 bits
+        heaviest = max(weight for _, _, weight in records)
+        if heaviest > MAX_WEIGHT:
+            records = [(key, code, max(1, weight * MAX_WEIGHT // heaviest)) for key, code, weight in records]
+    records.sort(key=lambda record: (record[0], -record[2], record[1]))
+    with open(output_path, "wb") as book_file:
+        book_file.write(MAGIC)
+        for record in records:
+            book_file.write(RECORD.pack(*record))
+    return len(records)
+
+def build_book(pgn_paths, output_path, max_plies=20):
+    """Builds a book file from PGN files; returns the record count."""
+    def texts():
+        for path in pgn_paths:
+            with open(path, encoding="utf-8", errors="replace") as pgn_file:
+                yield pgn_file  # Read line by line, one game at a time
+    return write_book(collect_book_moves(texts(), max_plies), output_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.OpeningBook", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="build a book from PGN files")
+    build_parser.add_argument("pgn", nargs="+", help="PGN files")
+    build_parser.add_argument("-o", "--output", default=DEFAULT_BOOK_PATH, help="book file to write")
+    build_parser.add_argument("--plies", type=int, default=20, help="plies of each game to include")
+    probe_parser = commands.add_parser("probe", help="list the book moves of a position")
+    probe_parser.add_argument("book", help="book file")
+    probe_parser.add_argument("--fen", default=START_FEN, help="position (default: initial position)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = build_book(args.pgn, args.output, args.plies)
+        print(f"Wrote {count} records to {args.output}")
+        return 0
+
+    try:
+        board_array, turn = board_from_fen(args.fen)
+    except ValueError as e:
+        parser.error(str(e))
+    with OpeningBook(args.book) as book:
+        entries = book.entries(Position(board_array, turn).key)
+        for move, weight in entries:
+            print(f"{move_name(move)} {weight}")
+        if not entries:
+            print("Position not in book")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
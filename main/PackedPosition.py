@@ -0,0 +1,128 @@
+# PackedPosition.py
+"""Fixed-size binary encoding of a position: 33 bytes, whatever is on the board.
+
+    bytes 0-31  64 squares, 4 bits each, two squares per byte: square 2i in the high
+                nibble of byte i, square 2i + 1 in the low nibble (sq = row * 8 + col),
+                so the hex dump reads square by square. 0 is an empty square, 1-12 a
+                piece in Bitboard.PIECE_CHARS order.
+    byte 32     flags: bit 0 set when Black is to move; the other bits must be 0
+
+The same position always gives the same bytes, so a packed position works as a dict
+or cache key, as a record in a file of fixed-size records, and as a message between
+processes (bytes pickle cheaply).
+
+Usage:
+    python -m main.PackedPosition --positions 20000   # round-trip speed and size against FEN
+"""
+import argparse
+import random
+import sys
+import time
+
+from .Bitboard import PIECE_CHARS
+from .Fen import board_from_fen, board_to_fen
+from .Position import Position, initial_board
+
+PACKED_SIZE = 33
+BLACK_TO_MOVE = 0x01
+
+# Squares are converted to and from hex digits, one per square, so bytes.fromhex()
+# and bytes.hex() do the nibble packing
+_HEX_DIGITS = "0123456789abc"
+_EMPTY_MARK = "."
+_HEX_OF_PIECE = str.maketrans({_EMPTY_MARK: "0",
+                               **{piece_char: _HEX_DIGITS[index + 1] for index, piece_char in enumerate(PIECE_CHARS)}})
+_PIECE_OF_HEX = {"0": "", **{_HEX_DIGITS[index + 1]: piece_char for index, piece_char in enumerate(PIECE_CHARS)}}
+
+def pack_position(board_array, turn):
+    """The 33-byte encoding of a list-of-lists board and side to move."""
+    squares = "".join([piece_on_square or _EMPTY_MARK for row in board_array for piece_on_square in row])
+    return bytes.fromhex(squares.translate(_HEX_OF_PIECE) + ("01" if turn == "b" else "00"))
+
+def unpack_position(packed):
+    """(board_array, turn) of a packed position; raises ValueError if it is not a valid encoding."""
+    if len(packed) != PACKED_SIZE:
+        raise ValueError(f"A packed position is {PACKED_SIZE} bytes, got {len(packed)}")
+    flags = packed[32]
+    if flags & ~BLACK_TO_MOVE:
+        raise ValueError(f"Unknown flag bits in packed position: {flags:#04x}")
+    try:
+        squares = [_PIECE_OF_HEX[digit] for digit in packed[:32].hex()]
+    except KeyError:
+        raise ValueError("Invalid piece code in packed position") from None
+    board_array = [squares[start:start + 8] for start in range(0, 64, 8)]
+    return board_array, "b" if flags & BLACK_TO_MOVE else "w"
+
+def pack_fen(fen):
+    return pack_position(*board_from_fen(fen))
+
+def unpack_fen(packed):
+    return board_to_fen(*unpack_position(packed))
+
+# --- Files of packed records ---
+def write_records(path, positions):
+    """Writes (board_array, turn) pairs as consecutive 33-byte records; returns the count."""
+    count = 0
+    with open(path, "wb") as record_file:
+        for board_array, turn in positions:
+            record_file.write(pack_position(board_array, turn))
+            count += 1
+    return count
+
+def read_records(path):
+    """Yields (board_array, turn) for every record of a file written by write_records."""
+    with open(path, "rb") as record_file:
+        while True:
+            packed = record_file.read(PACKED_SIZE)
+            if not packed:
+                return
+            yield unpack_position(packed)
+
+# --- Benchmark ---
+def benchmark(boards):
+    """Round trips every (board_array, turn) through the packed encoding and through FEN.
+    Returns {"packed"/"fen": (round trips per second, average bytes per position)}."""
+    results = {}
+    for name, encode, decode in (("packed", pack_position, unpack_position),
+                                 ("fen", board_to_fen, board_from_fen)):
+        start = time.perf_counter()
+        total_bytes = 0
+        for board_array, turn in boards:
+            encoded = encode(board_array, turn)
+            total_bytes += len(encoded)
+            decode(encoded)
+        elapsed = time.perf_counter() - start
+        results[name] = (len(boards) / elapsed, total_bytes / len(boards))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.PackedPosition", description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=20000, help="positions to round-trip")
+    parser.add_argument("--fen", help="print the packed bytes of this position instead")
+    args = parser.parse_args(argv)
+
+    if args.fen:
+        try:
+            packed = pack_fen(args.fen)
+        except ValueError as e:
+            parser.error(str(e))
+        print(packed.hex())
+        return 0
+
+    rng, boards = random.Random(0), []
+    while len(boards) < args.positions:
+        # Positions from random games, so the piece count varies like in real data
+        position = Position(initial_board())
+        for _ in range(min(120, args.positions - len(boards))):
+            moves = position.legal_moves()
+            if not moves:
+                break
+            boards.append(([row[:] for row in position.board], position.turn))
+            position.play(rng.choice(moves))
+
+    for name, (per_second, size) in benchmark(boards).items():
+        print(f"{name:7s} {per_second:10,.0f} round trips/s  {size:5.1f} bytes/position")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
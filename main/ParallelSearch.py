@@ -0,0 +1,177 @@
+# ParallelSearch.py
+"""Root-splitting parallel search over a pool of worker processes.
+
+The legal moves of the root are dealt out round-robin to the workers. Each worker
+rebuilds the position from its FEN, searches only its own root moves with a normal
+Engine (iterative deepening, its own transposition table kept between searches)
+and sends back the score and principal variation of every finished depth. The best
+score among the workers at each depth they all finished is the result.
+
+Usage:
+    python -m main.ParallelSearch --threads 4 --depth 5            # one search
+    python -m main.ParallelSearch --benchmark --threads 4 --depth 5 # speedup for 1..4 workers
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .Engine import Engine, SearchInfo, SearchResult, MATE_THRESHOLD
+from .Fen import START_FEN, board_from_fen, board_to_fen, move_name
+from .Position import Position
+from .TranspositionTable import DEFAULT_SIZE_MB, DEPTH_PREFERRED
+
+# --- Worker side ---
+_worker_engine = None
+
+def _init_worker(hash_mb, hash_scheme):
+    global _worker_engine
+    _worker_engine = Engine(hash_mb, hash_scheme)
+
+def _search_root_moves(fen, root_moves, max_depth, time_limit, node_limit):
+    """Runs in a worker: returns [(depth, score, nodes, elapsed, pv), ...] for finished depths."""
+    board_array, turn = board_from_fen(fen)
+    result = _worker_engine.search(Position(board_array, turn), max_depth, time_limit, node_limit,
+                                   root_moves=root_moves)
+    if not result.iterations:
+        return [(0, 0, result.nodes, result.elapsed, result.pv)]
+    return [(info.depth, info.score, info.nodes, info.elapsed, info.pv) for info in result.iterations]
+
+def _ready(_):
+    return os.getpid()
+
+# --- Parent side ---
+def _merge_iterations(worker_iterations):
+    """Combines the per-worker reports into one SearchInfo per depth all workers finished.
+
+    A worker that stopped early on a mate score counts as having that score at every
+    deeper depth."""
+    merged = []
+    depth = 1
+    while True:
+        reports = []
+        for iterations in worker_iterations:
+            report = next((it for it in iterations if it[0] == depth), None)
+            if report is None and iterations[-1][0] < depth and abs(iterations[-1][1]) >= MATE_THRESHOLD:
+                report = iterations[-1]
+            if report is None:
+                return merged
+            reports.append(report)
+        best = max(reports, key=lambda report: report[1])
+        nodes = sum(report[2] for report in reports)
+        elapsed = max(report[3] for report in reports)
+        merged.append(SearchInfo(depth, best[1], nodes, elapsed, best[4]))
+        if all(report[0] < depth for report in reports):
+            return merged  # Every worker stopped on a mate: deeper depths add nothing
+        depth += 1
+
+class ParallelEngine:
+    """Engine-compatible search spread over `threads` worker processes.
+
+    The pool is started once and reused; close() it (or use a with block) when done.
+    hash_mb and hash_scheme size the table of every worker; book, an OpeningBook, is
+    consulted in this process before the root is split.
+    """
+    def __init__(self, threads=None, hash_mb=DEFAULT_SIZE_MB, hash_scheme=DEPTH_PREFERRED, book=None):
+        self.threads = threads or os.cpu_count() or 1
+        self.book = book
+        self.book_rng = random.Random()
+        self._engine = Engine(hash_mb, hash_scheme)  # Searches roots with nothing to split
+        self._pool = ProcessPoolExecutor(max_workers=self.threads, initializer=_init_worker,
+                                         initargs=(hash_mb, hash_scheme))
+
+    def warm_up(self):
+        """Starts every worker process now instead of on the first search."""
+        list(self._pool.map(_ready, range(self.threads)))
+
+    def search(self, position, max_depth=None, time_limit=None, node_limit=None, info_callback=None):
+        """Same arguments and result as Engine.search; node_limit is shared out between the workers.
+        info_callback is called once per finished depth after all workers are done."""
+        start = time.perf_counter()
+        if self.book is not None:
+            book_move = self.book.choose(position, self.book_rng)
+            if book_move is not None:
+                return SearchResult(0, 0, 0, time.perf_counter() - start, [book_move], [], from_book=True)
+        root_moves = position.legal_moves()
+        if len(root_moves) <= 1:
+            # Nothing to split: a single process is enough
+            return self._engine.search(position, max_depth, time_limit, node_limit, info_callback)
+
+        fen = board_to_fen(position.board, position.turn)
+        groups = [root_moves[i::self.threads] for i in range(min(self.threads, len(root_moves)))]
+        worker_node_limit = node_limit // len(groups) if node_limit else None
+        futures = [self._pool.submit(_search_root_moves, fen, group, max_depth, time_limit, worker_node_limit)
+                   for group in groups]
+        worker_iterations = [future.result() for future in futures]
+
+        iterations = _merge_iterations(worker_iterations)
+        if info_callback:
+            for info in iterations:
+                info_callback(info)
+        elapsed = time.perf_counter() - start
+        nodes = sum(iterations_of_worker[-1][2] for iterations_of_worker in worker_iterations)
+        if iterations:
+            last = iterations[-1]
+            return SearchResult(last.depth, last.score, nodes, elapsed, last.pv, iterations)
+        return SearchResult(0, 0, nodes, elapsed, [root_moves[0]], iterations)
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def benchmark(position, max_threads, max_depth, hash_mb=DEFAULT_SIZE_MB):
+    """Searches position to max_depth with 1..max_threads workers.
+
+    Returns [(threads, seconds, nodes, best_move)]; pool start-up is not timed."""
+    rows = []
+    for threads in range(1, max_threads + 1):
+        with ParallelEngine(threads, hash_mb) as engine:
+            engine.warm_up()
+            start = time.perf_counter()
+            result = engine.search(position, max_depth=max_depth)
+            rows.append((threads, time.perf_counter() - start, result.nodes, result.best_move))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.ParallelSearch", description=__doc__.splitlines()[0])
+    parser.add_argument("--fen", default=START_FEN, help="position to search (default: initial position)")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--depth", type=int, help="maximum depth in plies")
+    parser.add_argument("--movetime", type=float, help="time budget in seconds")
+    parser.add_argument("--hash", type=float, default=DEFAULT_SIZE_MB, help="transposition table size in MB per worker")
+    parser.add_argument("--benchmark", action="store_true", help="time a fixed-depth search with 1..threads workers")
+    args = parser.parse_args(argv)
+
+    try:
+        board_array, turn = board_from_fen(args.fen)
+    except ValueError as e:
+        parser.error(str(e))
+    position = Position(board_array, turn)
+
+    if args.benchmark:
+        depth = args.depth or 5
+        rows = benchmark(position, args.threads, depth, args.hash)
+        base_time = rows[0][1]
+        print(f"Depth {depth} search, {os.cpu_count()} CPUs")
+        for threads, seconds, nodes, best_move in rows:
+            print(f"{threads:2d} workers: {seconds:7.3f}s {nodes:9d} nodes "
+                  f"speedup {base_time / seconds:4.2f}x  bestmove {move_name(best_move)}")
+        return 0
+
+    with ParallelEngine(args.threads, args.hash) as engine:
+        result = engine.search(position, max_depth=args.depth, time_limit=args.movetime,
+                               info_callback=lambda info: print(f"info {info}"))
+    best = move_name(result.best_move) if result.best_move else "(none)"
+    print(f"bestmove {best}")
+    print(f"{result.nodes} nodes in {result.elapsed:.3f}s ({result.nps:,} nodes/s) on {args.threads} workers")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
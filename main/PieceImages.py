@@ -0,0 +1,187 @@
+# PieceImages.py
+"""Piece images rasterised from the SVGs in image/, cached on disk and in memory.
+
+Rendering an SVG with CairoSVG costs tens of milliseconds per piece, so every PNG
+it produces is kept under the user cache directory, named after the SHA-256 of the
+SVG file and the pixel size:
+
+    <cache dir>/<sha256 prefix>_<size>px.png
+
+Editing an SVG or changing the display size therefore picks a new file, and later
+launches only read the PNGs. CHESS_CACHE_DIR overrides the cache location.
+
+One PieceImageCache per process (shared_cache()) holds the decoded images, so every
+Board shares them. Nothing is rendered until an image is first asked for.
+
+Usage:
+    python -m main.PieceImages --benchmark   # time cold (empty cache) and warm loads
+    python -m main.PieceImages --clear       # delete the cached PNGs
+"""
+import argparse
+import base64
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+IMAGE_DIRECTORY = "image"  # Relative to the project root, like the opening book
+PIECE_FILES = {piece: f"Chess_{piece}lt45.svg" for piece in "prnbqk"}
+PIECE_FILES.update({piece: f"Chess_{piece}dt45.svg" for piece in "PRNBQK"})
+
+def cache_directory():
+    """Where rendered PNGs are kept: $CHESS_CACHE_DIR, else the platform's user cache directory."""
+    override = os.environ.get("CHESS_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "chessgame", "pieces")
+
+def cache_file_name(svg_bytes, size):
+    return f"{hashlib.sha256(svg_bytes).hexdigest()[:32]}_{size}px.png"
+
+def _render_svg(svg_bytes, size):
+    import cairosvg  # Only needed when the cache misses
+    return cairosvg.svg2png(bytestring=svg_bytes, output_width=size, output_height=size)
+
+def load_png(svg_path, size, cache_dir=None):
+    """PNG bytes of the SVG at svg_path rendered size x size pixels, and whether they came from
+    the disk cache. Raises OSError if the SVG is missing and ImportError if it has to be rendered
+    without CairoSVG installed."""
+    with open(svg_path, "rb") as svg_file:
+        svg_bytes = svg_file.read()
+    cache_dir = cache_dir or cache_directory()
+    cache_path = os.path.join(cache_dir, cache_file_name(svg_bytes, size))
+    try:
+        with open(cache_path, "rb") as png_file:
+            return png_file.read(), True
+    except OSError:
+        pass
+    png_bytes = _render_svg(svg_bytes, size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so another process never reads half a PNG
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(png_bytes)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Image cache: could not write {cache_path}: {e}")
+    return png_bytes, False
+
+class PieceImageCache:
+    """Process-wide store of piece images, rendered or read from disk on first use."""
+    def __init__(self, image_dir=IMAGE_DIRECTORY, cache_dir=None):
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self._png = {}     # (piece, size) -> PNG bytes, or None if unavailable
+        self._photos = {}  # (piece, size) -> tk.PhotoImage
+        self.disk_hits = 0
+        self.rendered = 0
+        self.renderer_missing = False  # CairoSVG was needed but could not be imported
+
+    def png(self, piece, size):
+        """PNG bytes for the piece character at size pixels, or None if it cannot be loaded."""
+        key = (piece, size)
+        if key not in self._png:
+            png_bytes = None
+            try:
+                png_bytes, from_disk = load_png(os.path.join(self.image_dir, PIECE_FILES[piece]), size,
+                                                self.cache_dir)
+                if from_disk:
+                    self.disk_hits += 1
+                else:
+                    self.rendered += 1
+            except ImportError:
+                if not self.renderer_missing:
+                    self.renderer_missing = True
+                    print("CairoSVG is not installed: pieces without a cached image are drawn as Unicode "
+                          "characters (pip install CairoSVG)")
+            except OSError as e:
+                print(f"Image Load Error: piece '{piece}' will use fallback: {e}")
+            except Exception as e:
+                print(f"Image Load Error: Failed to render piece '{piece}': {e}")
+            self._png[key] = png_bytes
+        return self._png[key]
+
+    def photo(self, piece, size):
+        """tk.PhotoImage for the piece (needs a Tk root), or None if it cannot be loaded."""
+        key = (piece, size)
+        photo = self._photos.get(key)
+        if photo is None:
+            png_bytes = self.png(piece, size)
+            if png_bytes is None:
+                return None
+            import tkinter as tk
+            try:
+                photo = tk.PhotoImage(data=base64.b64encode(png_bytes), format="png")
+            except tk.TclError as e:
+                print(f"Tkinter PhotoImage creation error for {piece}: {e}")
+                return None
+            self._photos[key] = photo
+        return photo
+
+    def clear(self):
+        """Forgets the images held in memory; the disk cache is kept."""
+        self._png.clear()
+        self._photos.clear()
+
+_shared_cache = None
+
+def shared_cache():
+    """The PieceImageCache shared by every Board in this process."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = PieceImageCache()
+    return _shared_cache
+
+def clear_disk_cache(cache_dir=None):
+    """Deletes the cached PNGs; returns how many files were removed."""
+    cache_dir = cache_dir or cache_directory()
+    if not os.path.isdir(cache_dir):
+        return 0
+    names = [name for name in os.listdir(cache_dir) if name.endswith(".png")]
+    for name in names:
+        os.remove(os.path.join(cache_dir, name))
+    return len(names)
+
+def benchmark(size, image_dir=IMAGE_DIRECTORY):
+    """Loads all twelve pieces with an empty cache, then again from the filled cache, each time
+    in a fresh PieceImageCache. Returns (cold_seconds, warm_seconds)."""
+    cache_dir = tempfile.mkdtemp(prefix="chess-pieces-")
+    try:
+        timings = []
+        for _ in range(2):
+            images = PieceImageCache(image_dir, cache_dir)
+            start = time.perf_counter()
+            for piece in PIECE_FILES:
+                images.png(piece, size)
+            timings.append(time.perf_counter() - start)
+        return tuple(timings)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.PieceImages", description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=68, help="piece size in pixels (the board uses 68)")
+    parser.add_argument("--benchmark", action="store_true", help="time loading all pieces with a cold and a warm cache")
+    parser.add_argument("--clear", action="store_true", help="delete the cached PNGs")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        print(f"Removed {clear_disk_cache()} cached images from {cache_directory()}")
+    if args.benchmark:
+        cold, warm = benchmark(args.size)
+        print(f"{len(PIECE_FILES)} pieces at {args.size}px: cold {cold * 1000:.1f} ms, warm {warm * 1000:.1f} ms")
+    if not (args.clear or args.benchmark):
+        print(f"Cache directory: {cache_directory()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
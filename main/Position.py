@@ -0,0 +1,97 @@
+# Position.py
+from .Rules import (make_move, unmake_move, get_king_position, is_in_check, get_all_legal_moves_for_player,
+                    get_legal_captures_for_player)
+from .Zobrist import compute_key, update_key, SIDE_TO_MOVE_KEY
+
+def initial_board():
+    return [
+        ["R", "N", "B", "Q", "K", "B", "N", "R"],
+        ["P"] * 8,
+        [""] * 8,
+        [""] * 8,
+        [""] * 8,
+        [""] * 8,
+        ["p"] * 8,
+        ["r", "n", "b", "q", "k", "b", "n", "r"],
+    ]
+
+class Position:
+    """A board array together with the state kept up to date as moves are made and taken back:
+    the side to move, the Zobrist key, both king squares, the number of pieces on the board
+    and the stack of played MoveRecords.
+    """
+    def __init__(self, board_array, turn="w"):
+        self.set_board(board_array, turn)
+
+    def set_board(self, board_array, turn="w"):
+        """Replaces the position; the derived state is recomputed from scratch."""
+        self.board = board_array
+        self.turn = turn
+        self.key = compute_key(board_array, turn)
+        self.king_squares = {"w": get_king_position(board_array, "w"), "b": get_king_position(board_array, "b")}
+        self.piece_count = sum(1 for row in board_array for piece_on_square in row if piece_on_square)
+        self.move_stack = []
+
+    def king_position(self, player_color):
+        """(row, col) of player_color's king, or None if it is not on the board."""
+        return self.king_squares[player_color]
+
+    def in_check(self):
+        """Is the side to move in check?"""
+        return is_in_check(self.board, self.turn, self.king_squares[self.turn])
+
+    def legal_moves(self):
+        """Legal moves of the side to move, in the Rules format."""
+        return get_all_legal_moves_for_player(self.board, self.turn, self.king_squares[self.turn])
+
+    def legal_captures(self):
+        """Legal captures and promotions of the side to move."""
+        return get_legal_captures_for_player(self.board, self.turn, self.king_squares[self.turn])
+
+    def set_turn(self, turn):
+        if turn != self.turn:
+            self.turn = turn
+            self.key ^= SIDE_TO_MOVE_KEY
+
+    def make_move(self, from_row, from_col, to_row, to_col, promotion=None):
+        """Plays a move (no legality checks) and returns its MoveRecord."""
+        record = make_move(self.board, from_row, from_col, to_row, to_col, promotion)
+        self.key = update_key(self.key, record)
+        self.turn = "b" if self.turn == "w" else "w"
+        self._update_king_squares(record, (to_row, to_col), None)
+        if record.captured:
+            self.piece_count -= 1
+        self.move_stack.append(record)
+        return record
+
+    def play(self, move):
+        """Plays a ((from_r, from_c), (to_r, to_c)) move as make_move does; a pawn reaching
+        the last rank becomes a queen. Used where no one is asked (perft, the engine)."""
+        (from_row, from_col), (to_row, to_col) = move
+        piece = self.board[from_row][from_col]
+        promotion = None
+        if (piece == "p" or piece == "P") and (to_row == 0 or to_row == 7):
+            promotion = "q" if piece == "p" else "Q"
+        return self.make_move(from_row, from_col, to_row, to_col, promotion)
+
+    def unmake_move(self):
+        """Takes back the last move played through make_move and returns its MoveRecord."""
+        record = self.move_stack.pop()
+        unmake_move(self.board, record)
+        self.key = update_key(self.key, record)
+        self.turn = "b" if self.turn == "w" else "w"
+        self._update_king_squares(record, (record.from_row, record.from_col), (record.to_row, record.to_col))
+        if record.captured:
+            self.piece_count += 1
+        return record
+
+    def _update_king_squares(self, record, moved_king_square, captured_king_square):
+        # A king moves with the record's piece; promotions never create or remove a king.
+        # A captured king only happens on hand-built boards, but undo must bring it back.
+        if record.piece == "k" or record.piece == "K":
+            self.king_squares["w" if record.piece == "k" else "b"] = moved_king_square
+        if record.captured == "k" or record.captured == "K":
+            self.king_squares["w" if record.captured == "k" else "b"] = captured_king_square
+
+    def can_unmake(self):
+        return bool(self.move_stack)
@@ -1,4 +1,44 @@
-import copy
+from .Bitboard import BitboardPosition
+from .Tables import (KNIGHT_TARGETS, KING_TARGETS, KNIGHT_MASKS, KING_MASKS, PAWN_CAPTURE_TARGETS,
+                     ROOK_RAYS, BISHOP_RAYS, SLIDER_RAYS, BETWEEN, LINE_KIND)
+from .Tablebase import probe as probe_tablebase
+
+# The attack, check and move generation queries below accept either a list-of-lists
+# board or a BitboardPosition; the latter is answered with bitwise operations.
+
+# --- Reversible move execution ---
+class MoveRecord:
+    """Everything unmake_move needs to take back a move played by make_move."""
+    __slots__ = ("from_row", "from_col", "to_row", "to_col", "piece", "captured", "promotion")
+
+    def __init__(self, from_row, from_col, to_row, to_col, piece, captured, promotion):
+        self.from_row = from_row
+        self.from_col = from_col
+        self.to_row = to_row
+        self.to_col = to_col
+        self.piece = piece          # The piece that moved (the pawn itself for promotions)
+        self.captured = captured    # Piece that stood on the target square, "" if none
+        self.promotion = promotion  # Piece the pawn was promoted to, None if no promotion
+
+    def __repr__(self):
+        return (f"MoveRecord(({self.from_row},{self.from_col})->({self.to_row},{self.to_col}), "
+                f"piece={self.piece!r}, captured={self.captured!r}, promotion={self.promotion!r})")
+
+def make_move(board, from_row, from_col, to_row, to_col, promotion=None):
+    """Plays a move on the board in place and returns the MoveRecord that undoes it.
+    No legality checks are done here. promotion is the piece placed on the target
+    square instead of the moving pawn, already in the mover's case.
+    """
+    piece = board[from_row][from_col]
+    record = MoveRecord(from_row, from_col, to_row, to_col, piece, board[to_row][to_col], promotion)
+    board[to_row][to_col] = promotion or piece
+    board[from_row][from_col] = ""
+    return record
+
+def unmake_move(board, record):
+    """Takes back a move played by make_move, restoring the moved and captured pieces."""
+    board[record.from_row][record.from_col] = record.piece
+    board[record.to_row][record.to_col] = record.captured
 
 # --- Basic movement rules specific to piece types ---
 def is_valid_pawn_move(board, fr, fc, tr, tc, piece, target):
@@ -18,51 +58,47 @@ def is_valid_pawn_move(board, fr, fc, tr, tc, piece, target):
     return False
 
 def is_valid_knight_move(fr, fc, tr, tc):
-    dr, dc = abs(tr - fr), abs(tc - fc)
-    return (dr, dc) in [(2, 1), (1, 2)]
+    return bool(KNIGHT_MASKS[fr * 8 + fc] >> (tr * 8 + tc) & 1)
 
 def is_valid_king_move(fr, fc, tr, tc):
     # Does not handle castling or moving into check (handled by main is_valid_move)
-    dr, dc = abs(tr - fr), abs(tc - fc)
-    return (dr <= 1 and dc <= 1) and (dr != 0 or dc != 0)
+    return bool(KING_MASKS[fr * 8 + fc] >> (tr * 8 + tc) & 1)
 
-def is_path_clear_horizontal(board, row, col1, col2):
-    step = 1 if col2 > col1 else -1
-    for c in range(col1 + step, col2, step):
-        if board[row][c]: return False
+def _is_path_clear(board, fr, fc, tr, tc):
+    # Squares strictly between come from the precomputed table; None means not aligned
+    between = BETWEEN[fr * 8 + fc][tr * 8 + tc]
+    if between is None:
+        return False
+    for r, c in between:
+        if board[r][c]: return False
     return True
 
+def is_path_clear_horizontal(board, row, col1, col2):
+    return _is_path_clear(board, row, col1, row, col2)
+
 def is_path_clear_vertical(board, col, row1, row2):
-    step = 1 if row2 > row1 else -1
-    for r in range(row1 + step, row2, step):
-        if board[r][col]: return False
-    return True
+    return _is_path_clear(board, row1, col, row2, col)
 
 def is_path_clear_diagonal(board, fr, fc, tr, tc):
-    dr = 1 if tr > fr else -1
-    dc = 1 if tc > fc else -1
-    for i in range(1, abs(tr - fr)):
-        if board[fr + i * dr][fc + i * dc]: return False
-    return True
+    return _is_path_clear(board, fr, fc, tr, tc)
 
 def is_valid_rook_move(board, fr, fc, tr, tc):
-    if fr == tr: return is_path_clear_horizontal(board, fr, fc, tc)
-    if fc == tc: return is_path_clear_vertical(board, fc, fr, tr)
+    if LINE_KIND[fr * 8 + fc][tr * 8 + tc] == "r": return _is_path_clear(board, fr, fc, tr, tc)
     return False
 
 def is_valid_bishop_move(board, fr, fc, tr, tc):
-    if abs(fr - tr) == abs(fc - tc): return is_path_clear_diagonal(board, fr, fc, tr, tc)
+    if LINE_KIND[fr * 8 + fc][tr * 8 + tc] == "b": return _is_path_clear(board, fr, fc, tr, tc)
     return False
 
 def is_valid_queen_move(board, fr, fc, tr, tc):
-    if fr == tr: return is_path_clear_horizontal(board, fr, fc, tc)
-    if fc == tc: return is_path_clear_vertical(board, fc, fr, tr)
-    if abs(fr - tr) == abs(fc - tc): return is_path_clear_diagonal(board, fr, fc, tr, tc)
-    return False
+    return _is_path_clear(board, fr, fc, tr, tc)
 
 # --- Helper functions for attack and check detection ---
 def get_king_position(board_array, player_color):
     """Finds the position of the king for the given player color."""
+    if isinstance(board_array, BitboardPosition):
+        king_sq = board_array.king_square(player_color)
+        return None if king_sq is None else divmod(king_sq, 8)
     king_piece = 'k' if player_color == 'w' else 'K' # White king 'k', Black king 'K'
     for r_idx, row in enumerate(board_array):
         for c_idx, piece_on_square in enumerate(row):
@@ -107,22 +143,58 @@ def _is_valid_move_for_attack_check(board, from_row, from_col, to_row, to_col, c
     return False
 
 def is_square_attacked(board_array, r_coord_to_check, c_coord_to_check, attacker_color):
-    """Checks if a square (r_coord_to_check, c_coord_to_check) is attacked by any piece of attacker_color."""
-    for r_idx, row_content in enumerate(board_array):
-        for c_idx, piece_on_square in enumerate(row_content):
-            if not piece_on_square: continue
+    """Checks if a square (r_coord_to_check, c_coord_to_check) is attacked by any piece of attacker_color.
+    A square holding one of attacker_color's own pieces does not count as attacked.
 
-            piece_owner_is_attacker = (attacker_color == 'w' and piece_on_square.islower()) or \
-                                      (attacker_color == 'b' and piece_on_square.isupper())
+    Works outward from the square: pawn, knight and king attackers can only stand on a
+    few fixed offsets, and a slider must be the first piece met along one of the eight rays.
+    """
+    if isinstance(board_array, BitboardPosition):
+        return board_array.is_square_attacked(r_coord_to_check * 8 + c_coord_to_check, attacker_color)
+    r, c = r_coord_to_check, c_coord_to_check
+    if attacker_color == 'w':
+        pawn, knight, bishop, rook, queen, king = "p", "n", "b", "r", "q", "k"
+        pawn_row = r + 1  # White pawns capture towards row 0, so they attack from the row below
+    else:
+        pawn, knight, bishop, rook, queen, king = "P", "N", "B", "R", "Q", "K"
+        pawn_row = r - 1
+
+    target = board_array[r][c]
+    if target and (target.islower() if attacker_color == 'w' else target.isupper()):
+        return False
 
-            if piece_owner_is_attacker:
-                if _is_valid_move_for_attack_check(board_array, r_idx, c_idx, r_coord_to_check, c_coord_to_check, attacker_color):
-                    return True
+    if 0 <= pawn_row < 8:
+        row_content = board_array[pawn_row]
+        if (c > 0 and row_content[c - 1] == pawn) or (c < 7 and row_content[c + 1] == pawn):
+            return True
+    sq = r * 8 + c
+    for r_idx, c_idx in KNIGHT_TARGETS[sq]:
+        if board_array[r_idx][c_idx] == knight:
+            return True
+    for r_idx, c_idx in KING_TARGETS[sq]:
+        if board_array[r_idx][c_idx] == king:
+            return True
+
+    # Walk each ray until the first blocker; only a matching slider there attacks the square
+    for rays, slider in ((ROOK_RAYS[sq], rook), (BISHOP_RAYS[sq], bishop)):
+        for ray in rays:
+            for r_idx, c_idx in ray:
+                piece_on_square = board_array[r_idx][c_idx]
+                if piece_on_square:
+                    if piece_on_square == slider or piece_on_square == queen:
+                        return True
+                    break
     return False
 
-def is_in_check(board_array, player_color_king_to_check):
-    """Checks if the player_color_king_to_check's king is currently in check."""
-    king_pos = get_king_position(board_array, player_color_king_to_check)
+def is_in_check(board_array, player_color_king_to_check, king_pos=None):
+    """Checks if the player_color_king_to_check's king is currently in check.
+    king_pos is the king's (row, col) if the caller tracks it (e.g. Position.king_position);
+    when None the board is scanned for the king.
+    """
+    if isinstance(board_array, BitboardPosition):
+        return board_array.is_in_check(player_color_king_to_check)
+    if king_pos is None:
+        king_pos = get_king_position(board_array, player_color_king_to_check)
     if not king_pos:
         # This case should ideally not happen if a king is always on the board for each player.
         # However, if king_pos is None, the king is not on the board, so not in check.
@@ -181,62 +253,197 @@ def is_valid_move(board, from_row, from_col, to_row, to_col, current_player):
         return False
 
     # 3. Check if own king will be in check after this move
-    # Create a temporary board to simulate the move
-    temp_board = copy.deepcopy(board)
-    temp_board[to_row][to_col] = piece  # Move the piece to the target position
-    temp_board[from_row][from_col] = ""    # Clear the original position
-
-    # If the current player's king is in check after simulating the move, this move is illegal
-    if is_in_check(temp_board, current_player):
+    if _leaves_king_in_check(board, from_row, from_col, to_row, to_col, current_player):
         return False
 
     return True # All checks passed, it's a legal move
 
-# --- Get all legal moves, check for checkmate and stalemate ---
-def get_all_legal_moves_for_player(board_array, player_color):
-    """Generates all legal moves for the given player.
+def _leaves_king_in_check(board, from_row, from_col, to_row, to_col, current_player, king_pos=None):
+    """Internal helper: Would playing this move leave current_player's own king in check?
+    king_pos is the king's square before the move, if known.
+    """
+    # Simulate the move on the board itself and take it back afterwards
+    record = make_move(board, from_row, from_col, to_row, to_col)
+    if record.piece == ('k' if current_player == 'w' else 'K'):
+        king_pos = (to_row, to_col)
+    try:
+        return is_in_check(board, current_player, king_pos)
+    finally:
+        unmake_move(board, record)
+
+# --- Move generation from piece movement patterns ---
+
+def generate_pseudo_legal_moves(board_array, player_color):
+    """Lists candidate moves for player_color straight from piece movement patterns.
+    Candidates obey movement and capture rules but may still leave the own king in check.
     A move is ((from_r, from_c), (to_r, to_c)).
     """
-    legal_moves = []
+    if isinstance(board_array, BitboardPosition):
+        return [((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7))
+                for from_sq, to_sq in board_array.generate_pseudo_legal_moves(player_color)]
+    is_own = str.islower if player_color == 'w' else str.isupper
+    moves = []
     for r_idx, row_content in enumerate(board_array):
         for c_idx, piece_on_square in enumerate(row_content):
-            if not piece_on_square: # Empty square
-                continue
-
-            # Check if the piece belongs to the current player
-            piece_belongs_to_player = (player_color == 'w' and piece_on_square.islower()) or \
-                                      (player_color == 'b' and piece_on_square.isupper())
-
-            if piece_belongs_to_player:
-                # Try moving this piece to all possible squares on the board
-                for to_r in range(8):
-                    for to_c in range(8):
-                        if r_idx == to_r and c_idx == to_c: # Cannot move to the same square
-                            continue
-                        
-                        # Use the main is_valid_move which includes self-check prevention
-                        if is_valid_move(board_array, r_idx, c_idx, to_r, to_c, player_color):
-                            legal_moves.append(((r_idx, c_idx), (to_r, to_c)))
-    return legal_moves
-
-def is_checkmate(board_array, player_color):
-    """Checks if the given player is checkmated."""
-    if not is_in_check(board_array, player_color):
+            if piece_on_square and is_own(piece_on_square):
+                _add_piece_moves(moves, board_array, r_idx, c_idx, piece_on_square.lower(), player_color, is_own)
+    return moves
+
+def _add_piece_moves(moves, board_array, r_idx, c_idx, kind, player_color, is_own):
+    """Internal helper: appends the candidate moves of the piece of the given kind on (r_idx, c_idx)."""
+    if kind == "p":
+        direction = -1 if player_color == 'w' else 1
+        start_row = 6 if player_color == 'w' else 1
+        to_r = r_idx + direction
+        if not 0 <= to_r < 8:
+            return
+        # Pushes: one step, and two steps from the starting row if both squares are empty
+        if not board_array[to_r][c_idx]:
+            moves.append(((r_idx, c_idx), (to_r, c_idx)))
+            if r_idx == start_row and not board_array[to_r + direction][c_idx]:
+                moves.append(((r_idx, c_idx), (to_r + direction, c_idx)))
+        # Diagonal captures
+        for to_r, to_c in PAWN_CAPTURE_TARGETS[player_color][r_idx * 8 + c_idx]:
+            target = board_array[to_r][to_c]
+            if target and not is_own(target):
+                moves.append(((r_idx, c_idx), (to_r, to_c)))
+    elif kind == "n" or kind == "k":
+        for to_r, to_c in (KNIGHT_TARGETS if kind == "n" else KING_TARGETS)[r_idx * 8 + c_idx]:
+            target = board_array[to_r][to_c]
+            if not target or not is_own(target):
+                moves.append(((r_idx, c_idx), (to_r, to_c)))
+    elif kind in SLIDER_RAYS:
+        for ray in SLIDER_RAYS[kind][r_idx * 8 + c_idx]:
+            # Walk the ray until the edge of the board or the first blocker
+            for to_r, to_c in ray:
+                target = board_array[to_r][to_c]
+                if target:
+                    if not is_own(target):
+                        moves.append(((r_idx, c_idx), (to_r, to_c)))
+                    break
+                moves.append(((r_idx, c_idx), (to_r, to_c)))
+
+# --- Get all legal moves, check for checkmate and stalemate ---
+def get_all_legal_moves_for_player(board_array, player_color, king_pos=None):
+    """Generates all legal moves for the given player.
+    A move is ((from_r, from_c), (to_r, to_c)).
+    king_pos is the player's king square if the caller tracks it; otherwise it is looked up once.
+    """
+    if isinstance(board_array, BitboardPosition):
+        return board_array.get_all_legal_moves(player_color)
+    if king_pos is None:
+        king_pos = get_king_position(board_array, player_color)
+    # Only the candidates from the movement patterns need the self-check test
+    return [move for move in generate_pseudo_legal_moves(board_array, player_color)
+            if not _leaves_king_in_check(board_array, move[0][0], move[0][1], move[1][0], move[1][1], player_color, king_pos)]
+
+def get_legal_captures_for_player(board_array, player_color, king_pos=None):
+    """Legal moves that capture a piece or promote a pawn; the self-check test only runs on those."""
+    if isinstance(board_array, BitboardPosition):
+        return [move for move in board_array.get_all_legal_moves(player_color)
+                if board_array.piece_at(move[1][0] * 8 + move[1][1])
+                or (move[1][0] in (0, 7) and board_array.piece_at(move[0][0] * 8 + move[0][1]) in ("p", "P"))]
+    if king_pos is None:
+        king_pos = get_king_position(board_array, player_color)
+    return [move for move in generate_pseudo_legal_moves(board_array, player_color)
+            if (board_array[move[1][0]][move[1][1]]
+                or (move[1][0] in (0, 7) and board_array[move[0][0]][move[0][1]] in ("p", "P")))
+            and not _leaves_king_in_check(board_array, move[0][0], move[0][1], move[1][0], move[1][1], player_color, king_pos)]
+
+# Piece order for has_legal_move: king moves are the usual way out of a check, and
+# cheap pieces are tried before the long slider move lists
+LEGAL_MOVE_SEARCH_ORDER = "kpnbrq"
+
+def iter_legal_moves(board_array, player_color, king_pos=None, piece_order=None):
+    """Lazily yields legal moves, one piece at a time, so callers can stop early.
+    With piece_order (a string of piece kinds, e.g. LEGAL_MOVE_SEARCH_ORDER) pieces are
+    tried kind by kind in that order; otherwise in board order.
+    """
+    if isinstance(board_array, BitboardPosition):
+        for from_sq, to_sq in board_array.generate_pseudo_legal_moves(player_color):
+            if not board_array.leaves_king_in_check(from_sq, to_sq, player_color):
+                yield (from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7)
+        return
+    if king_pos is None:
+        king_pos = get_king_position(board_array, player_color)
+    is_own = str.islower if player_color == 'w' else str.isupper
+    own_pieces = [(r_idx, c_idx, piece_on_square.lower())
+                  for r_idx, row_content in enumerate(board_array)
+                  for c_idx, piece_on_square in enumerate(row_content)
+                  if piece_on_square and is_own(piece_on_square)]
+    if piece_order:
+        # Kinds missing from piece_order go last
+        rank = {kind: idx for idx, kind in enumerate(piece_order)}
+        own_pieces.sort(key=lambda entry: rank.get(entry[2], len(piece_order)))
+    for r_idx, c_idx, kind in own_pieces:
+        candidates = []
+        _add_piece_moves(candidates, board_array, r_idx, c_idx, kind, player_color, is_own)
+        for move in candidates:
+            if not _leaves_king_in_check(board_array, r_idx, c_idx, move[1][0], move[1][1], player_color, king_pos):
+                yield move
+
+def has_legal_move(board_array, player_color, king_pos=None):
+    """True as soon as one legal move for player_color is found."""
+    for _ in iter_legal_moves(board_array, player_color, king_pos, LEGAL_MOVE_SEARCH_ORDER):
+        return True
+    return False
+
+def _tablebase_outcome(board_array, player_color):
+    """"checkmate", "stalemate" or "continue" from a loaded endgame table, or None when no
+    table covers the material on the board. Saves the legal-move search."""
+    if isinstance(board_array, BitboardPosition):
+        return None
+    result = probe_tablebase(board_array, player_color)
+    if result is None:
+        return None
+    if result == ("loss", 0):
+        return "checkmate"
+    return "stalemate" if result[0] == "stalemate" else "continue"
+
+def is_checkmate(board_array, player_color, king_pos=None, in_check=None):
+    """Checks if the given player is checkmated.
+    in_check may pass along an already computed is_in_check result for this position.
+    """
+    if king_pos is None and not isinstance(board_array, BitboardPosition):
+        king_pos = get_king_position(board_array, player_color)
+    outcome = _tablebase_outcome(board_array, player_color)
+    if outcome is not None:
+        return outcome == "checkmate"
+    if in_check is None:
+        in_check = is_in_check(board_array, player_color, king_pos)
+    if not in_check:
         return False # Not in check, so cannot be checkmate
     
     # In check, see if there are any legal moves
-    if not get_all_legal_moves_for_player(board_array, player_color): # No legal moves
-        return True # In check and no legal moves = checkmate
-    
-    return False # In check but has legal moves
+    return not has_legal_move(board_array, player_color, king_pos) # In check and no legal moves = checkmate
 
-def is_stalemate(board_array, player_color):
-    """Checks if the given player is stalemated."""
-    if is_in_check(board_array, player_color): # If in check, it's not stalemate
+def is_stalemate(board_array, player_color, king_pos=None, in_check=None):
+    """Checks if the given player is stalemated.
+    in_check may pass along an already computed is_in_check result for this position.
+    """
+    if king_pos is None and not isinstance(board_array, BitboardPosition):
+        king_pos = get_king_position(board_array, player_color)
+    outcome = _tablebase_outcome(board_array, player_color)
+    if outcome is not None:
+        return outcome == "stalemate"
+    if in_check is None:
+        in_check = is_in_check(board_array, player_color, king_pos)
+    if in_check: # If in check, it's not stalemate
         return False 
         
     # Not in check, see if there are any legal moves
-    if not get_all_legal_moves_for_player(board_array, player_color): # No legal moves
-        return True # Not in check and no legal moves = stalemate
-        
-    return False # Not in check and has legal moves
+    return not has_legal_move(board_array, player_color, king_pos) # Not in check and no legal moves = stalemate
+
+def get_game_status(board_array, player_color, king_pos=None):
+    """Status of the position for the player to move: "checkmate", "check", "stalemate" or "continue".
+    Check is tested once and the legal-move search stops at the first legal move.
+    """
+    if king_pos is None and not isinstance(board_array, BitboardPosition):
+        king_pos = get_king_position(board_array, player_color)
+    in_check = is_in_check(board_array, player_color, king_pos)
+    outcome = _tablebase_outcome(board_array, player_color)
+    if outcome is not None:
+        return "check" if outcome == "continue" and in_check else outcome
+    if has_legal_move(board_array, player_color, king_pos):
+        return "check" if in_check else "continue"
+    return "checkmate" if in_check else "stalemate"
@@ -0,0 +1,319 @@
+# Tablebase.py
+"""Endgame tablebases for king and one piece against a lone king (KQK, KRK, KPK).
+
+A table is generated by retrograde analysis: every placement of the three pieces with
+either side to move is enumerated, checkmates are found, and results are propagated
+backwards through un-moves, nearest mate first, until nothing changes. Positions left
+unresolved are draws.
+
+Tables are stored for the strong side playing White (lowercase pieces); positions
+where Black has the extra piece are looked up with the board mirrored. Each file is
+an 8-byte header followed by one byte per position, indexed by
+
+    side * 64**3 + white_king * 64**2 + black_king * 64 + piece
+
+(side 0: the strong side to move; squares numbered row * 8 + col). A byte is 0 for an
+impossible placement, 1 for a draw, 2 for stalemate, and 3 + n for a position whose
+side to move mates in n plies (n odd) or is mated in n plies (n even; 0 is mate).
+
+Usage:
+    python -m main.Tablebase                  # generate KQK, KRK and KPK into tablebases/
+    python -m main.Tablebase KRK --dir tables
+
+Probing memory-maps the files. Until load_tablebases() has found at least one table,
+probe() returns None straight away, so the rules and the engine pay nothing for it.
+"""
+import argparse
+import mmap
+import os
+import sys
+import time
+
+from .Tables import BETWEEN_MASKS, KING_MASKS, LINE_KIND, PAWN_CAPTURE_MASKS, RAYS
+
+MAGIC = b"CGTB1\0\0\0"
+DEFAULT_DIRECTORY = "tablebases"  # Relative to the project root, like the image directory
+TABLE_NAMES = ("KQK", "KRK", "KPK")  # KPK last: its promotions are looked up in KQK and KRK
+TABLE_SIZE = 2 * 64 * 64 * 64
+
+ILLEGAL, DRAW, STALEMATE, MATE_BASE = 0, 1, 2, 3
+_UNKNOWN = 255
+
+# Strong piece of each table (White, lowercase) and the line kinds it slides along
+_PIECE_OF_TABLE = {"KQK": "q", "KRK": "r", "KPK": "p"}
+_TABLE_OF_PIECE = {piece: name for name, piece in _PIECE_OF_TABLE.items()}
+_SLIDES = {"q": ("r", "b"), "r": ("r",)}
+_RAY_SQUARES = [[[row * 8 + col for row, col in ray] for ray in per_direction] for per_direction in RAYS]
+
+def table_index(side, white_king, black_king, piece):
+    return ((side * 64 + white_king) * 64 + black_king) * 64 + piece
+
+def _piece_attacks(piece, from_sq, target, blockers):
+    """Does the strong piece on from_sq attack target, with blockers (a bitmask) in the way?"""
+    if piece == "p":
+        return bool(PAWN_CAPTURE_MASKS["w"][from_sq] >> target & 1)
+    kind = LINE_KIND[from_sq][target]
+    return kind is not None and kind in _SLIDES[piece] and not BETWEEN_MASKS[from_sq][target] & blockers
+
+def _adjacent(a, b):
+    return bool(KING_MASKS[a] >> b & 1)
+
+def _is_legal(side, white_king, black_king, piece_sq, piece):
+    if white_king == black_king or piece_sq == white_king or piece_sq == black_king:
+        return False
+    if _adjacent(white_king, black_king):
+        return False
+    if piece == "p" and not 8 <= piece_sq < 56:
+        return False
+    # With the strong side to move, the lone king cannot be in check
+    return not (side == 0 and _piece_attacks(piece, piece_sq, black_king, 1 << white_king))
+
+def _piece_destinations(piece, from_sq, occupied):
+    """Squares the strong piece can move to; occupied is a bitmask of both kings."""
+    if piece == "p":
+        destinations = []
+        if not occupied >> (from_sq - 8) & 1:
+            destinations.append(from_sq - 8)
+            if from_sq >= 48 and not occupied >> (from_sq - 16) & 1:
+                destinations.append(from_sq - 16)
+        return destinations
+    destinations = []
+    for direction, ray_kind in enumerate(("r",) * 4 + ("b",) * 4):
+        if ray_kind not in _SLIDES[piece]:
+            continue
+        for sq in _RAY_SQUARES[direction][from_sq]:
+            if occupied >> sq & 1:
+                break
+            destinations.append(sq)
+    return destinations
+
+def _piece_origins(piece, to_sq, occupied):
+    """Squares the strong piece can have come from (un-moves, no captures or promotions)."""
+    if piece == "p":
+        origins = []
+        if to_sq + 8 < 56 and not occupied >> (to_sq + 8) & 1:
+            origins.append(to_sq + 8)
+            if 32 <= to_sq < 40 and not occupied >> (to_sq + 16) & 1:
+                origins.append(to_sq + 16)
+        return origins
+    return _piece_destinations(piece, to_sq, occupied)  # Sliding moves are reversible
+
+def _king_squares(sq):
+    mask = KING_MASKS[sq]
+    return [target for target in range(64) if mask >> target & 1]
+
+_KING_SQUARES = [_king_squares(sq) for sq in range(64)]
+
+def generate_table(name, promotion_tables=None):
+    """Solves one table; returns its contents as a bytearray of TABLE_SIZE codes.
+    KPK needs the KQK and KRK contents in promotion_tables ({name: bytearray})."""
+    piece = _PIECE_OF_TABLE[name]
+    promotion_tables = promotion_tables or {}
+    values = bytearray(TABLE_SIZE)
+    counts = bytearray(TABLE_SIZE)  # Lone king to move: moves not yet known to lose
+    buckets = [[] for _ in range(256)]  # Positions waiting to be finalised, by plies to mate
+
+    # --- Mates, stalemates, move counts and promotions ---
+    for white_king in range(64):
+        for black_king in range(64):
+            for piece_sq in range(64):
+                for side in (0, 1):
+                    if not _is_legal(side, white_king, black_king, piece_sq, piece):
+                        continue
+                    idx = table_index(side, white_king, black_king, piece_sq)
+                    values[idx] = _UNKNOWN
+                    if side == 1:
+                        moves = 0
+                        for target in _KING_SQUARES[black_king]:
+                            if _adjacent(target, white_king):
+                                continue
+                            # Capturing the piece is always a move out of the table (to a draw)
+                            if target == piece_sq or not _piece_attacks(piece, piece_sq, target, 1 << white_king):
+                                moves += 1
+                        counts[idx] = moves
+                        if not moves:
+                            if _piece_attacks(piece, piece_sq, black_king, 1 << white_king):
+                                values[idx] = MATE_BASE
+                                buckets[0].append(idx)
+                            else:
+                                values[idx] = STALEMATE
+                        continue
+                    occupied = 1 << white_king | 1 << black_king
+                    has_move = any(target != piece_sq and not _adjacent(target, black_king)
+                                   for target in _KING_SQUARES[white_king])
+                    for target in _piece_destinations(piece, piece_sq, occupied):
+                        has_move = True
+                        if piece == "p" and target < 8:
+                            # Promotion: the result comes from the table of the new piece
+                            for new_piece in ("q", "r"):
+                                table = promotion_tables.get(_TABLE_OF_PIECE[new_piece])
+                                if table is None:
+                                    continue
+                                code = table[table_index(1, white_king, black_king, target)]
+                                if code >= MATE_BASE and (code - MATE_BASE) % 2 == 0:
+                                    buckets[code - MATE_BASE + 1].append(idx)
+                    if not has_move:
+                        values[idx] = STALEMATE
+
+    # --- Retrograde propagation, nearest mate first ---
+    for plies in range(255 - MATE_BASE):
+        bucket = buckets[plies]
+        for idx in bucket:
+            side, rest = divmod(idx, 64 * 64 * 64)
+            white_king, rest = divmod(rest, 64 * 64)
+            black_king, piece_sq = divmod(rest, 64)
+            if side == 0:
+                if values[idx] != _UNKNOWN:
+                    continue  # Already won faster
+                values[idx] = MATE_BASE + plies
+                # The lone king just moved here: each origin loses one escape
+                for origin in _KING_SQUARES[black_king]:
+                    if origin == white_king or origin == piece_sq or _adjacent(origin, white_king):
+                        continue
+                    previous = table_index(1, white_king, origin, piece_sq)
+                    if values[previous] != _UNKNOWN:
+                        continue
+                    counts[previous] -= 1
+                    if not counts[previous]:
+                        values[previous] = MATE_BASE + plies + 1
+                        buckets[plies + 1].append(previous)
+            else:
+                # A loss: every position whose move led here is a win one ply further
+                occupied = 1 << white_king | 1 << black_king
+                for origin in _KING_SQUARES[white_king]:
+                    if origin == black_king or origin == piece_sq or _adjacent(origin, black_king):
+                        continue
+                    if _piece_attacks(piece, piece_sq, black_king, 1 << origin):
+                        continue  # White to move with Black in check: impossible
+                    previous = table_index(0, origin, black_king, piece_sq)
+                    if values[previous] == _UNKNOWN:
+                        buckets[plies + 1].append(previous)
+                for origin in _piece_origins(piece, piece_sq, occupied):
+                    if _piece_attacks(piece, origin, black_king, 1 << white_king):
+                        continue
+                    previous = table_index(0, white_king, black_king, origin)
+                    if values[previous] == _UNKNOWN:
+                        buckets[plies + 1].append(previous)
+        buckets[plies] = None
+
+    for idx in range(TABLE_SIZE):
+        if values[idx] == _UNKNOWN:
+            values[idx] = DRAW
+    return values
+
+def write_table(values, path):
+    with open(path, "wb") as table_file:
+        table_file.write(MAGIC)
+        table_file.write(values)
+
+def generate_tables(directory=DEFAULT_DIRECTORY, names=TABLE_NAMES, report=None):
+    """Generates the named tables into directory (KPK brings in KQK and KRK). Returns the paths."""
+    os.makedirs(directory, exist_ok=True)
+    if "KPK" in names:
+        names = [name for name in TABLE_NAMES if name in names or name in ("KQK", "KRK")]
+    generated, paths = {}, []
+    for name in TABLE_NAMES:
+        if name not in names:
+            continue
+        start = time.perf_counter()
+        generated[name] = generate_table(name, generated)
+        path = os.path.join(directory, f"{name}.tb")
+        write_table(generated[name], path)
+        paths.append(path)
+        if report:
+            report(f"{name}: {time.perf_counter() - start:.1f}s -> {path}")
+    return paths
+
+# --- Probing ---
+class Tablebase:
+    """One memory-mapped table file."""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) != len(MAGIC) + TABLE_SIZE or self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a tablebase file")
+
+    def code(self, side, white_king, black_king, piece_sq):
+        return self._map[len(MAGIC) + table_index(side, white_king, black_king, piece_sq)]
+
+    def close(self):
+        self._map.close()
+
+_tables = {}  # Strong piece letter ("q", "r", "p") -> Tablebase
+
+def load_tablebases(directory=DEFAULT_DIRECTORY):
+    """Loads every table file found in directory; returns the names loaded."""
+    loaded = []
+    for name, piece in _PIECE_OF_TABLE.items():
+        path = os.path.join(directory, f"{name}.tb")
+        if os.path.exists(path):
+            _tables[piece] = Tablebase(path)
+            loaded.append(name)
+    return loaded
+
+def unload_tablebases():
+    for table in _tables.values():
+        table.close()
+    _tables.clear()
+
+def has_tablebases():
+    return bool(_tables)
+
+def probe(board_array, turn):
+    """Looks the position up. Returns (outcome, plies) for the side to move, outcome being
+    "win", "loss", "draw" or "stalemate" and plies the distance to mate (0 for checkmate),
+    or None if no loaded table covers the material on the board."""
+    if not _tables:
+        return None
+    kings = {}
+    extra = None
+    for r_idx, row_content in enumerate(board_array):
+        for c_idx, piece_on_square in enumerate(row_content):
+            if not piece_on_square:
+                continue
+            if piece_on_square == "k" or piece_on_square == "K":
+                kings[piece_on_square] = (r_idx, c_idx)
+            elif extra is None:
+                extra = (piece_on_square, r_idx, c_idx)
+            else:
+                return None  # More than three pieces
+    if extra is None or len(kings) != 2:
+        return None
+    piece_char, piece_row, piece_col = extra
+    table = _tables.get(piece_char.lower())
+    if table is None:
+        return None
+    if piece_char.islower():
+        (wk_row, wk_col), (bk_row, bk_col) = kings["k"], kings["K"]
+        side = 0 if turn == "w" else 1
+    else:
+        # Black has the piece: mirror the board top to bottom and swap the colours
+        (wk_row, wk_col), (bk_row, bk_col) = kings["K"], kings["k"]
+        wk_row, bk_row, piece_row = 7 - wk_row, 7 - bk_row, 7 - piece_row
+        side = 0 if turn == "b" else 1
+    code = table.code(side, wk_row * 8 + wk_col, bk_row * 8 + bk_col, piece_row * 8 + piece_col)
+    if code == ILLEGAL:
+        return None
+    if code == DRAW:
+        return ("draw", 0)
+    if code == STALEMATE:
+        return ("stalemate", 0)
+    plies = code - MATE_BASE
+    return ("win" if plies % 2 else "loss", plies)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.Tablebase", description=__doc__.splitlines()[0])
+    parser.add_argument("tables", nargs="*", help="tables to generate (default: all of KQK, KRK, KPK)")
+    parser.add_argument("--dir", default=DEFAULT_DIRECTORY, help="output directory")
+    args = parser.parse_args(argv)
+    names = [name.upper() for name in args.tables] or list(TABLE_NAMES)
+    unknown = [name for name in names if name not in TABLE_NAMES]
+    if unknown:
+        parser.error(f"unknown tables {', '.join(unknown)}; choose from {', '.join(TABLE_NAMES)}")
+    generate_tables(args.dir, names, report=print)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Tables.py
+"""Move lookup tables, built once at import time.
+
+Squares are indexed like the board arrays: square = row * 8 + col. Every table has a
+coordinate form (tuples of (row, col), for the list-of-lists board in Rules.py) and,
+where useful, a bitmask form (for Bitboard.py).
+"""
+
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+# All eight ray directions: the first four are rook-like, the last four bishop-like
+DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+def _on_board(row, col):
+    return 0 <= row < 8 and 0 <= col < 8
+
+def _targets(offsets):
+    return [tuple((sq // 8 + dr, sq % 8 + dc) for dr, dc in offsets if _on_board(sq // 8 + dr, sq % 8 + dc))
+            for sq in range(64)]
+
+def _ray(sq, dr, dc):
+    squares = []
+    row, col = sq // 8 + dr, sq % 8 + dc
+    while _on_board(row, col):
+        squares.append((row, col))
+        row += dr
+        col += dc
+    return tuple(squares)
+
+def _mask(squares):
+    mask = 0
+    for row, col in squares:
+        mask |= 1 << (row * 8 + col)
+    return mask
+
+# Knight and king target squares per square
+KNIGHT_TARGETS = _targets(KNIGHT_OFFSETS)
+KING_TARGETS = _targets(KING_OFFSETS)
+# Diagonal capture squares of a pawn per colour; White moves towards row 0
+PAWN_CAPTURE_TARGETS = {"w": _targets(((-1, -1), (-1, 1))), "b": _targets(((1, -1), (1, 1)))}
+
+# RAYS[direction index][square]: squares from nearest to farthest, stopping at the edge
+RAYS = [[_ray(sq, dr, dc) for sq in range(64)] for dr, dc in DIRECTIONS]
+# Per square, the rays a rook, bishop or queen walks
+ROOK_RAYS = [tuple(RAYS[d][sq] for d in range(4)) for sq in range(64)]
+BISHOP_RAYS = [tuple(RAYS[d][sq] for d in range(4, 8)) for sq in range(64)]
+QUEEN_RAYS = [ROOK_RAYS[sq] + BISHOP_RAYS[sq] for sq in range(64)]
+SLIDER_RAYS = {"r": ROOK_RAYS, "b": BISHOP_RAYS, "q": QUEEN_RAYS}
+
+def _build_between():
+    between = [[None] * 64 for _ in range(64)]
+    line_kind = [[None] * 64 for _ in range(64)]
+    for from_sq in range(64):
+        for d, ray in enumerate(RAYS):
+            squares = ray[from_sq]
+            for idx, (row, col) in enumerate(squares):
+                to_sq = row * 8 + col
+                between[from_sq][to_sq] = squares[:idx]
+                line_kind[from_sq][to_sq] = "r" if d < 4 else "b"
+    return between, line_kind
+
+# BETWEEN[from][to]: squares strictly between two squares on a common rank, file or
+# diagonal, or None when they are not aligned. LINE_KIND says which: "r" or "b".
+BETWEEN, LINE_KIND = _build_between()
+
+# Bitmask forms
+KNIGHT_MASKS = [_mask(targets) for targets in KNIGHT_TARGETS]
+KING_MASKS = [_mask(targets) for targets in KING_TARGETS]
+PAWN_CAPTURE_MASKS = {color: [_mask(targets) for targets in per_square]
+                      for color, per_square in PAWN_CAPTURE_TARGETS.items()}
+RAY_MASKS = [[_mask(squares) for squares in per_direction] for per_direction in RAYS]
+BETWEEN_MASKS = [[_mask(squares) if squares is not None else 0 for squares in per_target] for per_target in BETWEEN]
@@ -0,0 +1,153 @@
+# TranspositionTable.py
+"""Fixed-size transposition table keyed by Zobrist position keys.
+
+Entries live in two preallocated arrays of unsigned 64-bit integers: the full key,
+and a packed word holding the score, bound, best move, depth and search age. The
+table never grows past the megabyte budget it is created with; when a bucket is full
+an entry is replaced according to the chosen scheme:
+
+    "depth"  - two entries per bucket. The first keeps the deepest result (replaced only
+               by an equal or deeper search, or by any search once it is from an older
+               age); everything else goes to the second, which is always replaced.
+    "always" - one entry per bucket, always replaced by the newest result.
+"""
+from array import array
+
+# Score bounds
+EXACT, LOWER_BOUND, UPPER_BOUND = 1, 2, 3
+
+DEPTH_PREFERRED = "depth"
+ALWAYS_REPLACE = "always"
+SCHEMES = (DEPTH_PREFERRED, ALWAYS_REPLACE)
+
+ENTRY_BYTES = 16  # One key word and one data word
+DEFAULT_SIZE_MB = 16
+
+# Data word layout, from the lowest bit up
+_SCORE_OFFSET = 1 << 31  # Score: 32 bits, stored offset to be unsigned
+_MOVE_SHIFT = 32         # Move: 12 bits, from_sq << 6 | to_sq
+_HAS_MOVE_BIT = 1 << 44
+_BOUND_SHIFT = 45        # Bound: 2 bits, never 0 in a used entry
+_DEPTH_SHIFT = 47        # Depth: 8 bits
+_AGE_SHIFT = 55          # Age: 8 bits
+
+class TTEntry:
+    """Unpacked table entry."""
+    __slots__ = ("depth", "score", "bound", "move", "age")
+
+    def __init__(self, depth, score, bound, move, age):
+        self.depth = depth
+        self.score = score
+        self.bound = bound  # EXACT, LOWER_BOUND (fail high) or UPPER_BOUND (fail low)
+        self.move = move    # ((fr, fc), (tr, tc)) or None
+        self.age = age
+
+def _pack(depth, score, bound, move, age):
+    data = (score + _SCORE_OFFSET) | bound << _BOUND_SHIFT | min(depth, 255) << _DEPTH_SHIFT | age << _AGE_SHIFT
+    if move is not None:
+        (fr, fc), (tr, tc) = move
+        data |= _HAS_MOVE_BIT | ((fr * 8 + fc) << 6 | (tr * 8 + tc)) << _MOVE_SHIFT
+    return data
+
+def _unpack(data):
+    move = None
+    if data & _HAS_MOVE_BIT:
+        packed_move = (data >> _MOVE_SHIFT) & 0xFFF
+        from_sq, to_sq = packed_move >> 6, packed_move & 63
+        move = ((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7))
+    return TTEntry((data >> _DEPTH_SHIFT) & 0xFF, (data & 0xFFFFFFFF) - _SCORE_OFFSET,
+                   (data >> _BOUND_SHIFT) & 3, move, (data >> _AGE_SHIFT) & 0xFF)
+
+class TranspositionTable:
+    def __init__(self, size_mb=DEFAULT_SIZE_MB, scheme=DEPTH_PREFERRED):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown replacement scheme {scheme!r}; expected one of {SCHEMES}")
+        self.scheme = scheme
+        self.bucket_size = 2 if scheme == DEPTH_PREFERRED else 1
+        self.num_buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * self.bucket_size))
+        self.capacity = self.num_buckets * self.bucket_size
+        self._keys = array("Q", bytes(8 * self.capacity))
+        self._data = array("Q", bytes(8 * self.capacity))
+        self.age = 0
+        self.used = 0
+        self.reset_stats()
+
+    @property
+    def size_bytes(self):
+        return self.capacity * ENTRY_BYTES
+
+    def clear(self):
+        self._keys = array("Q", bytes(8 * self.capacity))
+        self._data = array("Q", bytes(8 * self.capacity))
+        self.age = 0
+        self.used = 0
+        self.reset_stats()
+
+    def new_search(self):
+        """Starts a new search age; entries from earlier ages become the first to be replaced."""
+        self.age = (self.age + 1) & 0xFF
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0  # Stores that evicted a different position
+
+    def probe(self, key):
+        """Returns the TTEntry stored for key, or None."""
+        self.probes += 1
+        first = (key % self.num_buckets) * self.bucket_size
+        keys = self._keys
+        for slot in range(first, first + self.bucket_size):
+            if keys[slot] == key and self._data[slot]:
+                self.hits += 1
+                return _unpack(self._data[slot])
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        self.stores += 1
+        first = (key % self.num_buckets) * self.bucket_size
+        keys, data = self._keys, self._data
+        slot = first
+        if self.bucket_size == 2:
+            if keys[first + 1] == key and data[first + 1]:
+                slot = first + 1
+            elif keys[first] != key or not data[first]:
+                old = data[first]
+                old_depth = (old >> _DEPTH_SHIFT) & 0xFF
+                old_age = (old >> _AGE_SHIFT) & 0xFF
+                if old and depth < old_depth and old_age == self.age:
+                    slot = first + 1  # Keep the deeper result of this search
+        if move is None and keys[slot] == key and data[slot] & _HAS_MOVE_BIT:
+            # Keep the move found by an earlier search of the same position
+            move = _unpack(data[slot]).move
+        if not data[slot]:
+            self.used += 1
+        elif keys[slot] != key:
+            self.collisions += 1
+        keys[slot] = key
+        data[slot] = _pack(depth, score, bound, move, self.age)
+
+    # --- Statistics ---
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def fill_rate(self):
+        return self.used / self.capacity
+
+    def stats(self):
+        return {
+            "size_mb": self.size_bytes / (1024 * 1024),
+            "scheme": self.scheme,
+            "entries": self.capacity,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate(),
+            "stores": self.stores,
+            "fill_rate": self.fill_rate(),
+            "collisions": self.collisions,
+        }
+
+    def __str__(self):
+        return (f"hash {self.size_bytes / (1024 * 1024):.1f} MB ({self.scheme}) hits {self.hits}/{self.probes} "
+                f"({self.hit_rate():.1%}) fill {self.fill_rate():.1%} collisions {self.collisions}")
@@ -0,0 +1,46 @@
+# Zobrist.py
+"""Zobrist keys: a 64-bit number identifying a position.
+
+The key is the XOR of one random number per (piece, square), one for the side to
+move, and slots for castling rights and the en-passant file. The rules do not
+implement castling or en passant yet, so those default to "none" and leave the key
+unchanged; the numbers are reserved so keys stay compatible once they exist.
+"""
+import random
+
+# Fixed seed: keys must be identical from run to run so they can be stored on disk
+_rng = random.Random(0x5A0B1C2D)
+
+def _random64():
+    return _rng.getrandbits(64)
+
+PIECE_SQUARE_KEYS = {piece_char: [_random64() for _ in range(64)] for piece_char in "pnbrqkPNBRQK"}
+SIDE_TO_MOVE_KEY = _random64()  # XORed in when Black is to move
+CASTLING_KEYS = [0] + [_random64() for _ in range(15)]  # Indexed by a 4-bit castling-rights mask
+EN_PASSANT_KEYS = [_random64() for _ in range(8)]  # Indexed by the en-passant column
+
+def compute_key(board_array, turn, castling_rights=0, en_passant_col=None):
+    """Computes the key of a position from scratch."""
+    key = 0
+    for r_idx, row_content in enumerate(board_array):
+        for c_idx, piece_on_square in enumerate(row_content):
+            if piece_on_square in PIECE_SQUARE_KEYS:  # Skips empty squares and unknown markers
+                key ^= PIECE_SQUARE_KEYS[piece_on_square][r_idx * 8 + c_idx]
+    if turn == "b":
+        key ^= SIDE_TO_MOVE_KEY
+    key ^= CASTLING_KEYS[castling_rights]
+    if en_passant_col is not None:
+        key ^= EN_PASSANT_KEYS[en_passant_col]
+    return key
+
+def update_key(key, record):
+    """Returns the key after the move in record (a Rules.MoveRecord) and a change of side.
+    XOR is its own inverse, so applying it again to the new key undoes the move.
+    """
+    from_sq = record.from_row * 8 + record.from_col
+    to_sq = record.to_row * 8 + record.to_col
+    key ^= PIECE_SQUARE_KEYS[record.piece][from_sq]
+    key ^= PIECE_SQUARE_KEYS[record.promotion or record.piece][to_sq]
+    if record.captured in PIECE_SQUARE_KEYS:
+        key ^= PIECE_SQUARE_KEYS[record.captured][to_sq]
+    return key ^ SIDE_TO_MOVE_KEY
@@ -0,0 +1,119 @@
+# batch.py
+"""Analyses a file of positions (one FEN per line) over a pool of worker processes.
+
+For every line one JSON object is written, in input order:
+
+    {"fen": ..., "turn": "w", "check": false, "checkmate": false, "stalemate": false,
+     "legal_moves": ["a2a3", ...]}
+
+or {"fen": ..., "error": "..."} for a line that is not a valid FEN or describes a
+position that cannot occur (see Fen.validate_position). Blank lines are
+skipped. Lines are sent to the workers in chunks, and only a few chunks per worker
+are in flight at a time, so memory does not grow with the input. Runs without Tk.
+
+Usage:
+    python -m main.batch positions.txt -o results.jsonl --workers 4 --chunk-size 500
+    python -m main.batch positions.txt > results.jsonl    # throughput goes to stderr
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .Fen import board_from_fen, move_name
+from .Rules import get_all_legal_moves_for_player, get_king_position, is_in_check
+
+DEFAULT_CHUNK_SIZE = 256  # FENs per task sent to a worker
+CHUNKS_PER_WORKER = 4     # Tasks kept queued per worker ahead of the output
+
+def analyze_fen(fen):
+    """The result record of one FEN."""
+    try:
+        # Positions that cannot occur (no king, two kings, ...) are errors, not stalemates
+        board_array, turn = board_from_fen(fen, validate=True)
+    except ValueError as e:
+        return {"fen": fen, "error": str(e)}
+    king_pos = get_king_position(board_array, turn)
+    in_check = is_in_check(board_array, turn, king_pos)
+    # One move generation answers mate and stalemate as well
+    moves = get_all_legal_moves_for_player(board_array, turn, king_pos)
+    return {
+        "fen": fen,
+        "turn": turn,
+        "check": in_check,
+        "checkmate": in_check and not moves,
+        "stalemate": not in_check and not moves,
+        "legal_moves": [move_name(move) for move in moves],
+    }
+
+def analyze_chunk(fens):
+    """Runs in a worker: JSON lines for a list of FENs, in the same order."""
+    return [json.dumps(analyze_fen(fen)) for fen in fens]
+
+def _read_chunks(lines, chunk_size):
+    fens = (line.strip() for line in lines)
+    fens = (fen for fen in fens if fen)
+    while True:
+        chunk = list(islice(fens, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_batch(lines, output, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Analyses the FEN lines and writes one JSON line per position to output (a text file).
+    workers=1 runs in this process. Returns the number of positions."""
+    count = 0
+    chunks = _read_chunks(lines, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            output.write("".join(line + "\n" for line in analyze_chunk(chunk)))
+            count += len(chunk)
+        return count
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(analyze_chunk, chunk))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                count += _write_result(pending.popleft(), output)
+        while pending:
+            count += _write_result(pending.popleft(), output)
+    return count
+
+def _write_result(future, output):
+    results = future.result()
+    output.write("".join(line + "\n" for line in results))
+    return len(results)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.batch", description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="file with one FEN per line ('-' for standard input)")
+    parser.add_argument("-o", "--output", help="JSON-lines file to write (default: standard output)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="FENs per worker task")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be at least 1")
+
+    input_file = sys.stdin if args.input == "-" else open(args.input)
+    output_file = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        count = run_batch(input_file, output_file, args.workers, args.chunk_size)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} positions in {elapsed:.2f}s ({count / elapsed if elapsed else 0:,.0f} positions/s) "
+          f"on {args.workers} workers", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,19 @@ from .Board import Board
 from .Moving import MoveController
 from .GameState import GameState
 from .History import History
+from .Engine import Engine
+from .EngineWorker import EngineWorker
+from .OpeningBook import OpeningBook
+from .Tablebase import load_tablebases
+from .Fen import move_name
 
 LABEL_SPACE = 30  # Space added for labels
+ENGINE_COLOR = "b"  # The computer opponent plays Black
+ENGINE_POLL_MS = 50  # How often the Tk loop collects engine progress
 
-def main():
+def main(on_ready=None):
+    """Runs the game window until it is closed. on_ready, if given, is called once the
+    first frame has been drawn and the piece images are loaded."""
     root = tk.Tk()
     root.title("ChessGame")
 
@@ -27,7 +36,18 @@ def main():
     board = Board(canvas)
     game_state = GameState()
     history = History(board.board, game_state.turn)
-    controller = MoveController(board, game_state, history)
+    # Searches run on a worker thread; the mainloop only polls for their results
+    # The opening book (book.bin, built with python -m main.OpeningBook build) is optional
+    engine_worker = EngineWorker(Engine(book=OpeningBook.load_default()))
+    # Endgame tables (tablebases/, built with python -m main.Tablebase) are optional too
+    load_tablebases()
+    controller = MoveController(board, game_state, history, engine_worker)
+
+    # Component: Engine progress label
+    engine_label = tk.Label(root, text="", font=("Arial", 11), anchor="w")
+    engine_label.grid(row=2, column=0, columnspan=3, sticky="we", padx=10, pady=(0, 5))
+    computer_enabled = tk.BooleanVar(root, value=False)
+    ponder_enabled = tk.BooleanVar(root, value=True)
 
     game_active = True # Flag to control if clicks are processed
 
@@ -91,34 +111,98 @@ def main():
             winner_display_text = "White"
             resign_message = f"Black resigns. {winner_display_text} wins!"
         
+        cancel_engine()
         turn_label.config(text=f"Game Over: {resign_message}")
         set_game_active(False)
         if controller: # Ensure controller exists
             controller.game_over = True # Also set controller's game_over flag
         messagebox.showinfo("Game Over", resign_message)
 
+    # --- Engine: computer opponent and hints ---
+    def cancel_engine():
+        engine_worker.cancel()
+        engine_label.config(text="")
+
+    def maybe_start_engine_move():
+        # Starts the computer's search when it is its turn and nothing is searching for it yet
+        if (computer_enabled.get() and game_active and game_state.get_current_player() == ENGINE_COLOR
+                and engine_worker.purpose != "move"):
+            controller.request_engine_move()
+            engine_label.config(text="Engine: thinking...")
+
+    def on_hint():
+        if not game_active or engine_worker.purpose == "move":
+            return
+        engine_worker.start(board.board, game_state.get_current_player(), "hint")
+        engine_label.config(text="Hint: thinking...")
+
+    def on_computer_toggled():
+        if computer_enabled.get():
+            maybe_start_engine_move()
+        elif engine_worker.purpose in ("move", "ponder"):
+            cancel_engine()
+
+    def on_ponder_toggled():
+        if not ponder_enabled.get() and engine_worker.purpose == "ponder":
+            cancel_engine()
+
+    def poll_engine():
+        for kind, purpose, payload in engine_worker.poll():
+            prefix = {"move": "Engine", "hint": "Hint"}.get(purpose, "Pondering")
+            if kind == "info":
+                pv_text = " ".join(move_name(move) for move in payload.pv[:5])
+                mate = payload.mate_in()
+                score_text = f"mate {mate}" if mate is not None else f"{payload.score / 100:+.2f}"
+                engine_label.config(text=f"{prefix}: depth {payload.depth}  {score_text}  {pv_text}")
+            elif payload.best_move is None:
+                engine_label.config(text="")
+            elif purpose == "move":
+                engine_label.config(text=f"Engine played {move_name(payload.best_move)}")
+                status = controller.play_move(payload.best_move)
+                if status:
+                    update_display(status)
+                    if ponder_enabled.get() and game_active:
+                        # Keep searching on the player's time, assuming the expected reply
+                        controller.start_pondering(payload)
+            else:
+                board.hint = payload.best_move
+                engine_label.config(text=f"Hint: {move_name(payload.best_move)}")
+                board.draw()
+        root.after(ENGINE_POLL_MS, poll_engine)
+
     # Mouse click event
     def on_click(event):
         nonlocal game_active
         if not game_active:
             messagebox.showinfo("Game Over", "Game has ended. Please reset the board to start a new game.")
             return
+        if engine_worker.purpose == "move":
+            return  # The computer is on the move
 
         row, col = board.get_cell(event)
         if row is not None and col is not None:
+            turn_before_click = game_state.get_current_player()
             status = controller.handle_click(row, col)
             if status: # if controller didn't return None (e.g. game was already over)
+                 if game_state.get_current_player() != turn_before_click and engine_worker.purpose == "hint":
+                     cancel_engine()  # The hint was for the position before this move
                  update_display(status)
+                 maybe_start_engine_move()
             # if status is None, it means click was ignored, no need to update display
 
     # Undo move function
     def on_undo():
+        cancel_engine()
         controller.undo()
+        if computer_enabled.get() and game_state.get_current_player() == ENGINE_COLOR:
+            controller.undo()  # Take back the player's move too, not just the computer's reply
         set_game_active(True) # Game is active again after undo
         update_display() # Update with default "continue" status
+        maybe_start_engine_move()
 
     # Reset button function
     def reset_game():
+        cancel_engine()
         board.reset_board()
         game_state.turn = "w"
         history.reset()
@@ -142,11 +226,25 @@ def main():
     # Create and place Resign button (between turn_label and button_frame)
     resign_button = tk.Button(root, text="Resign", command=on_resign)
     resign_button.grid(row=1, column=1, sticky="w", padx=(0, 3), pady=5)
+
+    # Add Hint button and computer opponent switch to the Frame
+    hint_button = tk.Button(button_frame, text="Hint", command=on_hint)
+    hint_button.pack(side=tk.LEFT, padx=(5, 0))
+    computer_check = tk.Checkbutton(button_frame, text="Computer plays Black", variable=computer_enabled,
+                                    command=on_computer_toggled)
+    computer_check.pack(side=tk.LEFT, padx=(5, 0))
+    ponder_check = tk.Checkbutton(button_frame, text="Ponder", variable=ponder_enabled,
+                                  command=on_ponder_toggled)
+    ponder_check.pack(side=tk.LEFT, padx=(5, 0))
     
     canvas.bind("<Button-1>", on_click)
 
     update_display()
+    if on_ready is not None:
+        root.after_idle(on_ready)  # Queued after the board's image loading
+    root.after(ENGINE_POLL_MS, poll_engine)
     root.mainloop()
+    engine_worker.cancel()
 
 if __name__ == "__main__":
     main()
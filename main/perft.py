@@ -0,0 +1,113 @@
+# perft.py
+"""Perft: counts the leaf nodes of the legal move tree to a fixed depth.
+
+Usage:
+    python -m main.perft --depth 4
+    python -m main.perft --depth 3 --fen "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1" --divide
+    python -m main.perft --suite
+
+The counts double as a correctness check for the move generator and as a benchmark
+(nodes per second) for performance work on Rules.py. Runs without Tk: moves are
+played on a Position, the same path Board.move_piece uses, and legal moves come
+from Rules.get_all_legal_moves_for_player.
+"""
+import argparse
+import sys
+import time
+
+from .Fen import START_FEN, board_from_fen, move_name
+from .Position import Position
+
+# Reference positions with their expected node counts per depth (index 0 is depth 1).
+# The rules have no castling or en passant, and a pawn reaching the last rank counts
+# as a single move (promotion to a queen here), so positions where those come into
+# play differ from the published perft tables. Those counts were taken with the
+# original 64-square scan in Rules.get_all_legal_moves_for_player.
+REFERENCE_POSITIONS = [
+    ("Initial position", START_FEN, [20, 400, 8902, 197281]),
+    ("Rook and pawns endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2810, 43087]),
+    ("Promotions", "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1", [15, 210, 3253]),
+    ("Middlegame", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w - - 0 1", [46, 1865, 86585]),
+]
+
+def perft(position, depth):
+    """Number of leaf nodes of the legal move tree of the given depth."""
+    if depth == 0:
+        return 1
+    moves = position.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        position.play(move)  # Promotes to a queen
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+def divide(position, depth):
+    """Perft split by root move: returns a list of (move, node count)."""
+    results = []
+    for move in position.legal_moves():
+        position.play(move)
+        results.append((move, perft(position, depth - 1)))
+        position.unmake_move()
+    return results
+
+def _report(nodes, elapsed):
+    nps = nodes / elapsed if elapsed > 0 else float("inf")
+    return f"{nodes} nodes in {elapsed:.3f}s ({nps:,.0f} nodes/s)"
+
+def run_suite(max_depth=None):
+    """Runs every reference position; returns True if all counts match."""
+    all_passed = True
+    total_nodes = 0
+    suite_start = time.perf_counter()
+    for name, fen, expected_counts in REFERENCE_POSITIONS:
+        board_array, turn = board_from_fen(fen)
+        position = Position(board_array, turn)
+        for depth, expected in enumerate(expected_counts, start=1):
+            if max_depth is not None and depth > max_depth:
+                break
+            start = time.perf_counter()
+            nodes = perft(position, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            status = "ok" if nodes == expected else f"FAIL (expected {expected})"
+            all_passed = all_passed and nodes == expected
+            print(f"{name}, depth {depth}: {_report(nodes, elapsed)} {status}")
+    print(f"Total: {_report(total_nodes, time.perf_counter() - suite_start)}")
+    return all_passed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main.perft", description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, help="search depth in plies (default: 3)")
+    parser.add_argument("--fen", default=START_FEN, help="position to count from (default: initial position)")
+    parser.add_argument("--divide", action="store_true", help="print the node count of every root move")
+    parser.add_argument("--suite", action="store_true",
+                        help="check the reference positions; --depth caps the depth if given")
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        return 0 if run_suite(args.depth) else 1
+    depth = args.depth if args.depth is not None else 3
+
+    try:
+        board_array, turn = board_from_fen(args.fen)
+    except ValueError as e:
+        parser.error(str(e))
+    position = Position(board_array, turn)
+
+    start = time.perf_counter()
+    if args.divide:
+        results = divide(position, depth)
+        for move, nodes in results:
+            print(f"{move_name(move)}: {nodes}")
+        nodes = sum(count for _, count in results)
+    else:
+        nodes = perft(position, depth)
+    elapsed = time.perf_counter() - start
+    print(f"Depth {depth}: {_report(nodes, elapsed)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from main.batch import analyze_fen, run_batch
+from main.Fen import START_FEN
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECKMATE_FEN = "7k/6Q1/6K1/8/8/8/8/8 b - - 0 1"
+STALEMATE_FEN = "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1"
+CHECK_FEN = "4k3/8/8/8/8/8/4r3/4K3 w - - 0 1"
+
+class TestBatch(unittest.TestCase):
+    def test_analyze_fen(self):
+        start = analyze_fen(START_FEN)
+        self.assertEqual((start["turn"], start["check"], start["checkmate"], start["stalemate"]), ("w", False, False, False))
+        self.assertEqual(len(start["legal_moves"]), 20)
+        self.assertIn("e2e4", start["legal_moves"])
+
+        mate = analyze_fen(CHECKMATE_FEN)
+        self.assertEqual((mate["check"], mate["checkmate"], mate["stalemate"], mate["legal_moves"]), (True, True, False, []))
+        stalemate = analyze_fen(STALEMATE_FEN)
+        self.assertEqual((stalemate["check"], stalemate["checkmate"], stalemate["stalemate"]), (False, False, True))
+        check = analyze_fen(CHECK_FEN)
+        self.assertEqual((check["check"], check["checkmate"]), (True, False))
+        self.assertEqual(sorted(check["legal_moves"]), ["e1d1", "e1e2", "e1f1"])
+
+    def test_invalid_fen_is_reported(self):
+        self.assertIn("error", analyze_fen("not a fen"))
+
+    def test_impossible_positions_are_reported(self):
+        for fen in ("8/8/8/8/8/8/8/8 w - - 0 1",            # No kings
+                    "kk6/8/8/8/8/8/8/7K w - - 0 1",          # Two black kings
+                    "k7/8/8/8/8/8/8/R6K w - - 0 1"):         # Black, not to move, is in check
+            record = analyze_fen(fen)
+            self.assertEqual(set(record), {"fen", "error"}, fen)
+
+    def test_output_is_in_input_order(self):
+        fens = [START_FEN, CHECKMATE_FEN, "", "not a fen", STALEMATE_FEN, CHECK_FEN] * 5
+        expected = [fen for fen in fens if fen]
+        for workers in (1, 2):
+            output = io.StringIO()
+            count = run_batch([fen + "\n" for fen in fens], output, workers=workers, chunk_size=4)
+            records = [json.loads(line) for line in output.getvalue().splitlines()]
+            self.assertEqual(count, len(expected))
+            self.assertEqual([record["fen"] for record in records], expected)
+
+    def test_does_not_import_tkinter(self):
+        code = "import sys, main.batch; print('tkinter' in sys.modules)"
+        completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                   check=True)
+        self.assertEqual(completed.stdout.strip(), "False")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from main.Fen import board_from_fen
+from main.Rules import generate_pseudo_legal_moves, is_in_check, is_square_attacked
+
+if np is not None:
+    from main.BatchAttacks import analyze, bitboards_to_masks, codes_to_planes, encode_boards, random_positions
+
+def scalar_analysis(board_array):
+    attacked = [[is_square_attacked(board_array, r, c, color) for r in range(8) for c in range(8)] for color in "wb"]
+    in_check = [is_in_check(board_array, color) for color in "wb"]
+    mobility = [len(generate_pseudo_legal_moves(board_array, color)) for color in "wb"]
+    return attacked, in_check, mobility
+
+def random_sparse_boards(count, rng):
+    boards = []
+    for _ in range(count):
+        board_array = [[""] * 8 for _ in range(8)]
+        for piece_char in rng.sample("kKqQrRbBnNpPpPpP", rng.randint(2, 16)):
+            row, col = rng.randrange(8), rng.randrange(8)
+            if piece_char not in "pP" or row not in (0, 7):
+                board_array[row][col] = piece_char
+        boards.append(board_array)
+    return boards
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchAttacks(unittest.TestCase):
+    def assert_matches_rules(self, boards, analysis):
+        for index, board_array in enumerate(boards):
+            attacked, in_check, mobility = scalar_analysis(board_array)
+            self.assertEqual(analysis.attacked[index].reshape(2, 64).tolist(), attacked, f"board {index}")
+            self.assertEqual(analysis.in_check[index].tolist(), in_check, f"board {index}")
+            self.assertEqual(analysis.mobility[index].tolist(), mobility, f"board {index}")
+
+    def test_matches_rules_on_game_positions(self):
+        boards = random_positions(150, rng=random.Random(1))
+        self.assert_matches_rules(boards, analyze(encode_boards(boards)))
+
+    def test_matches_rules_on_sparse_positions(self):
+        # Pieces on the edges and in odd places exercise the wrap-around masks
+        boards = random_sparse_boards(300, random.Random(2))
+        self.assert_matches_rules(boards, analyze(encode_boards(boards), chunk_size=37))
+
+    def test_planes_input_gives_same_result(self):
+        codes = encode_boards(random_positions(20, rng=random.Random(3)))
+        from_codes, from_planes = analyze(codes), analyze(codes_to_planes(codes))
+        self.assertTrue((from_codes.attacked == from_planes.attacked).all())
+        self.assertTrue((from_codes.in_check == from_planes.in_check).all())
+        self.assertTrue((from_codes.mobility == from_planes.mobility).all())
+
+    def test_initial_position(self):
+        board_array, _ = board_from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1")
+        analysis = analyze(encode_boards([board_array]))
+        self.assertEqual(analysis.mobility.tolist(), [[20, 20]])
+        self.assertEqual(analysis.in_check.tolist(), [[False, False]])
+        # Each side attacks its third rank fully, and nothing of its own
+        self.assertTrue(analysis.attacked[0, 0, 5].all())
+        self.assertFalse(analysis.attacked[0, 0, 6:].any())
+
+    def test_check_flags(self):
+        board_array, _ = board_from_fen("4k3/8/8/8/8/8/4r3/4K3 w - - 0 1")
+        analysis = analyze(encode_boards([board_array]))
+        self.assertEqual(analysis.in_check.tolist(), [[True, False]])
+
+    def test_bitboards_to_masks(self):
+        masks = bitboards_to_masks(np.array([1, 1 << 63, 0x8100000000000081], dtype=np.uint64))
+        self.assertTrue(masks[0, 0, 0] and masks.sum(axis=(1, 2)).tolist() == [1, 1, 4])
+        self.assertTrue(masks[1, 7, 7])
+
+    def test_rejects_other_shapes(self):
+        with self.assertRaises(ValueError):
+            analyze(np.zeros((3, 64), dtype=np.int8))
+
+if __name__ == "__main__":
+    unittest.main()
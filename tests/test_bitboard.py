@@ -0,0 +1,64 @@
+import unittest
+from main.Bitboard import BitboardPosition, PIECE_INDEX
+from main.Rules import get_all_legal_moves_for_player, is_square_attacked, is_in_check, is_checkmate, is_stalemate
+from tests.test_move_generation import board_from_strings, initial_position
+
+
+class TestBitboardPosition(unittest.TestCase):
+    def test_round_trip_and_occupancy(self):
+        board = initial_position()
+        position = BitboardPosition.from_board(board)
+        self.assertEqual(position.to_board(), board)
+        self.assertEqual(position.occupancy['b'], 0xFFFF)
+        self.assertEqual(position.occupancy['w'], 0xFFFF << 48)
+        self.assertEqual(position.pieces[PIECE_INDEX['k']], 1 << 60)
+        self.assertEqual(position.piece_at(3), "Q")
+
+    def test_queries_match_list_board(self):
+        board = board_from_strings([
+            "R   K  R",
+            "P PPQPB ",
+            "BN  PNP ",
+            "   pn   ",
+            " P  p   ",
+            "  q   Q ",
+            "pppbbppp",
+            "r   k  r",
+        ])
+        position = BitboardPosition.from_board(board)
+        for player_color in ('w', 'b'):
+            self.assertCountEqual(get_all_legal_moves_for_player(position, player_color),
+                                  get_all_legal_moves_for_player(board, player_color))
+            self.assertEqual(is_in_check(position, player_color), is_in_check(board, player_color))
+            for r in range(8):
+                for c in range(8):
+                    self.assertEqual(is_square_attacked(position, r, c, player_color),
+                                     is_square_attacked(board, r, c, player_color), (r, c, player_color))
+
+    def test_mate_and_stalemate(self):
+        mate = BitboardPosition.from_board(board_from_strings([
+            "       K",
+            "      q ",
+            "     k  ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+        ]))
+        self.assertTrue(is_checkmate(mate, 'b'))
+        stalemate = BitboardPosition.from_board(board_from_strings([
+            "       K",
+            "        ",
+            "     kq ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+        ]))
+        self.assertTrue(is_stalemate(stalemate, 'b'))
+        self.assertFalse(is_checkmate(stalemate, 'b'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import patch
+
+from main.Board import Board
+from main.Fen import board_from_fen
+from main.PieceImages import PIECE_FILES
+from main.Position import Position
+
+class RecordingCanvas:
+    """Stands in for tk.Canvas: hands out item ids and records every call."""
+    def __init__(self):
+        self.calls = []
+        self._next_id = 0
+
+    def _create(self, kind, *args, **kwargs):
+        self._next_id += 1
+        self.calls.append((kind, self._next_id, args, kwargs))
+        return self._next_id
+
+    def create_rectangle(self, *args, **kwargs):
+        return self._create("create_rectangle", *args, **kwargs)
+
+    def create_image(self, *args, **kwargs):
+        return self._create("create_image", *args, **kwargs)
+
+    def create_text(self, *args, **kwargs):
+        return self._create("create_text", *args, **kwargs)
+
+    def itemconfig(self, item, **kwargs):
+        self.calls.append(("itemconfig", item, (), kwargs))
+
+    def coords(self, item, *args):
+        self.calls.append(("coords", item, args, {}))
+
+    def tag_raise(self, item):
+        self.calls.append(("tag_raise", item, (), {}))
+
+    def after_idle(self, callback):
+        self.calls.append(("after_idle", None, (callback,), {}))
+
+    def delete(self, *args):
+        self.calls.append(("delete", None, args, {}))
+
+    def take_calls(self):
+        calls, self.calls = self.calls, []
+        return calls
+
+class TestBoardDrawing(unittest.TestCase):
+    def setUp(self):
+        self.canvas = RecordingCanvas()
+        self.board = Board(self.canvas)
+        self.board.use_images_flag = False  # Unicode pieces: no image libraries needed
+        self.board.draw()
+
+    def _text_items_by_square(self):
+        return {(r, c): self.board._piece_items[r][c][1] for r in range(8) for c in range(8)}
+
+    def test_first_draw_creates_every_item_once(self):
+        calls = self.canvas.take_calls()
+        created = [call for call in calls if call[0].startswith("create_")]
+        # 64 squares + 64 image slots + 64 text slots + 16 labels + 2 hint + 1 selection rectangles
+        self.assertEqual(len(created), 64 * 3 + 16 + 3)
+        self.assertFalse(any(call[0] == "delete" for call in calls))
+
+    def test_redraw_without_changes_creates_nothing(self):
+        self.canvas.take_calls()
+        self.board.draw()
+        calls = self.canvas.take_calls()
+        self.assertFalse(any(call[0].startswith("create_") or call[0] == "delete" for call in calls))
+        piece_items = set(self._text_items_by_square().values())
+        self.assertFalse(any(call[1] in piece_items for call in calls))
+
+    def test_move_updates_only_changed_squares(self):
+        self.canvas.take_calls()
+        self.board.board[4][4] = self.board.board[6][4]  # e2-e4
+        self.board.board[6][4] = ""
+        self.board.draw()
+        calls = self.canvas.take_calls()
+        self.assertFalse(any(call[0].startswith("create_") for call in calls))
+        text_items = self._text_items_by_square()
+        touched = {square for square, item in text_items.items()
+                   if any(call[0] == "itemconfig" and call[1] == item for call in calls)}
+        self.assertEqual(touched, {(4, 4), (6, 4)})
+        texts = {call[1]: call[3]["text"] for call in calls if call[0] == "itemconfig" and "text" in call[3]}
+        self.assertEqual(texts[text_items[(6, 4)]], "")
+        self.assertEqual(texts[text_items[(4, 4)]], "♙")
+
+    def test_selection_is_one_item_that_moves(self):
+        selection_item = self.board._selection_item
+        self.canvas.take_calls()
+        self.board.selected = (6, 4)
+        self.board.draw()
+        self.board.selected = (7, 6)
+        self.board.draw()
+        calls = self.canvas.take_calls()
+        moves = [call[2] for call in calls if call[0] == "coords" and call[1] == selection_item]
+        size, left = self.board.cell_size, self.board.margin_left
+        self.assertEqual(moves, [(left + 4 * size, 6 * size, left + 5 * size, 7 * size),
+                                 (left + 6 * size, 7 * size, left + 7 * size, 8 * size)])
+
+        self.board.selected = None
+        self.board.draw()
+        self.assertIn(("itemconfig", selection_item, (), {"state": "hidden"}), self.canvas.take_calls())
+
+class TestBoardImageLoading(unittest.TestCase):
+    def test_first_frame_does_not_wait_for_images(self):
+        canvas = RecordingCanvas()
+        board = Board(canvas)
+        board.use_images_flag = True
+        with patch.object(board.piece_images, "photo", return_value="photo") as photo:
+            board.draw()
+            photo.assert_not_called()  # Unicode pieces first
+            scheduled = [call[2][0] for call in canvas.take_calls() if call[0] == "after_idle"]
+            self.assertEqual(len(scheduled), 1)
+
+            # One piece per idle callback; the board keeps its Unicode pieces until the last one
+            for loaded in range(1, len(PIECE_FILES)):
+                scheduled[0]()
+                self.assertEqual(photo.call_count, loaded)
+                calls = canvas.take_calls()
+                self.assertFalse(any(call[0] == "itemconfig" and "image" in call[3] for call in calls))
+                scheduled = [call[2][0] for call in calls if call[0] == "after_idle"]
+                self.assertEqual(len(scheduled), 1)
+            scheduled[0]()
+        self.assertEqual(photo.call_count, len(PIECE_FILES) + 32)
+        calls = canvas.take_calls()
+        image_items = {board._piece_items[6][4][0], board._piece_items[0][0][0]}
+        shown = {call[1] for call in calls if call[0] == "itemconfig" and call[3].get("image") == "photo"}
+        self.assertTrue(image_items <= shown)
+        self.assertEqual(len(shown), 32)
+        self.assertFalse(any(call[0] == "after_idle" for call in calls))
+
+class TestBoardPromotion(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(RecordingCanvas())
+        self.board.position = Position(*board_from_fen("7k/P7/8/8/8/8/8/K7 w - - 0 1"))
+
+    def test_cancelled_promotion_changes_nothing(self):
+        before = ([row[:] for row in self.board.position.board], self.board.position.key)
+        with patch.object(self.board, "ask_promotion_choice", return_value=None):
+            self.assertIs(self.board.move_piece(1, 0, 0, 0, "w"), False)
+        self.assertEqual(([row[:] for row in self.board.position.board], self.board.position.key), before)
+        self.assertFalse(self.board.position.can_unmake())
+
+    def test_chosen_promotion_is_played(self):
+        with patch.object(self.board, "ask_promotion_choice", return_value="n"):
+            self.assertTrue(self.board.move_piece(1, 0, 0, 0, "w"))
+        self.assertEqual(self.board.position.board[0][0], "n")
+
+if __name__ == "__main__":
+    unittest.main()
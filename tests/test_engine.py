@@ -0,0 +1,58 @@
+import unittest
+from main.Engine import Engine, evaluate, MATE_THRESHOLD
+from main.Fen import board_from_fen
+from main.Position import Position
+from tests.test_move_generation import initial_position
+
+
+def position_from_fen(fen):
+    board_array, turn = board_from_fen(fen)
+    return Position(board_array, turn)
+
+class TestEvaluate(unittest.TestCase):
+    def test_initial_position_is_balanced(self):
+        self.assertEqual(evaluate(initial_position(), 'w'), 0)
+        self.assertEqual(evaluate(initial_position(), 'b'), 0)
+
+    def test_score_is_relative_to_side_to_move(self):
+        board_array, _ = board_from_fen("4k3/8/8/8/8/8/8/Q3K3 w - - 0 1")
+        self.assertGreater(evaluate(board_array, 'w'), 800)
+        self.assertEqual(evaluate(board_array, 'b'), -evaluate(board_array, 'w'))
+
+class TestEngine(unittest.TestCase):
+    def test_finds_mate_in_one(self):
+        position = position_from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = Engine().search(position, max_depth=3)
+        self.assertEqual(result.best_move, ((7, 0), (0, 0)))
+        self.assertGreaterEqual(result.score, MATE_THRESHOLD)
+        self.assertEqual(result.mate_in(), 1)
+
+    def test_wins_hanging_queen(self):
+        position = position_from_fen("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        result = Engine().search(position, max_depth=2)
+        self.assertEqual(result.best_move, ((6, 3), (3, 3)))
+
+    def test_iterations_report_time_to_depth(self):
+        result = Engine().search(Position(initial_position()), max_depth=3)
+        self.assertEqual([info.depth for info in result.iterations], [1, 2, 3])
+        self.assertEqual(sorted(result.time_to_depth()), [1, 2, 3])
+        self.assertEqual(len(result.pv), 3)
+
+    def test_node_budget_stops_search_and_restores_position(self):
+        position = Position(initial_position())
+        start_key = position.key
+        result = Engine().search(position, node_limit=3000)
+        self.assertLess(result.nodes, 3000 + 1024)
+        self.assertIn(result.best_move, position.legal_moves())
+        self.assertEqual(position.board, initial_position())
+        self.assertEqual(position.key, start_key)
+        self.assertFalse(position.can_unmake())
+
+    def test_no_legal_moves(self):
+        position = position_from_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        result = Engine().search(position, max_depth=2)
+        self.assertIsNone(result.best_move)
+        self.assertEqual(result.score, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import time
+import types
+import unittest
+from main.Engine import Engine
+from main.EngineWorker import EngineWorker
+from main.Fen import board_from_fen
+from main.GameState import GameState
+from main.History import History
+from main.Moving import MoveController
+from main.Position import Position
+from tests.test_move_generation import initial_position
+
+
+def poll_until_done(worker, timeout=10):
+    messages = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        messages.extend(worker.poll())
+        if messages and messages[-1][0] == "done":
+            return messages
+        time.sleep(0.01)
+    raise AssertionError("engine worker did not finish")
+
+class TestEngineWorker(unittest.TestCase):
+    def test_reports_progress_and_result(self):
+        worker = EngineWorker()
+        board_array, turn = board_from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        worker.start(board_array, turn, "hint", max_depth=3)
+        self.assertTrue(worker.busy)
+        messages = poll_until_done(worker)
+        self.assertEqual(messages[0][:2], ("info", "hint"))
+        kind, purpose, result = messages[-1]
+        self.assertEqual((kind, purpose), ("done", "hint"))
+        self.assertEqual(result.best_move, ((7, 0), (0, 0)))
+        self.assertFalse(worker.busy)
+
+    def test_search_uses_a_copy_of_the_board(self):
+        worker = EngineWorker()
+        board_array = initial_position()
+        worker.start(board_array, "w", "move", max_depth=2)
+        poll_until_done(worker)
+        self.assertEqual(board_array, initial_position())
+
+    def test_cancel_stops_search_and_drops_its_messages(self):
+        worker = EngineWorker()
+        worker.start(initial_position(), "w", "move", time_limit=30)
+        time.sleep(0.05)
+        started = time.monotonic()
+        worker.cancel()
+        worker.wait(5)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(worker.busy)
+        self.assertEqual(worker.poll(), [])
+
+    def test_new_job_replaces_running_one(self):
+        worker = EngineWorker()
+        worker.start(initial_position(), "w", "hint", time_limit=30)
+        worker.start(initial_position(), "w", "move", max_depth=1)
+        messages = poll_until_done(worker)
+        self.assertTrue(all(purpose == "move" for _, purpose, _ in messages))
+
+class TestPondering(unittest.TestCase):
+    def test_ponder_hit_keeps_searching_as_move(self):
+        worker = EngineWorker()
+        worker.ponder(initial_position(), "w")
+        time.sleep(0.5)
+        self.assertEqual(worker.poll()[-1][1], "ponder")
+        self.assertTrue(worker.ponder_hit(0.2))
+        messages = poll_until_done(worker)
+        kind, purpose, result = messages[-1]
+        self.assertEqual((kind, purpose), ("done", "move"))
+        # Half a second of pondering reaches at least the depth of a fresh search with the same move time
+        fresh = Engine().search(Position(initial_position()), time_limit=0.2)
+        self.assertGreaterEqual(result.depth, fresh.depth)
+
+    def test_ponder_hit_after_ponder_search_finished(self):
+        worker = EngineWorker()
+        board_array, turn = board_from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        worker.ponder(board_array, turn)
+        worker.wait(5)
+        self.assertEqual([kind for kind, _, _ in worker.poll()], ["info"])
+        self.assertTrue(worker.busy)
+        self.assertTrue(worker.ponder_hit())
+        self.assertEqual(poll_until_done(worker)[-1][2].best_move, ((7, 0), (0, 0)))
+
+    def test_ponder_miss_is_cancelled_by_next_search(self):
+        worker = EngineWorker()
+        worker.ponder(initial_position(), "w")
+        time.sleep(0.05)
+        started = time.monotonic()
+        worker.start(initial_position(), "b", "move", max_depth=1)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(worker.ponder_hit())
+        self.assertEqual(poll_until_done(worker)[-1][1], "move")
+
+class TestMoveControllerPondering(unittest.TestCase):
+    def setUp(self):
+        position = Position(initial_position())
+        self.board = types.SimpleNamespace(position=position, board=position.board, selected=None, hint=None)
+        self.game_state = GameState()
+        self.history = History(self.board.board, self.game_state.turn)
+        self.worker = EngineWorker()
+        self.controller = MoveController(self.board, self.game_state, self.history, self.worker)
+        self.addCleanup(self.worker.cancel)
+
+    def engine_reply(self, time_limit=0.1):
+        self.controller.request_engine_move(time_limit)
+        result = poll_until_done(self.worker)[-1][2]
+        self.controller.play_move(result.best_move)
+        return result
+
+    def test_hit_and_miss(self):
+        self.controller.play_move(((6, 4), (4, 4)))  # e2-e4
+        result = self.engine_reply()
+        self.assertTrue(self.controller.start_pondering(result))
+        self.assertEqual(self.controller.ponder_move, result.pv[1])
+        self.assertEqual(self.worker.purpose, "ponder")
+
+        self.controller.play_move(self.controller.ponder_move)
+        self.assertTrue(self.controller.request_engine_move(0.1))
+        self.assertEqual(self.controller.ponder_hits, 1)
+        result = poll_until_done(self.worker)[-1][2]
+        self.assertIn(result.best_move, self.controller.game.legal_moves())
+        self.controller.play_move(result.best_move)
+
+        self.assertTrue(self.controller.start_pondering(result))
+        expected = self.controller.ponder_move
+        other = next(move for move in self.controller.game.legal_moves() if move != expected)
+        self.controller.play_move(other)
+        self.assertFalse(self.controller.request_engine_move(0.1))
+        self.assertEqual(self.controller.ponder_misses, 1)
+        self.assertEqual(poll_until_done(self.worker)[-1][1], "move")
+
+if __name__ == '__main__':
+    unittest.main()
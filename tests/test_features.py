@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from main.Fen import START_FEN, board_from_fen
+from main.Rules import get_all_legal_moves_for_player
+
+if np is not None:
+    from main.Features import FeatureWriter, open_features, iter_feature_chunks, iter_fen_positions, iter_game_positions, MEMMAP, NPY
+
+FENS = [
+    START_FEN,
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1",
+    "4k3/8/8/8/8/8/4r3/4K3 w - - 0 1",
+    "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1",  # Stalemate: no legal moves
+]
+PGN = """[Event "Test"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. O-O Nf6 1-0
+"""
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFeatures(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="chess-features-test-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def write(self, subdirectory, output_format, chunk_size, positions):
+        path = os.path.join(self.directory, subdirectory)
+        with FeatureWriter(path, chunk_size, output_format) as writer:
+            writer.add_all(positions)
+        return path, writer
+
+    def test_features_match_the_positions(self):
+        path, writer = self.write("npy", NPY, 2, iter_fen_positions(FENS))
+        self.assertEqual((writer.count, writer.chunks), (5, 3))
+        arrays = open_features(path)
+        self.assertEqual(arrays["planes"].shape, (5, 12, 8, 8))
+        for index, fen in enumerate(FENS):
+            board_array, turn = board_from_fen(fen)
+            self.assertEqual(arrays["turn"][index], 0 if turn == "w" else 1)
+            for row in range(8):
+                for col in range(8):
+                    piece_planes = np.flatnonzero(arrays["planes"][index, :, row, col])
+                    expected = [] if not board_array[row][col] else ["pnbrqkPNBRQK".index(board_array[row][col])]
+                    self.assertEqual(piece_planes.tolist(), expected)
+            moves = {(fr * 8 + fc, tr * 8 + tc) for (fr, fc), (tr, tc) in get_all_legal_moves_for_player(board_array, turn)}
+            self.assertEqual({tuple(square) for square in np.argwhere(arrays["legal"][index])}, moves)
+        self.assertEqual(int(arrays["legal"][4].sum()), 0)
+
+    def test_memmap_output_matches_npy(self):
+        npy_path, _ = self.write("npy", NPY, 2, iter_fen_positions(FENS))
+        memmap_path, _ = self.write("memmap", MEMMAP, 2, iter_fen_positions(FENS))
+        self.assertEqual(sorted(name for name in os.listdir(memmap_path) if name.endswith(".dat")),
+                         ["legal.dat", "planes.dat", "turn.dat"])
+        from_npy, from_memmap = open_features(npy_path), open_features(memmap_path)
+        self.assertIsInstance(from_memmap["legal"], np.memmap)
+        for name in from_npy:
+            self.assertTrue((from_npy[name] == from_memmap[name]).all(), name)
+
+    def test_buffers_do_not_grow(self):
+        writer = FeatureWriter(os.path.join(self.directory, "bounded"), 3, MEMMAP)
+        buffers = dict(writer._buffers)
+        writer.add_all(iter_fen_positions(FENS * 4))
+        writer.close()
+        self.assertTrue(all(writer._buffers[name] is buffer for name, buffer in buffers.items()))
+        self.assertEqual((writer.count, writer.chunks), (20, 7))
+        self.assertEqual(len(open_features(writer.directory)["turn"]), 20)
+
+    def test_rewriting_a_directory_replaces_earlier_output(self):
+        for output_format in (NPY, MEMMAP):
+            path, _ = self.write("reused", output_format, 2, iter_fen_positions(FENS))
+            path, _ = self.write("reused", output_format, 2, iter_fen_positions(FENS[3:4]))
+            arrays = open_features(path)
+            self.assertEqual({name: len(array) for name, array in arrays.items()},
+                             {"planes": 1, "turn": 1, "legal": 1}, output_format)
+            self.assertEqual(arrays["turn"].tolist(), [0])
+        self.assertEqual(sorted(os.listdir(path)), ["features.json", "legal.dat", "planes.dat", "turn.dat"])
+
+    def test_chunks_are_read_one_at_a_time(self):
+        path, _ = self.write("chunks", NPY, 2, iter_fen_positions(FENS))
+        chunks = list(iter_feature_chunks(path))
+        self.assertEqual([len(chunk["turn"]) for chunk in chunks], [2, 2, 1])
+        self.assertIsInstance(chunks[0]["legal"], np.memmap)
+        self.assertEqual(np.concatenate([chunk["turn"] for chunk in chunks]).tolist(), [0, 0, 1, 0, 1])
+
+    def test_failed_run_writes_no_metadata(self):
+        path = os.path.join(self.directory, "failed")
+        with self.assertRaises(ValueError):
+            with FeatureWriter(path, 2) as writer:
+                writer.add_all(iter_fen_positions(FENS[:3] + ["not a fen"]))
+        self.assertEqual(writer.chunks, 1)
+        self.assertNotIn("features.json", os.listdir(path))
+        with self.assertRaises(OSError):
+            open_features(path)
+
+    def test_game_positions(self):
+        positions = list(iter_game_positions(PGN.splitlines()))
+        # Six moves up to castling, which these rules do not have, plus the position reached
+        self.assertEqual(len(positions), 7)
+        self.assertEqual([turn for _, turn in positions], ["w", "b"] * 3 + ["w"])
+        self.assertEqual(positions[1][0][4][4], "p")  # e4 played
+
+    def test_empty_output(self):
+        path, writer = self.write("empty", MEMMAP, 4, [])
+        self.assertEqual(open_features(path)["legal"].shape, (0, 64, 64))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from main.Fen import START_FEN, board_from_fen, board_to_fen, validate_position
+from main.Game import Game
+from main.Position import initial_board
+
+class TestFen(unittest.TestCase):
+    def test_round_trip(self):
+        for fen in (START_FEN, "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1"):
+            self.assertEqual(board_to_fen(*board_from_fen(fen)), fen)
+        self.assertEqual(board_from_fen(START_FEN), (initial_board(), "w"))
+
+    def test_malformed(self):
+        for fen in ("", "8/8/8 w", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w", "8/8/8/8/8/8/8/9 w",
+                    "p07/8/8/8/8/8/8/8 w", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN0R w",
+                    START_FEN.replace(" w ", " x ")):
+            with self.assertRaises(ValueError, msg=fen):
+                board_from_fen(fen)
+
+    def test_validation(self):
+        impossible = [
+            "8/8/8/8/8/8/8/4K3 w - - 0 1",           # No black king
+            "4k3/8/8/8/8/8/8/3KK3 w - - 0 1",        # Two white kings
+            "P3k3/8/8/8/8/8/8/4K3 w - - 0 1",        # Pawn on the last rank
+            "4k3/8/8/8/8/8/8/R3K2q b - - 0 1",       # White to have moved while in check
+        ]
+        for fen in impossible:
+            board_from_fen(fen)  # Well-formed, so accepted without validation
+            with self.assertRaises(ValueError, msg=fen):
+                board_from_fen(fen, validate=True)
+        validate_position(*board_from_fen(START_FEN))
+
+class TestGameFen(unittest.TestCase):
+    def test_fen_follows_the_game(self):
+        game = Game()
+        self.assertEqual(game.fen(), START_FEN)
+        game.play(6, 4, 4, 4)
+        self.assertEqual(game.fen(), "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - - 0 1")
+
+    def test_load_fen(self):
+        fen = "4k3/8/8/8/8/8/4r3/4K3 w - - 0 1"
+        game = Game.from_fen(fen)
+        self.assertEqual((game.fen(), game.turn, game.position.turn), (fen, "w", "w"))
+        self.assertFalse(game.history.can_undo())
+        self.assertEqual(game.status(), "check")
+        self.assertEqual(game.play(7, 4, 6, 4), "continue")  # Kxe2
+        self.assertTrue(game.undo())
+        self.assertEqual(game.fen(), fen)
+
+    def test_load_finished_position(self):
+        self.assertTrue(Game.from_fen("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1").game_over)
+
+    def test_invalid_fen_leaves_game_unchanged(self):
+        game = Game()
+        game.play(6, 4, 4, 4)
+        fen = game.fen()
+        with self.assertRaises(ValueError):
+            game.load_fen("8/8/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(game.fen(), fen)
+        self.assertTrue(game.history.can_undo())
+
+if __name__ == "__main__":
+    unittest.main()
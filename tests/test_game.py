@@ -0,0 +1,76 @@
+import unittest
+import subprocess
+import sys
+from main.Game import Game
+from main.Position import Position
+from tests.test_move_generation import board_from_strings, initial_position
+
+
+class TestHeadlessGame(unittest.TestCase):
+    def test_headless_import_path_loads_no_gui_libraries(self):
+        code = ("import sys, main.Game, main.perft; "
+                "print(sorted(m for m in ('tkinter', 'PIL', 'cairosvg') if m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_fools_mate(self):
+        game = Game()
+        self.assertEqual(game.play(6, 5, 5, 5), "continue")
+        self.assertEqual(game.play(1, 4, 3, 4), "continue")
+        self.assertEqual(game.play(6, 6, 4, 6), "continue")
+        self.assertEqual(game.play(0, 3, 4, 7), "checkmate")
+        self.assertTrue(game.game_over)
+        self.assertIsNone(game.play(6, 0, 5, 0))
+
+        self.assertTrue(game.undo())
+        self.assertFalse(game.game_over)
+        self.assertEqual(game.turn, 'b')
+        while game.undo():
+            pass
+        self.assertEqual(game.board, initial_position())
+        self.assertEqual(game.turn, 'w')
+
+    def test_illegal_move_is_rejected(self):
+        game = Game()
+        self.assertIsNone(game.play(6, 0, 3, 0))
+        self.assertEqual(game.board, initial_position())
+        self.assertEqual(game.turn, 'w')
+
+    def test_promotion_choice_is_an_argument(self):
+        board = board_from_strings([
+            "    K   ",
+            "p       ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "       P",
+            "    k   ",
+        ])
+        game = Game(Position(board))
+        game.history.reset()
+        game.history.push(board, 'w')
+        self.assertEqual(game.play(1, 0, 0, 0, promotion="N"), "continue")
+        self.assertEqual(game.board[0][0], "n")
+        asked = []
+        self.assertEqual(game.play(6, 7, 7, 7, promotion=lambda pawn: asked.append(pawn) or "r"), "check")
+        self.assertEqual(game.board[7][7], "R")
+        self.assertEqual(asked, ["P"])
+
+        game.undo()
+        game.undo()
+        self.assertEqual(game.board[1][0], "p")
+        self.assertEqual(game.board[6][7], "P")
+
+    def test_invalid_promotion_choice_changes_nothing(self):
+        game = Game.from_fen("7k/P7/8/8/8/8/8/K7 w - - 0 1")
+        fen, key = game.fen(), game.position.key
+        for choice in ("x", "k", "p", "", None, 5, lambda pawn: None, lambda pawn: "K"):
+            self.assertIsNone(game.play(1, 0, 0, 0, promotion=choice), repr(choice))
+            self.assertEqual((game.fen(), game.position.key, game.turn), (fen, key, "w"))
+            self.assertFalse(game.history.can_undo())
+        self.assertEqual(game.play(1, 0, 0, 0, promotion="B"), "continue")
+        self.assertEqual(game.board[0][0], "b")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from main.History import History
+from main.Rules import MoveRecord, make_move
+from tests.test_move_generation import initial_position
+
+
+class TestDeltaHistory(unittest.TestCase):
+    def test_push_move_and_undo_rebuild_earlier_states(self):
+        board = initial_position()
+        history = History(board, 'w')
+        states = [([row[:] for row in board], 'w')]
+        for (fr, fc, tr, tc), turn in (((6, 4, 4, 4), 'b'), ((1, 3, 3, 3), 'w'), ((4, 4, 3, 3), 'b')):
+            history.push_move(make_move(board, fr, fc, tr, tc), turn)
+            states.append(([row[:] for row in board], turn))
+
+        self.assertEqual(list(history.history), states)
+        self.assertIsInstance(history.last_move(), MoveRecord)
+        self.assertEqual(history.last_move().captured, "P")
+        while history.can_undo():
+            popped = history.pop_last_move()
+            self.assertEqual(popped, states.pop())
+            self.assertEqual(history.get_last_state(), states[-1])
+        self.assertIsNone(history.pop_last_move())
+        self.assertEqual(history.get_last_state(), (initial_position(), 'w'))
+
+    def test_only_deltas_are_stored(self):
+        board = initial_position()
+        history = History(board, 'w')
+        history.push_move(make_move(board, 6, 0, 5, 0), 'b')
+        changed = [row[:] for row in board]
+        changed[0][0] = ""
+        history.push(changed, 'w')
+        self.assertIsInstance(history._deltas[0][0], MoveRecord)
+        self.assertEqual(history._deltas[1][0], ((0, 0, "R", ""),))
+        self.assertEqual(history.history[1][0], board)
+        self.assertEqual(history.history[-1][0], changed)
+
+    def test_history_owns_its_boards(self):
+        board = initial_position()
+        history = History(board, 'w')
+        board[6][0] = ""
+        self.assertEqual(history.get_last_state()[0][6][0], "p")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import launch_chess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestLauncher(unittest.TestCase):
+    def test_profile_imports_covers_every_module(self):
+        timings = launch_chess.profile_imports()
+        self.assertEqual([name for name, _ in timings], launch_chess.STARTUP_MODULES)
+        self.assertTrue(all(seconds >= 0 for _, seconds in timings))
+
+    def test_game_import_loads_no_image_libraries(self):
+        # A fresh interpreter: this test process may have imported them for other reasons
+        code = ("import sys, main.main; "
+                "print(','.join(name for name in ('PIL', 'cairosvg') if name in sys.modules))")
+        completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                                   capture_output=True, text=True, check=True)
+        self.assertEqual(completed.stdout, "\n")  # Nothing imported and no warning printed
+
+if __name__ == "__main__":
+    unittest.main()
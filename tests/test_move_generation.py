@@ -0,0 +1,204 @@
+import unittest
+from main.Rules import is_valid_move, generate_pseudo_legal_moves, get_all_legal_moves_for_player, make_move, unmake_move, \
+    is_square_attacked, _is_valid_move_for_attack_check, iter_legal_moves, has_legal_move, get_game_status, \
+    LEGAL_MOVE_SEARCH_ORDER
+
+def board_from_strings(rows):
+    """Builds a board from 8 strings of 8 chars, ' ' or '.' for empty squares."""
+    return [["" if char in " ." else char for char in row] for row in rows]
+
+def initial_position():
+    return board_from_strings([
+        "RNBQKBNR",
+        "PPPPPPPP",
+        "        ",
+        "        ",
+        "        ",
+        "        ",
+        "pppppppp",
+        "rnbqkbnr",
+    ])
+
+def brute_force_legal_moves(board, player_color):
+    """Reference generator: every from/to pair checked through is_valid_move."""
+    return [((fr, fc), (tr, tc))
+            for fr in range(8) for fc in range(8)
+            for tr in range(8) for tc in range(8)
+            if (fr, fc) != (tr, tc) and is_valid_move(board, fr, fc, tr, tc, player_color)]
+
+def brute_force_is_attacked(board, row, col, attacker_color):
+    """Reference attack test: asks every piece of attacker_color whether it reaches the square."""
+    return any(_is_valid_move_for_attack_check(board, r, c, row, col, attacker_color)
+               for r in range(8) for c in range(8))
+
+TEST_POSITIONS = [
+    initial_position(),
+    board_from_strings([
+        "R   K  R",
+        "P PPQPB ",
+        "BN  PNP ",
+        "   pn   ",
+        " P  p   ",
+        "  q   Q ",
+        "pppbbppp",
+        "r   k  r",
+    ]),
+    board_from_strings([
+        "        ",
+        "  P     ",
+        "   P    ",
+        "kp     R",
+        " r   P K",
+        "        ",
+        "    p p ",
+        "        ",
+    ]),
+    board_from_strings([
+        "   K    ",
+        "p      P",
+        "        ",
+        "        ",
+        "        ",
+        "        ",
+        "P      p",
+        "    k   ",
+    ]),
+]
+
+
+class TestMoveGeneration(unittest.TestCase):
+    def test_initial_position_move_counts(self):
+        board = initial_position()
+        self.assertEqual(len(get_all_legal_moves_for_player(board, 'w')), 20)
+        self.assertEqual(len(get_all_legal_moves_for_player(board, 'b')), 20)
+
+    def test_slider_rays_stop_at_blockers(self):
+        board = board_from_strings([
+            "K       ",
+            "        ",
+            "   P    ",
+            "        ",
+            "   r  p ",
+            "        ",
+            "        ",
+            "       k",
+        ])
+        rook_targets = {to for (frm, to) in generate_pseudo_legal_moves(board, 'w') if frm == (4, 3)}
+        self.assertIn((2, 3), rook_targets)      # Capture of the first enemy blocker
+        self.assertNotIn((1, 3), rook_targets)   # Beyond the blocker
+        self.assertIn((4, 5), rook_targets)
+        self.assertNotIn((4, 6), rook_targets)   # Own pawn
+        self.assertEqual(len(rook_targets), 2 + 3 + 3 + 2)
+
+    def test_pinned_piece_is_filtered_out(self):
+        board = board_from_strings([
+            "    R  K",
+            "        ",
+            "        ",
+            "        ",
+            "    n   ",
+            "        ",
+            "        ",
+            "    k   ",
+        ])
+        self.assertTrue(any(frm == (4, 4) for frm, _ in generate_pseudo_legal_moves(board, 'w')))
+        self.assertFalse(any(frm == (4, 4) for frm, _ in get_all_legal_moves_for_player(board, 'w')))
+
+    def test_matches_brute_force_scan(self):
+        for board in TEST_POSITIONS:
+            for player_color in ('w', 'b'):
+                self.assertCountEqual(get_all_legal_moves_for_player(board, player_color),
+                                      brute_force_legal_moves(board, player_color))
+
+    def test_attack_detection_matches_brute_force(self):
+        for board in TEST_POSITIONS:
+            for attacker_color in ('w', 'b'):
+                for row in range(8):
+                    for col in range(8):
+                        self.assertEqual(is_square_attacked(board, row, col, attacker_color),
+                                         brute_force_is_attacked(board, row, col, attacker_color),
+                                         (row, col, attacker_color))
+
+class TestLazyLegalMoves(unittest.TestCase):
+    def test_iterator_yields_the_full_list(self):
+        for board in TEST_POSITIONS:
+            for player_color in ('w', 'b'):
+                expected = get_all_legal_moves_for_player(board, player_color)
+                self.assertCountEqual(list(iter_legal_moves(board, player_color)), expected)
+                self.assertCountEqual(list(iter_legal_moves(board, player_color, piece_order=LEGAL_MOVE_SEARCH_ORDER)),
+                                      expected)
+                self.assertEqual(has_legal_move(board, player_color), bool(expected))
+
+    def test_piece_order_is_followed(self):
+        first_move = next(iter_legal_moves(initial_position(), 'w', piece_order="pk"))
+        self.assertEqual(initial_position()[first_move[0][0]][first_move[0][1]], "p")
+
+    def test_game_status(self):
+        self.assertEqual(get_game_status(initial_position(), 'w'), "continue")
+        mate = board_from_strings([
+            "       K",
+            "      q ",
+            "     k  ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+        ])
+        self.assertEqual(get_game_status(mate, 'b'), "checkmate")
+        mate[2][5] = ""
+        mate[2][4] = "k"
+        self.assertEqual(get_game_status(mate, 'b'), "check")
+        stalemate = board_from_strings([
+            "       K",
+            "        ",
+            "     kq ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+        ])
+        self.assertEqual(get_game_status(stalemate, 'b'), "stalemate")
+
+
+class TestMakeUnmake(unittest.TestCase):
+    def test_capture_round_trip(self):
+        board = initial_position()
+        board[2][3] = "p"
+        before = [row[:] for row in board]
+        record = make_move(board, 2, 3, 1, 4)
+        self.assertEqual(record.captured, "P")
+        self.assertEqual(board[1][4], "p")
+        self.assertEqual(board[2][3], "")
+        unmake_move(board, record)
+        self.assertEqual(board, before)
+
+    def test_promotion_round_trip(self):
+        board = board_from_strings([
+            "    K   ",
+            "p       ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "    k   ",
+        ])
+        before = [row[:] for row in board]
+        record = make_move(board, 1, 0, 0, 0, "n")
+        self.assertEqual(board[0][0], "n")
+        self.assertEqual(record.piece, "p")
+        self.assertEqual(record.promotion, "n")
+        unmake_move(board, record)
+        self.assertEqual(board, before)
+
+    def test_legality_check_leaves_board_untouched(self):
+        board = initial_position()
+        before = [row[:] for row in board]
+        get_all_legal_moves_for_player(board, 'w')
+        is_valid_move(board, 6, 4, 4, 4, 'w')
+        self.assertEqual(board, before)
+
+if __name__ == '__main__':
+    unittest.main()
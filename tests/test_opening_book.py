@@ -0,0 +1,119 @@
+import os
+import random
+import tempfile
+import unittest
+from main.Engine import Engine
+from main.Fen import board_from_fen
+from main.OpeningBook import OpeningBook, build_book, read_pgn_games, san_to_move, MAGIC, RECORD
+from main.Position import Position
+from tests.test_move_generation import initial_position
+
+PGN = """[Event "First"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 {main line} Nc6 (2... d6 3. d4) 3. Bb5 a6 4. O-O Nf6 1-0
+
+[Event "Second"]
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 3. d4 cxd4 4. Nxd4 Nf6 5. Nc3 a6 1/2-1/2
+
+[Event "Third"]
+[Result "0-1"]
+
+1. d4 d5 2. c4 e6 0-1
+"""
+
+
+class TestPgn(unittest.TestCase):
+    def test_read_games(self):
+        games = list(read_pgn_games(PGN))
+        self.assertEqual(len(games), 3)
+        tags, moves = games[0]
+        self.assertEqual(tags["Result"], "1-0")
+        self.assertEqual(moves, ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "O-O", "Nf6"])
+
+    def test_san_to_move(self):
+        position = Position(initial_position())
+        self.assertEqual(san_to_move(position, "Nf3"), (((7, 6), (5, 5)), None))
+        self.assertEqual(san_to_move(position, "e4"), (((6, 4), (4, 4)), None))
+        with self.assertRaises(ValueError):
+            san_to_move(position, "e5")
+        with self.assertRaises(ValueError):
+            san_to_move(position, "O-O")
+        board_array, turn = board_from_fen("4k3/1P6/8/8/8/8/4K3/R6R w - - 0 1")
+        position = Position(board_array, turn)
+        self.assertEqual(san_to_move(position, "b8=N+"), (((1, 1), (0, 1)), "n"))
+        with self.assertRaises(ValueError):
+            san_to_move(position, "Rd1")  # Either rook
+        self.assertEqual(san_to_move(position, "Rhf1")[0], ((7, 7), (7, 5)))
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        pgn_path = os.path.join(directory.name, "games.pgn")
+        with open(pgn_path, "w") as pgn_file:
+            pgn_file.write(PGN)
+        self.book_path = os.path.join(directory.name, "book.bin")
+        self.count = build_book([pgn_path], self.book_path, max_plies=8)
+
+    def test_file_is_sorted_records(self):
+        with open(self.book_path, "rb") as book_file:
+            data = book_file.read()
+        self.assertEqual(data[:len(MAGIC)], MAGIC)
+        self.assertEqual(len(data), len(MAGIC) + self.count * RECORD.size)
+        keys = [RECORD.unpack_from(data, len(MAGIC) + i * RECORD.size)[0] for i in range(self.count)]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_lookup(self):
+        with OpeningBook(self.book_path) as book:
+            self.assertEqual(len(book), self.count)
+            position = Position(initial_position())
+            # e4 won once and drew once (2 + 1); d4 lost its only game, so it is left out
+            self.assertEqual(book.entries(position.key), [(((6, 4), (4, 4)), 3)])
+            position.make_move(6, 4, 4, 4)
+            # Only c5 (drawn) is kept: e5 was played by the losing side
+            self.assertEqual(book.entries(position.key), [(((1, 2), (3, 2)), 1)])
+            self.assertEqual(book.choose(position), ((1, 2), (3, 2)))
+            self.assertEqual(book.choose(position, random.Random(1)), ((1, 2), (3, 2)))
+            position.make_move(4, 4, 3, 4)  # e5: not a book position
+            self.assertEqual(book.entries(position.key), [])
+            self.assertIsNone(book.choose(position))
+
+    def test_games_stop_at_castling(self):
+        with OpeningBook(self.book_path) as book:
+            position = Position(initial_position())
+            first_game = [((6, 4), (4, 4)), ((1, 4), (3, 4)), ((7, 6), (5, 5)), ((0, 1), (2, 2)),
+                          ((7, 5), (3, 1)), ((1, 0), (2, 0))]
+            for move in first_game:
+                if position.turn == 'w':  # White won: only its moves are weighted
+                    self.assertEqual(book.entries(position.key)[0][0], move)
+                position.play(move)
+            self.assertEqual(book.entries(position.key), [])  # 4. O-O ended the game
+
+    def test_engine_plays_book_move_first(self):
+        with OpeningBook(self.book_path) as book:
+            engine = Engine(book=book)
+            engine.book_rng = None
+            result = engine.search(Position(initial_position()), max_depth=3)
+            self.assertTrue(result.from_book)
+            self.assertEqual(result.best_move, ((6, 4), (4, 4)))
+            self.assertEqual(result.nodes, 0)
+
+    def test_parallel_engine_plays_book_move_first(self):
+        from main.ParallelSearch import ParallelEngine
+        with OpeningBook(self.book_path) as book, ParallelEngine(2, hash_mb=1, book=book) as engine:
+            engine.book_rng = None
+            result = engine.search(Position(initial_position()), max_depth=3)
+            self.assertTrue(result.from_book)
+            self.assertEqual(result.best_move, ((6, 4), (4, 4)))
+
+    def test_rejects_other_files(self):
+        with open(self.book_path, "wb") as book_file:
+            book_file.write(b"not a book at all")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.book_path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import random
+import tempfile
+import unittest
+
+from main.Fen import START_FEN, board_from_fen
+from main.PackedPosition import (PACKED_SIZE, pack_fen, pack_position, read_records, unpack_fen,
+                                 unpack_position, write_records)
+from main.Position import Position, initial_board
+
+def random_game_positions(count, seed):
+    rng, positions = random.Random(seed), []
+    position = Position(initial_board())
+    while len(positions) < count:
+        moves = position.legal_moves()
+        if not moves:
+            position = Position(initial_board())
+            continue
+        positions.append(([row[:] for row in position.board], position.turn))
+        position.play(rng.choice(moves))
+    return positions
+
+class TestPackedPosition(unittest.TestCase):
+    def test_round_trip(self):
+        for board_array, turn in random_game_positions(300, 1):
+            packed = pack_position(board_array, turn)
+            self.assertEqual(len(packed), PACKED_SIZE)
+            self.assertEqual(unpack_position(packed), (board_array, turn))
+
+    def test_layout(self):
+        packed = pack_fen(START_FEN)
+        self.assertEqual(packed.hex(), "a89bc98a" + "77777777" + "0" * 32 + "11111111" + "42356324" + "00")
+        self.assertEqual(pack_fen(START_FEN.replace(" w ", " b "))[32], 1)
+        self.assertEqual(unpack_fen(packed), START_FEN)
+
+    def test_usable_as_key(self):
+        board_array, _ = board_from_fen(START_FEN)
+        cache = {pack_position(board_array, "w"): "white", pack_position(board_array, "b"): "black"}
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache[pack_fen(START_FEN)], "white")
+
+    def test_invalid_encodings(self):
+        valid = pack_fen(START_FEN)
+        for packed in (valid[:-1], valid + b"\0", valid[:32] + b"\x02", b"\xff" + valid[1:]):
+            with self.assertRaises(ValueError):
+                unpack_position(packed)
+
+    def test_record_file(self):
+        positions = random_game_positions(50, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "positions.bin")
+            self.assertEqual(write_records(path, positions), 50)
+            self.assertEqual(os.path.getsize(path), 50 * PACKED_SIZE)
+            self.assertEqual(list(read_records(path)), positions)
+
+if __name__ == "__main__":
+    unittest.main()
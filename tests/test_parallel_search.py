@@ -0,0 +1,62 @@
+import unittest
+from main.Engine import Engine, MATE_SCORE
+from main.Fen import board_from_fen
+from main import ParallelSearch
+from main.ParallelSearch import ParallelEngine, _merge_iterations
+from main.Position import Position
+from main.TranspositionTable import TranspositionTable, ALWAYS_REPLACE
+from tests.test_move_generation import initial_position
+
+def worker_table_scheme():
+    return ParallelSearch._worker_engine.tt.scheme
+
+class TestMergeIterations(unittest.TestCase):
+    def test_best_score_per_common_depth(self):
+        first = [(1, 10, 5, 0.1, ["a"]), (2, 30, 20, 0.2, ["a", "b"])]
+        second = [(1, 50, 7, 0.3, ["c"])]
+        merged = _merge_iterations([first, second])
+        self.assertEqual(len(merged), 1)
+        self.assertEqual((merged[0].depth, merged[0].score, merged[0].nodes, merged[0].elapsed, merged[0].pv),
+                         (1, 50, 12, 0.3, ["c"]))
+
+    def test_mate_counts_for_deeper_depths(self):
+        mating = [(1, MATE_SCORE - 1, 5, 0.1, ["m"])]
+        other = [(1, 0, 5, 0.1, ["x"]), (2, 10, 9, 0.2, ["x", "y"])]
+        merged = _merge_iterations([mating, other])
+        self.assertEqual([info.depth for info in merged], [1, 2])
+        self.assertEqual(merged[-1].pv, ["m"])
+
+class TestParallelEngine(unittest.TestCase):
+    def test_matches_single_process_score(self):
+        position = Position(initial_position())
+        expected = Engine().search(position, max_depth=3)
+        with ParallelEngine(2, hash_mb=1) as engine:
+            result = engine.search(position, max_depth=3)
+        self.assertEqual(result.depth, 3)
+        self.assertEqual(result.score, expected.score)
+        self.assertIn(result.best_move, position.legal_moves())
+        self.assertEqual(position.board, initial_position())
+
+    def test_finds_mate(self):
+        board_array, turn = board_from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        with ParallelEngine(3, hash_mb=1) as engine:
+            result = engine.search(Position(board_array, turn), max_depth=3)
+        self.assertEqual(result.best_move, ((7, 0), (0, 0)))
+        self.assertEqual(result.mate_in(), 1)
+
+    def test_hash_scheme_reaches_workers(self):
+        with ParallelEngine(2, hash_mb=1, hash_scheme=ALWAYS_REPLACE) as engine:
+            self.assertEqual(engine._pool.submit(worker_table_scheme).result(), ALWAYS_REPLACE)
+
+    def test_single_root_move_uses_own_engine(self):
+        board_array, turn = board_from_fen("7k/8/8/8/8/8/6q1/7K w - - 0 1")  # Only Kxg2
+        with ParallelEngine(2, hash_mb=1, hash_scheme=ALWAYS_REPLACE) as engine:
+            table = engine._engine.tt
+            self.assertEqual((table.scheme, table.capacity), (ALWAYS_REPLACE, TranspositionTable(1, ALWAYS_REPLACE).capacity))
+            for _ in range(2):
+                result = engine.search(Position(board_array, turn), max_depth=2)
+                self.assertEqual(result.best_move, ((7, 7), (6, 6)))
+            self.assertIs(engine._engine.tt, table)
+
+if __name__ == '__main__':
+    unittest.main()
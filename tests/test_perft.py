@@ -0,0 +1,31 @@
+import unittest
+from main.Fen import START_FEN, board_from_fen, board_to_fen
+from main.Position import Position
+from main.perft import REFERENCE_POSITIONS, perft, divide
+from tests.test_move_generation import initial_position
+
+
+class TestPerft(unittest.TestCase):
+    def test_fen_round_trip(self):
+        board_array, turn = board_from_fen(START_FEN)
+        self.assertEqual(board_array, initial_position())
+        self.assertEqual(turn, 'w')
+        self.assertEqual(board_to_fen(board_array, turn), START_FEN)
+
+    def test_reference_positions_shallow(self):
+        for name, fen, expected_counts in REFERENCE_POSITIONS:
+            position = Position(*board_from_fen(fen))
+            for depth, expected in enumerate(expected_counts[:2], start=1):
+                self.assertEqual(perft(position, depth), expected, f"{name}, depth {depth}")
+
+    def test_divide_sums_to_perft_and_restores_position(self):
+        board_array, turn = board_from_fen(REFERENCE_POSITIONS[2][1])
+        position = Position(board_array, turn)
+        key_before = position.key
+        results = divide(position, 3)
+        self.assertEqual(sum(nodes for _, nodes in results), REFERENCE_POSITIONS[2][2][2])
+        self.assertEqual(position.key, key_before)
+        self.assertEqual(position.board, board_from_fen(REFERENCE_POSITIONS[2][1])[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from main import PieceImages
+from main.PieceImages import PIECE_FILES, PieceImageCache, cache_file_name, clear_disk_cache, load_png
+
+class TestPieceImages(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="chess-pieces-test-")
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.svg_path = os.path.join(PieceImages.IMAGE_DIRECTORY, PIECE_FILES["q"])
+
+    def test_miss_renders_and_writes_cache(self):
+        with patch.object(PieceImages, "_render_svg", return_value=b"png-data") as render:
+            png, from_disk = load_png(self.svg_path, 68, self.cache_dir)
+            self.assertEqual((png, from_disk), (b"png-data", False))
+            png, from_disk = load_png(self.svg_path, 68, self.cache_dir)
+            self.assertEqual((png, from_disk), (b"png-data", True))
+        render.assert_called_once()
+        with open(self.svg_path, "rb") as svg_file:
+            expected_name = cache_file_name(svg_file.read(), 68)
+        self.assertEqual(os.listdir(self.cache_dir), [expected_name])
+
+    def test_key_depends_on_size_and_content(self):
+        self.assertNotEqual(cache_file_name(b"<svg/>", 68), cache_file_name(b"<svg/>", 80))
+        self.assertNotEqual(cache_file_name(b"<svg/>", 68), cache_file_name(b"<svg />", 68))
+
+    def test_cache_loads_each_piece_once(self):
+        images = PieceImageCache(cache_dir=self.cache_dir)
+        with patch.object(PieceImages, "_render_svg", return_value=b"png-data") as render:
+            for _ in range(3):
+                self.assertEqual(images.png("N", 68), b"png-data")
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual((images.rendered, images.disk_hits), (1, 0))
+
+        # A new process (a new cache object) reads the PNG from disk instead of rendering
+        images = PieceImageCache(cache_dir=self.cache_dir)
+        with patch.object(PieceImages, "_render_svg") as render:
+            self.assertEqual(images.png("N", 68), b"png-data")
+        render.assert_not_called()
+        self.assertEqual(images.disk_hits, 1)
+
+    def test_missing_svg_falls_back(self):
+        images = PieceImageCache(image_dir=self.cache_dir, cache_dir=self.cache_dir)
+        with patch("builtins.print"):
+            self.assertIsNone(images.png("k", 68))
+
+    def test_clear_disk_cache(self):
+        with patch.object(PieceImages, "_render_svg", return_value=b"png-data"):
+            load_png(self.svg_path, 68, self.cache_dir)
+            load_png(self.svg_path, 80, self.cache_dir)
+        self.assertEqual(clear_disk_cache(self.cache_dir), 2)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_shared_cache_is_one_object(self):
+        self.assertIs(PieceImages.shared_cache(), PieceImages.shared_cache())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import random
+from main.Position import Position
+from main.Rules import get_king_position
+from tests.test_move_generation import board_from_strings, initial_position
+
+
+class TestKingSquares(unittest.TestCase):
+    def test_initial_king_squares(self):
+        position = Position(initial_position())
+        self.assertEqual(position.king_position('w'), (7, 4))
+        self.assertEqual(position.king_position('b'), (0, 4))
+
+    def test_king_moves_and_undo(self):
+        position = Position(board_from_strings([
+            "    K   ",
+            "       p",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "        ",
+            "    k   ",
+        ]))
+        position.make_move(7, 4, 6, 3)
+        self.assertEqual(position.king_position('w'), (6, 3))
+        position.make_move(0, 4, 1, 4)
+        position.make_move(1, 7, 0, 7, "q")  # Promotion leaves both king squares alone
+        self.assertEqual(position.king_position('b'), (1, 4))
+        while position.can_unmake():
+            position.unmake_move()
+        self.assertEqual(position.king_position('w'), (7, 4))
+        self.assertEqual(position.king_position('b'), (0, 4))
+
+    def test_tracked_squares_match_scan_during_random_play(self):
+        rng = random.Random(11)
+        position = Position(initial_position())
+        for _ in range(80):
+            moves = position.legal_moves()
+            if not moves:
+                break
+            (fr, fc), (tr, tc) = rng.choice(moves)
+            position.make_move(fr, fc, tr, tc)
+            for player_color in ('w', 'b'):
+                self.assertEqual(position.king_position(player_color), get_king_position(position.board, player_color))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import random
+import tempfile
+import unittest
+from main import Tablebase
+from main.Engine import Engine
+from main.Fen import board_from_fen
+from main.Position import Position
+from main.Rules import is_checkmate, is_stalemate, get_game_status
+
+
+def probe_fen(fen):
+    board_array, turn = board_from_fen(fen)
+    return Tablebase.probe(board_array, turn)
+
+class TestTablebase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        Tablebase.generate_tables(cls.directory.name)  # All three once: about 7 s
+
+    @classmethod
+    def tearDownClass(cls):
+        Tablebase.unload_tablebases()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.assertEqual(Tablebase.load_tablebases(self.directory.name), list(Tablebase.TABLE_NAMES))
+        self.addCleanup(Tablebase.unload_tablebases)
+
+    def test_file_size(self):
+        for name in Tablebase.TABLE_NAMES:
+            path = os.path.join(self.directory.name, f"{name}.tb")
+            self.assertEqual(os.path.getsize(path), len(Tablebase.MAGIC) + Tablebase.TABLE_SIZE)
+
+    def mate_lengths(self, name):
+        table = open(os.path.join(self.directory.name, f"{name}.tb"), "rb").read()[len(Tablebase.MAGIC):]
+        return [code - Tablebase.MATE_BASE for code in set(table) if code >= Tablebase.MATE_BASE]
+
+    def test_known_results(self):
+        self.assertEqual(probe_fen("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1"), ("stalemate", 0))
+        self.assertEqual(probe_fen("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), ("loss", 0))
+        self.assertEqual(probe_fen("k7/8/1K6/8/8/8/8/6Q1 w - - 0 1"), ("win", 1))
+        self.assertEqual(probe_fen("8/8/8/8/8/8/8/kQK5 b - - 0 1"), ("loss", 0))
+        self.assertEqual(probe_fen("8/8/8/8/8/8/1k6/1Q2K3 b - - 0 1"), ("draw", 0))  # Kxb1
+        # Black with the queen: looked up mirrored
+        self.assertEqual(probe_fen("K7/8/1k6/8/8/8/8/6q1 b - - 0 1"), ("win", 1))
+        # Longest KQK win is mate in 10
+        plies = self.mate_lengths("KQK")
+        self.assertEqual(max(n for n in plies if n % 2), 19)
+        self.assertEqual(max(n for n in plies if n % 2 == 0), 20)  # Mated in 10 after the longest defence
+
+    def test_krk_results(self):
+        self.assertEqual(probe_fen("k7/8/1K6/8/8/8/8/7R w - - 0 1"), ("win", 1))
+        self.assertEqual(probe_fen("R1k5/8/2K5/8/8/8/8/8 b - - 0 1"), ("loss", 0))
+        self.assertEqual(probe_fen("8/8/8/8/8/8/1k6/1R2K3 b - - 0 1"), ("draw", 0))  # Kxb1
+        # Longest KRK win is mate in 16
+        plies = self.mate_lengths("KRK")
+        self.assertEqual(max(n for n in plies if n % 2), 31)
+        self.assertEqual(max(n for n in plies if n % 2 == 0), 32)
+
+    def test_kpk_results(self):
+        # King in front of its pawn on the sixth rank wins whoever is to move
+        self.assertEqual(probe_fen("4k3/8/4K3/4P3/8/8/8/8 w - - 0 1"), ("win", 21))
+        self.assertEqual(probe_fen("4k3/8/4K3/4P3/8/8/8/8 b - - 0 1"), ("loss", 24))
+        # Further back, the opposition decides
+        self.assertEqual(probe_fen("8/4k3/8/4K3/4P3/8/8/8 w - - 0 1"), ("draw", 0))
+        self.assertEqual(probe_fen("8/4k3/8/4K3/4P3/8/8/8 b - - 0 1"), ("loss", 28))
+        # The defending king in the corner holds a rook pawn
+        self.assertEqual(probe_fen("k7/8/K7/P7/8/8/8/8 w - - 0 1"), ("draw", 0))
+        self.assertEqual(probe_fen("k7/8/K7/P7/8/8/8/8 b - - 0 1"), ("draw", 0))
+        self.assertEqual(probe_fen("8/8/8/8/p7/8/8/K6k b - - 0 1"), ("draw", 0))
+
+    def test_kpk_promotions(self):
+        # c8=Q mates at once
+        self.assertEqual(probe_fen("k7/2P5/1K6/8/8/8/8/8 w - - 0 1"), ("win", 1))
+        # Running pawn: one ply more than the KQK position after e8=Q
+        self.assertEqual(probe_fen("4Q3/8/8/8/8/8/k7/7K b - - 0 1"), ("loss", 16))
+        self.assertEqual(probe_fen("8/4P3/8/8/8/8/k7/7K w - - 0 1"), ("win", 17))
+        # c8=Q is stalemate, so the win goes through c8=R
+        self.assertEqual(probe_fen("2Q5/k7/2K5/8/8/8/8/8 b - - 0 1"), ("stalemate", 0))
+        self.assertEqual(probe_fen("2R5/k7/2K5/8/8/8/8/8 b - - 0 1"), ("loss", 2))
+        self.assertEqual(probe_fen("8/k1P5/2K5/8/8/8/8/8 w - - 0 1"), ("win", 3))
+        # The same for Black, looked up mirrored
+        self.assertEqual(probe_fen("8/8/8/8/8/2k5/K1p5/8 b - - 0 1"), ("win", 3))
+
+    def test_other_material_is_not_covered(self):
+        self.assertIsNone(probe_fen("k7/8/1K6/8/8/8/8/7B w - - 0 1"))
+        self.assertIsNone(probe_fen("k7/8/1K6/8/8/8/8/6RR w - - 0 1"))
+        self.assertIsNone(probe_fen("k7/8/1K6/8/8/8/8/6QQ w - - 0 1"))
+        Tablebase.unload_tablebases()
+        self.assertIsNone(probe_fen("k7/8/1K6/8/8/8/8/7Q w - - 0 1"))
+
+    def test_matches_rules(self):
+        rng = random.Random(5)
+        checked = 0
+        while checked < 500:
+            squares = rng.sample(range(64), 3)
+            board_array = [[""] * 8 for _ in range(8)]
+            piece = rng.choice("qrp")
+            for sq, piece in zip(squares, "kK" + (piece if rng.random() < 0.5 else piece.upper())):
+                board_array[sq // 8][sq % 8] = piece
+            turn = rng.choice("wb")
+            result = Tablebase.probe(board_array, turn)
+            if result is None:
+                continue
+            checked += 1
+            Tablebase.unload_tablebases()
+            expected = (is_checkmate(board_array, turn), is_stalemate(board_array, turn),
+                        get_game_status(board_array, turn))
+            Tablebase.load_tablebases(self.directory.name)
+            self.assertEqual((result == ("loss", 0), result[0] == "stalemate"), expected[:2])
+            self.assertEqual((is_checkmate(board_array, turn), is_stalemate(board_array, turn),
+                              get_game_status(board_array, turn)), expected)
+
+    def test_engine_uses_table(self):
+        board_array, turn = board_from_fen("8/8/8/3k4/8/8/8/Q3K3 w - - 0 1")
+        position = Position(board_array, turn)
+        expected_plies = Tablebase.probe(board_array, turn)[1]
+        result = Engine().search(position, max_depth=6)
+        self.assertEqual(result.depth, 1)
+        self.assertEqual(result.mate_in(), (expected_plies + 1) // 2)
+        position.play(result.best_move)
+        self.assertEqual(Tablebase.probe(position.board, position.turn), ("loss", expected_plies - 1))
+
+if __name__ == '__main__':
+    unittest.main()
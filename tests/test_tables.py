@@ -0,0 +1,26 @@
+import unittest
+from main.Tables import KNIGHT_TARGETS, KING_TARGETS, RAYS, BETWEEN, BETWEEN_MASKS, LINE_KIND
+
+
+class TestTables(unittest.TestCase):
+    def test_corner_and_centre_target_counts(self):
+        self.assertEqual(len(KNIGHT_TARGETS[0]), 2)
+        self.assertEqual(len(KNIGHT_TARGETS[3 * 8 + 3]), 8)
+        self.assertEqual(len(KING_TARGETS[63]), 3)
+        self.assertEqual(len(KING_TARGETS[4 * 8 + 4]), 8)
+
+    def test_rays_run_nearest_first(self):
+        self.assertEqual(RAYS[3][0], tuple((0, c) for c in range(1, 8)))  # Along row 0 to the right
+        self.assertEqual(RAYS[7][0][:2], ((1, 1), (2, 2)))
+
+    def test_between_squares(self):
+        self.assertEqual(BETWEEN[0][7], tuple((0, c) for c in range(1, 7)))
+        self.assertEqual(BETWEEN[63][0], tuple((r, r) for r in range(6, 0, -1)))
+        self.assertEqual(BETWEEN[0][1], ())
+        self.assertIsNone(BETWEEN[0][10])  # a8 and c7 are not aligned
+        self.assertEqual(BETWEEN_MASKS[0][2], 1 << 1)
+        self.assertEqual(LINE_KIND[0][56], "r")
+        self.assertEqual(LINE_KIND[7][56], "b")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from main.Engine import Engine
+from main.Position import Position
+from main.TranspositionTable import (TranspositionTable, ALWAYS_REPLACE, DEPTH_PREFERRED, ENTRY_BYTES,
+                                     EXACT, LOWER_BOUND, UPPER_BOUND)
+from tests.test_move_generation import initial_position
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_store_and_probe_round_trip(self):
+        table = TranspositionTable(1)
+        move = ((6, 4), (4, 4))
+        table.store(0x123456789ABCDEF0, 5, -250, LOWER_BOUND, move)
+        entry = table.probe(0x123456789ABCDEF0)
+        self.assertEqual((entry.depth, entry.score, entry.bound, entry.move, entry.age),
+                         (5, -250, LOWER_BOUND, move, 0))
+        self.assertIsNone(table.probe(0x0FEDCBA987654321))
+        self.assertEqual(table.hits, 1)
+        self.assertEqual(table.probes, 2)
+        self.assertEqual(table.hit_rate(), 0.5)
+
+    def test_size_follows_megabyte_budget(self):
+        for scheme in (DEPTH_PREFERRED, ALWAYS_REPLACE):
+            table = TranspositionTable(2, scheme)
+            self.assertEqual(table.size_bytes, 2 * 1024 * 1024)
+            self.assertEqual(table.capacity, 2 * 1024 * 1024 // ENTRY_BYTES)
+        with self.assertRaises(ValueError):
+            TranspositionTable(1, "random")
+
+    def test_depth_preferred_keeps_deeper_entry(self):
+        table = TranspositionTable(1, DEPTH_PREFERRED)
+        deep, shallow, newer = 7, 7 + table.num_buckets, 7 + 2 * table.num_buckets  # Same bucket
+        table.store(deep, 8, 10, EXACT)
+        table.store(shallow, 2, 20, EXACT)
+        table.store(newer, 1, 30, EXACT)
+        self.assertEqual(table.probe(deep).depth, 8)
+        self.assertIsNone(table.probe(shallow))  # Evicted from the always-replace slot
+        self.assertEqual(table.probe(newer).score, 30)
+        self.assertEqual(table.collisions, 1)
+        self.assertEqual(table.used, 2)
+        # A new search may replace the deep entry
+        table.new_search()
+        table.store(shallow, 2, 20, UPPER_BOUND)
+        self.assertIsNone(table.probe(deep))
+
+    def test_always_replace(self):
+        table = TranspositionTable(1, ALWAYS_REPLACE)
+        table.store(3, 8, 10, EXACT)
+        table.store(3 + table.num_buckets, 1, 20, EXACT)
+        self.assertIsNone(table.probe(3))
+        self.assertEqual(table.collisions, 1)
+
+    def test_search_restores_best_move_from_table(self):
+        table = TranspositionTable(1)
+        position = Position(initial_position())
+        result = Engine(tt=table).search(position, max_depth=3)
+        self.assertEqual(table.probe(position.key).move, result.best_move)
+        self.assertGreater(table.hits, 0)
+        self.assertGreater(table.fill_rate(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
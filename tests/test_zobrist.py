@@ -0,0 +1,48 @@
+import unittest
+import random
+from main.Position import Position
+from main.Rules import get_all_legal_moves_for_player
+from main.Zobrist import compute_key
+from tests.test_move_generation import initial_position
+
+
+class TestZobrist(unittest.TestCase):
+    def test_side_to_move_changes_key(self):
+        board = initial_position()
+        self.assertNotEqual(compute_key(board, 'w'), compute_key(board, 'b'))
+
+    def test_transposition_gives_same_key(self):
+        first = Position(initial_position())
+        first.make_move(7, 6, 5, 5)  # Ng1-f3
+        first.make_move(0, 6, 2, 5)  # Ng8-f6
+        first.make_move(7, 1, 5, 2)  # Nb1-c3
+        second = Position(initial_position())
+        second.make_move(7, 1, 5, 2)
+        second.make_move(0, 6, 2, 5)
+        second.make_move(7, 6, 5, 5)
+        self.assertEqual(first.board, second.board)
+        self.assertEqual(first.key, second.key)
+
+    def test_incremental_key_matches_recomputed_key(self):
+        rng = random.Random(7)
+        position = Position(initial_position())
+        start_key = position.key
+        for _ in range(60):
+            moves = get_all_legal_moves_for_player(position.board, position.turn)
+            if not moves:
+                break
+            (fr, fc), (tr, tc) = rng.choice(moves)
+            piece = position.board[fr][fc]
+            promotion = None
+            if piece.lower() == 'p' and tr in (0, 7):
+                promotion = 'q' if piece.islower() else 'Q'
+            position.make_move(fr, fc, tr, tc, promotion)
+            self.assertEqual(position.key, compute_key(position.board, position.turn))
+        while position.can_unmake():
+            position.unmake_move()
+            self.assertEqual(position.key, compute_key(position.board, position.turn))
+        self.assertEqual(position.key, start_key)
+        self.assertEqual(position.board, initial_position())
+
+if __name__ == '__main__':
+    unittest.main()